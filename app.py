@@ -1,7 +1,7 @@
-from flask import Flask, render_template, request, jsonify
-import matplotlib
-matplotlib.use('Agg')  # No usar interfaz gráfica
-import matplotlib.pyplot as plt
+import re
+import threading
+import time
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context, url_for, g
 import numpy as np
 import base64
 from io import BytesIO
@@ -9,50 +9,190 @@ import json
 from models.color_extractor import ColorExtractor
 
 from models.genetic_algorithm import ColorPaletteGA
+from models.batch import BatchPaletteGA
+from models.nsga2 import NSGA2PaletteGA
+from models.job_queue import JobQueue, QueueFullError
+from models.result_cache import ResultCache, make_key, normalize_hex
+from models import metrics
 
 app = Flask(__name__)
 
+# Límites del servidor para acotar la latencia de /generate independientemente del cliente
+app.config.setdefault('GA_MAX_POPULATION', 500)
+app.config.setdefault('GA_MAX_GENERATIONS', 300)
+app.config.setdefault('GA_MAX_TIME_BUDGET', 10.0)   # segundos
+app.config.setdefault('GA_DEFAULT_TIME_BUDGET', 5.0)
+app.config.setdefault('GA_MAX_STAGNATION_WINDOW', 100)
+app.config.setdefault('GA_MAX_BATCH_ITEMS', 64)
+app.config.setdefault('GA_MAX_COLORS', 12)
+
+# Cola de trabajos asíncronos (/jobs): hilos concurrentes y trabajos en espera admitidos
+app.config.setdefault('JOBS_MAX_WORKERS', 2)
+app.config.setdefault('JOBS_MAX_QUEUE_DEPTH', 16)
+app.config.setdefault('JOBS_RETRY_AFTER', 5)  # segundos sugeridos al rechazar por cola llena
+
+# Caché de respuestas de /generate: LRU en memoria con TTL y, si se indica un fichero,
+# un segundo nivel SQLite compartido entre procesos
+app.config.setdefault('RESULT_CACHE_ENABLED', True)
+app.config.setdefault('RESULT_CACHE_SIZE', 256)
+app.config.setdefault('RESULT_CACHE_TTL', 3600)  # segundos
+app.config.setdefault('RESULT_CACHE_SQLITE', None)
+
+_job_queue = None
+_services_lock = threading.Lock()
+_result_cache = None
+
+def _get_job_queue():
+    """Devuelve la cola de trabajos, creándola con la configuración actual la primera vez"""
+    global _job_queue
+    with _services_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue(max_workers=app.config['JOBS_MAX_WORKERS'],
+                                  max_queue_depth=app.config['JOBS_MAX_QUEUE_DEPTH'])
+        return _job_queue
+
+def _get_result_cache():
+    """Devuelve la caché de resultados, creándola con la configuración actual la primera vez"""
+    global _result_cache
+    with _services_lock:
+        if _result_cache is None:
+            _result_cache = ResultCache(maxsize=app.config['RESULT_CACHE_SIZE'],
+                                        ttl=app.config['RESULT_CACHE_TTL'],
+                                        sqlite_path=app.config['RESULT_CACHE_SQLITE'])
+        return _result_cache
+
+class InvalidParameter(ValueError):
+    """Parámetro de la petición que no se puede interpretar (se responde con 400)"""
+
+@app.errorhandler(InvalidParameter)
+def _invalid_parameter(e):
+    return jsonify({'error': f'Parámetros no válidos: {e}'}), 400
+
+def _number(params, name, default, convert=float):
+    """
+    Lee un parámetro numérico; si no se puede convertir o no es finito (nan, inf)
+    lanza InvalidParameter
+    """
+    value = params.get(name, default)
+    try:
+        number = convert(value)
+    except (TypeError, ValueError, OverflowError):
+        raise InvalidParameter(f"{name}={value!r} no es un número válido") from None
+    if not np.isfinite(number):
+        raise InvalidParameter(f"{name}={value!r} no es un número finito")
+    return number
+
+HEX_COLOR = re.compile(r'#?(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6})')
+
+def _parse_colors(colors):
+    """Valida los colores iniciales y los normaliza a '#rrggbb' (admite la forma corta '#rgb')"""
+    for color in colors:
+        if not isinstance(color, str) or not HEX_COLOR.fullmatch(color.strip()):
+            raise InvalidParameter(f"{color!r} no es un color hexadecimal válido")
+    return [normalize_hex(color) for color in colors]
+
+def _optional_float(params, name):
+    """Lee un parámetro numérico opcional"""
+    return _number(params, name, None) if params.get(name) not in (None, '') else None
+
+def _parse_generation_params(params):
+    """
+    Convierte los parámetros de la petición (formulario o query string) en argumentos
+    de ColorPaletteGA y de run(), aplicando los límites del servidor
+    """
+    # Obtener colores iniciales: lista de N roles (JSON) o los tres campos del formulario
+    initial_colors = params.get('initial_colors')
+    if not isinstance(initial_colors, list):
+        primary_color = params.get('primary_color', '#3A5FCD')
+        bg_color = params.get('bg_color', '#FFFFFF')
+        accent_color = params.get('accent_color', '#F08080')
+        initial_colors = [primary_color, bg_color, accent_color]
+    initial_colors = _parse_colors(initial_colors)
+    
+    # Parámetros adicionales
+    seed = _number(params, 'seed', None, int) if params.get('seed') not in (None, '') else None
+    if seed is not None and seed < 0:
+        raise InvalidParameter(f"seed={seed} debe ser no negativa")
+    population_size = _number(params, 'population_size', 50, int)
+    generations = _number(params, 'generations', 20, int)
+    ga_kwargs = {
+        'initial_colors': initial_colors,
+        'wcag_level': params.get('wcag_level', 'AA'),
+        'population_size': min(max(population_size, 2), app.config['GA_MAX_POPULATION']),
+        'generations': min(max(generations, 0), app.config['GA_MAX_GENERATIONS']),
+        'mutation_prob': _number(params, 'mutation_prob', 15) / 100,
+        'accessibility_weight': _number(params, 'accessibility_weight', 70) / 100,
+        'initial_weight': _number(params, 'initial_weight', 30) / 100,
+        'seed': seed,
+    }
+    # Rangos de L* por rol y máscara de pares con contraste mínimo (solo en peticiones JSON)
+    for name in ('L_ranges', 'pair_mask'):
+        if isinstance(params.get(name), list):
+            ga_kwargs[name] = params[name]
+    
+    # Criterios de parada: presupuesto de tiempo (siempre acotado), aptitud objetivo y estancamiento
+    time_budget = _optional_float(params, 'time_budget')
+    if time_budget is None:
+        time_budget = app.config['GA_DEFAULT_TIME_BUDGET']
+    stagnation_window = _optional_float(params, 'stagnation_window')
+    if stagnation_window is not None:
+        stagnation_window = min(max(int(stagnation_window), 1), app.config['GA_MAX_STAGNATION_WINDOW'])
+    stagnation_epsilon = _optional_float(params, 'stagnation_epsilon')
+    run_kwargs = {
+        'time_budget': min(max(time_budget, 0.0), app.config['GA_MAX_TIME_BUDGET']),
+        'target_fitness': _optional_float(params, 'target_fitness'),
+        'stagnation_window': stagnation_window,
+        'stagnation_epsilon': stagnation_epsilon if stagnation_epsilon is not None else 1e-4,
+    }
+    return ga_kwargs, run_kwargs
+
+def _endpoint_label():
+    """Regla de la ruta de la petición (cardinalidad acotada para las métricas)"""
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+@app.before_request
+def _start_request_metrics():
+    g.metrics_start = time.perf_counter()
+    metrics.REQUESTS_IN_FLIGHT.inc(endpoint=_endpoint_label())
+
+@app.after_request
+def _record_request_metrics(response):
+    # En /generate/stream mide hasta que empieza el stream, no hasta que termina
+    endpoint = _endpoint_label()
+    metrics.REQUEST_DURATION.observe(time.perf_counter() - g.metrics_start, endpoint=endpoint, method=request.method)
+    metrics.REQUESTS.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+    return response
+
+@app.teardown_request
+def _finish_request_metrics(exc):
+    if 'metrics_start' in g:
+        metrics.REQUESTS_IN_FLIGHT.dec(endpoint=_endpoint_label())
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Métricas del proceso en formato de exposición de texto de Prometheus"""
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
 @app.route('/')
 def index():
     """Página principal"""
     return render_template('index.html')
 
-@app.route('/generate', methods=['POST'])
-def generate():
-    """Genera paletas de colores basadas en parámetros"""
-    # Obtener colores iniciales del formulario
-    primary_color = request.form.get('primary_color', '#3A5FCD')
-    bg_color = request.form.get('bg_color', '#FFFFFF')
-    accent_color = request.form.get('accent_color', '#F08080')
+def _convergence_series(log, decimals=6):
+    """Series del registro de evolución para dibujar la curva en el cliente"""
+    series = {'gen': [int(g) for g in log.select('gen')]}
+    for key in ('avg', 'max', 'min'):
+        series[key] = [round(float(v), decimals) for v in log.select(key)]
+    return series
+
+def _render_convergence_chart(log):
+    """Curva de convergencia como PNG en base64 (solo si se pide server_chart)"""
+    # Importación diferida: matplotlib solo se carga si algún cliente pide el gráfico.
+    # Sin pyplot, cuyo estado global no es seguro entre hilos
+    from matplotlib.figure import Figure
     
-    # Parámetros adicionales
-    wcag_level = request.form.get('wcag_level', 'AA')
-    population_size = int(request.form.get('population_size', 50))
-    generations = int(request.form.get('generations', 20))
-    mutation_prob = float(request.form.get('mutation_prob', 15)) / 100
-    accessibility_weight = float(request.form.get('accessibility_weight', 70)) / 100
-    initial_weight = float(request.form.get('initial_weight', 30)) / 100
-    
-    # Crear y ejecutar algoritmo genético con los tres colores
-    initial_colors = [primary_color, bg_color, accent_color]
-    ga = ColorPaletteGA(
-        initial_colors=initial_colors,
-        wcag_level=wcag_level,
-        population_size=population_size,
-        generations=generations,
-        mutation_prob=mutation_prob,
-        accessibility_weight=accessibility_weight,
-        initial_weight=initial_weight
-    )
-    
-    hof, log = ga.run()
-    
-    # Obtener las mejores paletas
-    best_palettes = ga.get_best_palettes(3)
-    
-    # Generar gráficos de evolución
-    # 1. Curva de convergencia
-    fig1, ax1 = plt.subplots(figsize=(10, 5))
+    fig1 = Figure(figsize=(10, 5))
+    ax1 = fig1.subplots()
     gen = log.select("gen")
     fit_avg = log.select("avg")
     fit_max = log.select("max")
@@ -68,16 +208,221 @@ def generate():
     # Convertir a base64 para enviar al cliente
     buffer1 = BytesIO()
     fig1.savefig(buffer1, format='png')
-    buffer1.seek(0)
-    convergence_img = base64.b64encode(buffer1.getvalue()).decode()
-    plt.close(fig1)
+    return base64.b64encode(buffer1.getvalue()).decode()
+
+def _wants_server_chart(params):
+    """True si la petición activa el gráfico PNG generado en el servidor"""
+    return params.get('server_chart', '').lower() in ('1', 'true', 'on', 'yes')
+
+def _generation_mode(params):
+    """'nsga2' para el modo multiobjetivo con frente de Pareto; 'weighted' (por defecto) si no"""
+    return 'nsga2' if params.get('mode') == 'nsga2' else 'weighted'
+
+def _server_timing(timings):
+    """Valor de la cabecera Server-Timing a partir de {fase: segundos}"""
+    return ', '.join(f'{name};dur={seconds * 1000:.2f}' for name, seconds in timings.items())
+
+def _run_generation(ga_kwargs, run_kwargs, callback=None, server_chart=False, mode='weighted', timings=None):
+    """
+    Ejecuta el algoritmo genético y construye la respuesta de /generate
+
+    Args:
+        ga_kwargs, run_kwargs: Salida de _parse_generation_params
+        callback: Se pasa a ColorPaletteGA.run (permite cancelar entre generaciones)
+        server_chart: Añadir además el gráfico de convergencia en PNG (base64)
+        mode: 'weighted' (aptitud ponderada) o 'nsga2' (añade 'pareto_front' a la respuesta)
+        timings: Diccionario opcional que recibe los segundos de cada fase
+    """
+    # Crear y ejecutar algoritmo genético con los colores iniciales
+    ga_class = NSGA2PaletteGA if mode == 'nsga2' else ColorPaletteGA
+    ga = ga_class(**ga_kwargs)
+    ga.run(**run_kwargs, callback=callback)
+    return _generation_result(ga, server_chart, timings)
+
+def _generation_result(ga, server_chart=False, timings=None):
+    """Respuesta de una generación terminada: mejores paletas y curva de convergencia"""
+    log = ga.logbook
+    
+    # La curva de convergencia la dibuja el cliente a partir de las series
+    result = {
+        'palettes': ga.get_best_palettes(3),
+        'convergence': _convergence_series(log),
+        'initial_colors': ga.initial_colors,
+        'generations_run': len(log.select('gen')),
+        'stop_reason': log.stop_reason
+    }
+    if isinstance(ga, NSGA2PaletteGA):
+        # Frente completo: el cliente elige el equilibrio sin volver a ejecutar
+        result['pareto_front'] = ga.get_pareto_palettes()
+    if timings is not None:
+        # Incluye la evaluación de las paletas finales de get_best_palettes
+        timings.update(ga.timer.totals)
+    if server_chart:
+        start = time.perf_counter()
+        result['convergence_chart'] = _render_convergence_chart(log)
+        if timings is not None:
+            timings['chart'] = time.perf_counter() - start
+    return result
+
+@app.route('/generate', methods=['POST'])
+def generate():
+    """Genera paletas de colores basadas en parámetros"""
+    ga_kwargs, run_kwargs = _parse_generation_params(request.form)
+    server_chart = _wants_server_chart(request.form)
+    mode = _generation_mode(request.form)
+    # Segundos por fase (inicialización, evaluación, selección, cruce, mutación,
+    # reparación, poda, gráfico, caché y serialización) para Server-Timing
+    timings = {}
+    cached = app.config['RESULT_CACHE_ENABLED']
+    
+    # La clave incluye la semilla y los criterios de parada; 'Cache-Control: no-cache'
+    # fuerza una nueva evolución (cuyo resultado sustituye al guardado)
+    result, tier = None, None
+    if cached:
+        start = time.perf_counter()
+        cache = _get_result_cache()
+        key = make_key({**ga_kwargs, **run_kwargs, 'server_chart': server_chart, 'mode': mode})
+        if not request.cache_control.no_cache:
+            result, tier = cache.get(key)
+            metrics.RESULT_CACHE.inc(result='hit' if tier else 'miss', tier=tier or 'none')
+        timings['cache'] = time.perf_counter() - start
+    if result is None:
+        result = _run_generation(ga_kwargs, run_kwargs, server_chart=server_chart, mode=mode, timings=timings)
+        # Un resultado cortado por el presupuesto de tiempo depende de la carga del
+        # servidor: no se guarda para no servir una evolución incompleta durante todo el TTL
+        if cached and result['stop_reason'] != 'time_budget':
+            cache.set(key, result)
+    
+    start = time.perf_counter()
+    response = jsonify(result)
+    timings['serialize'] = time.perf_counter() - start
+    response.headers['Server-Timing'] = _server_timing(timings)
+    if cached:
+        response.headers['X-Cache'] = 'HIT' if tier else 'MISS'
+        if tier:
+            response.headers['X-Cache-Tier'] = tier
+    return response
+
+@app.route('/generate/batch', methods=['POST'])
+def generate_batch():
+    """
+    Genera paletas para varios conjuntos de colores iniciales en una sola evolución
+
+    Recibe JSON {"params": {...}, "items": [{"initial_colors": [primario, fondo, acento, ...], ...}]}.
+    "params" admite los mismos parámetros que /generate y se aplica a todos los
+    elementos; cada elemento puede sustituir los parámetros del algoritmo, incluidos
+    L_ranges y pair_mask. Todas las paletas del lote deben tener el mismo número de
+    colores. Los criterios de parada (time_budget, target_fitness, stagnation_*) son comunes.
+    """
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return jsonify({'error': 'El cuerpo debe ser un objeto JSON'}), 400
+    shared = body.get('params') or {}
+    if not isinstance(shared, dict):
+        return jsonify({'error': '"params" debe ser un objeto'}), 400
+    items = body.get('items')
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'Se requiere una lista "items" no vacía'}), 400
+    if len(items) > app.config['GA_MAX_BATCH_ITEMS']:
+        return jsonify({'error': f"Máximo {app.config['GA_MAX_BATCH_ITEMS']} elementos por lote"}), 400
+    if not all(isinstance(item, dict) for item in items):
+        return jsonify({'error': 'Cada elemento de "items" debe ser un objeto'}), 400
+    
+    # Los colores se validan en _parse_generation_params (InvalidParameter, 400)
+    ga_items = []
+    for item in items:
+        colors = item.get('initial_colors')
+        if not isinstance(colors, list) or not 2 <= len(colors) <= app.config['GA_MAX_COLORS']:
+            return jsonify({'error': f"Cada elemento necesita \"initial_colors\" con entre 2 y "
+                                     f"{app.config['GA_MAX_COLORS']} colores"}), 400
+        ga_items.append(_parse_generation_params({**shared, **item})[0])
+    _, run_kwargs = _parse_generation_params(shared)
     
-    # También podemos enviar los colores iniciales para compararlos
-    return jsonify({
-        'palettes': best_palettes,
-        'convergence_chart': convergence_img,
-        'initial_colors': initial_colors
-    })
+    try:
+        batch = BatchPaletteGA(ga_items)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Parámetros no válidos: {e}'}), 400
+    batch.run(**run_kwargs)
+    return jsonify({'items': [_generation_result(ga) for ga in batch.gas]})
+
+@app.route('/generate/stream', methods=['GET'])
+def generate_stream():
+    """
+    Variante de /generate que emite el progreso como Server-Sent Events
+
+    Acepta los mismos parámetros que /generate en la query string. Envía un evento
+    'generation' por generación con avg/max/min y las mejores paletas actuales en
+    hex, y un evento 'done' final. Si el cliente se desconecta, la evolución se
+    detiene en la siguiente generación.
+    """
+    ga_kwargs, run_kwargs = _parse_generation_params(request.args)
+    ga = ColorPaletteGA(**ga_kwargs)
+    
+    def events():
+        generations = ga.evolve(**run_kwargs)
+        try:
+            for stats in generations:
+                payload = {key: float(value) for key, value in stats.items() if key != 'gen'}
+                payload['gen'] = int(stats['gen'])
+                payload['palettes'] = [palette['colors'] for palette in ga.get_best_palettes(3)]
+                yield f"event: generation\ndata: {json.dumps(payload)}\n\n"
+            
+            yield "event: done\ndata: " + json.dumps({
+                'palettes': ga.get_best_palettes(3),
+                'initial_colors': ga_kwargs['initial_colors'],
+                'generations_run': len(ga.logbook.select('gen')),
+                'stop_reason': ga.logbook.stop_reason
+            }) + "\n\n"
+        finally:
+            generations.close()
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    Encola una generación con los mismos parámetros que /generate
+
+    Devuelve 202 con el id del trabajo y la URL para consultarlo, o 503 si la
+    cola está llena.
+    """
+    ga_kwargs, run_kwargs = _parse_generation_params(request.form)
+    server_chart = _wants_server_chart(request.form)
+    mode = _generation_mode(request.form)
+    
+    def task(job):
+        def on_generation(stats):
+            job.progress = {'gen': int(stats['gen']), 'max': float(stats['max']), 'avg': float(stats['avg'])}
+            return job.cancelled()
+        return _run_generation(ga_kwargs, run_kwargs, callback=on_generation, server_chart=server_chart,
+                               mode=mode)
+    
+    try:
+        job = _get_job_queue().submit(task)
+    except QueueFullError as e:
+        response = jsonify({'error': str(e)})
+        response.headers['Retry-After'] = str(app.config['JOBS_RETRY_AFTER'])
+        return response, 503
+    
+    status_url = url_for('job_status', job_id=job.id)
+    return jsonify({'job_id': job.id, 'status': job.status, 'status_url': status_url}), 202, {'Location': status_url}
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Estado, progreso y (si ha terminado) resultado de un trabajo"""
+    job = _get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Trabajo no encontrado'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancela un trabajo; si está en curso se detiene en la siguiente generación"""
+    job = _get_job_queue().cancel(job_id)
+    if job is None:
+        return jsonify({'error': 'Trabajo no encontrado'}), 404
+    return jsonify(job.to_dict()), 202
 
 @app.route('/extract-color', methods=['POST'])
 def extract_color():
@@ -85,6 +430,7 @@ def extract_color():
     extractor = ColorExtractor()
     
     try:
+        start = time.perf_counter()
         if 'html' in request.form and request.form['html'].strip():
             html_content = request.form['html']
             colors = extractor.extract_from_html(html_content)
@@ -94,12 +440,18 @@ def extract_color():
         else:
             return jsonify({'error': 'Se requiere HTML o URL válida'}), 400
         
+        # Fases medidas por el extractor y el resto de la extracción (heurísticas de selección)
+        timings = dict(extractor.timer.totals)
+        timings['selection'] = time.perf_counter() - start - sum(timings.values())
+        
         # Devolvemos los tres colores
-        return jsonify({
+        response = jsonify({
             'primary_color': colors[0],
             'bg_color': colors[1],
             'accent_color': colors[2]
         })
+        response.headers['Server-Timing'] = _server_timing(timings)
+        return response
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -0,0 +1,51 @@
+"""
+Compara el rendimiento de N ejecuciones independientes de ColorPaletteGA con
+una única evolución por lotes (BatchPaletteGA) para distintos tamaños de lote.
+
+Uso:
+    python benchmarks/bench_batch.py [--sizes 1 8 32 64] [--generations 20]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.batch import BatchPaletteGA  # noqa: E402
+from models.genetic_algorithm import ColorPaletteGA  # noqa: E402
+
+
+def random_items(size, seed=0):
+    """Conjuntos aleatorios de tres colores iniciales"""
+    rng = np.random.default_rng(seed)
+    return [{'initial_colors': ['#%06x' % c for c in rng.integers(0, 2 ** 24, 3)]} for _ in range(size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 8, 32, 64])
+    parser.add_argument('--generations', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'lote':>6}{'independiente (s)':>20}{'por lotes (s)':>16}{'paletas/s lote':>16}")
+    for size in args.sizes:
+        items = random_items(size)
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            for item in items:
+                ColorPaletteGA(seed=1, generations=args.generations, **item).run()
+            sequential = time.perf_counter() - start
+
+            start = time.perf_counter()
+            BatchPaletteGA(items, seed=1, generations=args.generations).run()
+            batched = time.perf_counter() - start
+        print(f"{size:>6}{sequential:>20.3f}{batched:>16.3f}{size / batched:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Compara /generate con la curva de convergencia en JSON (por defecto) frente al
+gráfico PNG renderizado en el servidor (server_chart=1).
+
+Uso:
+    python benchmarks/bench_chart.py [--runs 20] [--generations 20] [--population 50]
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app  # noqa: E402
+
+
+def measure(client, data, runs):
+    """Mediana de latencia (ms) y tamaño medio de la respuesta (bytes)"""
+    latencies, sizes = [], []
+    for i in range(runs):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            response = client.post('/generate', data={**data, 'seed': str(i)})
+        latencies.append((time.perf_counter() - start) * 1000)
+        sizes.append(len(response.data))
+    return statistics.median(latencies), statistics.mean(sizes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--generations', type=int, default=20)
+    parser.add_argument('--population', type=int, default=50)
+    args = parser.parse_args()
+
+    app.config['RESULT_CACHE_ENABLED'] = False
+    client = app.test_client()
+    data = {'generations': str(args.generations), 'population_size': str(args.population)}
+
+    # Calentamiento: la primera petición con gráfico incluye la importación de matplotlib
+    measure(client, data, 1)
+    measure(client, {**data, 'server_chart': '1'}, 1)
+
+    json_ms, json_bytes = measure(client, data, args.runs)
+    png_ms, png_bytes = measure(client, {**data, 'server_chart': '1'}, args.runs)
+
+    print(f"{'modo':<14}{'mediana (ms)':>14}{'respuesta (KB)':>16}")
+    print(f"{'series JSON':<14}{json_ms:>14.1f}{json_bytes / 1024:>16.1f}")
+    print(f"{'PNG servidor':<14}{png_ms:>14.1f}{png_bytes / 1024:>16.1f}")
+    print(f"Ahorro: {png_ms - json_ms:.1f} ms y {(png_bytes - json_bytes) / 1024:.1f} KB por petición")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Mide el tiempo de importación de app.py con `python -X importtime` y falla
+(código de salida 1) si supera el presupuesto o si alguna dependencia pesada
+se carga al arrancar.
+
+Uso:
+    python benchmarks/bench_startup.py [--runs 5] [--budget-ms 500] [--top 10]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencias que solo deben cargarse en la ruta de código que las usa
+LAZY_MODULES = ('matplotlib', 'sklearn', 'cssutils', 'bs4', 'requests', 'colormath')
+
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$')
+
+
+def import_profile(module='app'):
+    """
+    Importa `module` en un intérprete nuevo y devuelve (total_us, modulos)
+
+    `modulos` es una lista de (nombre, acumulado_us) de todas las importaciones.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    modules = []
+    total = None
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        name, cumulative = match.group(4), int(match.group(2))
+        modules.append((name, cumulative))
+        if name == module and not match.group(3):
+            total = cumulative
+    return total, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=500.0)
+    parser.add_argument('--top', type=int, default=10, help='Importaciones más lentas a mostrar')
+    args = parser.parse_args()
+
+    profiles = [import_profile() for _ in range(args.runs)]
+    median_ms = statistics.median(total for total, _ in profiles) / 1000
+    loaded = {name.split('.')[0] for _, modules in profiles for name, _ in modules}
+    eager = sorted(loaded.intersection(LAZY_MODULES))
+
+    # Paquetes de primer nivel más lentos en la última ejecución
+    _, modules = profiles[-1]
+    top_level = {}
+    for name, cumulative in modules:
+        root = name.split('.')[0]
+        top_level[root] = max(top_level.get(root, 0), cumulative)
+    print(f"{'módulo':<30}{'acumulado (ms)':>16}")
+    for name, cumulative in sorted(top_level.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:<30}{cumulative / 1000:>16.1f}")
+
+    print(f"\nimport app: mediana {median_ms:.1f} ms en {args.runs} ejecuciones (presupuesto {args.budget_ms:.0f} ms)")
+    failed = False
+    if median_ms > args.budget_ms:
+        print("ERROR: el tiempo de importación supera el presupuesto")
+        failed = True
+    if eager:
+        print(f"ERROR: dependencias pesadas cargadas al arrancar: {', '.join(eager)}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""
+Suite de benchmarks del pipeline de color: micro (ΔE, conversiones, daltonismo)
+y macro (ColorPaletteGA.run, ColorExtractor.extract_from_html sobre las páginas
+de benchmarks/fixtures). Todas las entradas usan semillas fijas.
+
+Guarda los resultados en JSON y, si existe, los compara con la línea base:
+un caso es una regresión si su tiempo relativo a la calibración supera al de la
+línea base en más del umbral (código de salida 1). Antes de cada repetición se
+mide una carga fija de calibración, de modo que una máquina más lenta o cargada
+en ese momento no se confunde con una regresión. La línea base se guarda con el
+mismo procedimiento (--save-baseline) y debe regenerarse tras un cambio de
+hardware o de versiones.
+
+Uso:
+    python benchmarks/suite.py [--filter ga] [--repeat 5] [--threshold 0.25]
+                               [--output benchmarks/results.json]
+                               [--baseline benchmarks/baseline.json] [--save-baseline]
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+import warnings
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from models.accessibility import color_blindness_contrasts, evaluate_color_blindness  # noqa: E402
+from models.color_conversions import lab_to_rgb_array, rgb_to_lab_array  # noqa: E402
+from models.color_extractor import ColorExtractor  # noqa: E402
+from models.color_patch import delta_e_cie2000_array, delta_e_cie2000_matrix  # noqa: E402
+from models.color_utils import get_delta_e, lab_to_rgb, rgb_to_lab  # noqa: E402
+from models.genetic_algorithm import ColorPaletteGA  # noqa: E402
+
+BENCH_DIR = os.path.join(ROOT, 'benchmarks')
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'results.json')
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+
+BATCH_SIZE = 10000
+GA_SIZES = ((20, 10), (50, 30), (200, 50))
+GA_COLORS = ['#3A5FCD', '#FFFFFF', '#F08080']
+CALIBRATION_DATA = np.random.default_rng(0).random(20000)
+
+
+def random_labs(rng, size):
+    """Colores L*a*b* aleatorios (size, 3) en el rango de los genes"""
+    return np.column_stack([rng.uniform(0, 100, size), rng.uniform(-128, 128, (size, 2))])
+
+
+def micro_cases():
+    """Casos micro: (grupo, nombre, función sin argumentos)"""
+    rng = np.random.default_rng(0)
+    lab1, lab2 = random_labs(rng, BATCH_SIZE), random_labs(rng, BATCH_SIZE)
+    rgbs = rng.random((BATCH_SIZE, 3))
+    palettes = rng.random((BATCH_SIZE // 3, 3, 3))
+    pairs = [(0, 1), (0, 2), (1, 2)]
+    single_lab1, single_lab2 = tuple(lab1[0]), tuple(lab2[0])
+    single_rgb1, single_rgb2 = tuple(rgbs[0]), tuple(rgbs[1])
+
+    return [
+        ('delta_e', 'delta_e_single', lambda: get_delta_e(single_lab1, single_lab2)),
+        ('delta_e', f'delta_e_batch_{BATCH_SIZE}', lambda: delta_e_cie2000_array(lab1, lab2)),
+        ('delta_e', 'delta_e_matrix_200x200', lambda: delta_e_cie2000_matrix(lab1[:200], lab2[:200])),
+        ('conversion', 'rgb_to_lab_single', lambda: rgb_to_lab(single_rgb1)),
+        ('conversion', 'lab_to_rgb_single', lambda: lab_to_rgb(single_lab1)),
+        ('conversion', f'rgb_to_lab_batch_{BATCH_SIZE}', lambda: rgb_to_lab_array(rgbs)),
+        ('conversion', f'lab_to_rgb_batch_{BATCH_SIZE}', lambda: lab_to_rgb_array(lab1)),
+        ('color_blindness', 'evaluate_color_blindness', lambda: evaluate_color_blindness(single_rgb1, single_rgb2)),
+        ('color_blindness', f'color_blindness_contrasts_{len(palettes)}x3',
+         lambda: color_blindness_contrasts(palettes, pairs)),
+    ]
+
+
+def macro_cases():
+    """Casos macro: ejecuciones completas del algoritmo genético y del extractor"""
+    cases = []
+    for population_size, generations in GA_SIZES:
+        def run_ga(population_size=population_size, generations=generations):
+            with contextlib.redirect_stdout(io.StringIO()):
+                ColorPaletteGA(GA_COLORS, population_size=population_size,
+                               generations=generations, seed=1).run()
+        cases.append(('ga', f'ga_run_p{population_size}_g{generations}', run_ga))
+
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        name = os.path.splitext(os.path.basename(path))[0]
+        cases.append(('extract', f'extract_from_html_{name}',
+                      lambda html=html: ColorExtractor().extract_from_html(html)))
+    return cases
+
+
+def calibration_workload():
+    """Carga fija de referencia, mezcla de NumPy y Python puro como los casos"""
+    total = float(np.cbrt(CALIBRATION_DATA * CALIBRATION_DATA + 1.0).sum())
+    for value in CALIBRATION_DATA[:2000].tolist():
+        total += value * value
+    return total
+
+
+def _calls_per_repeat(timer, min_time):
+    """Llamadas necesarias para que una repetición dure al menos min_time (como timeit.autorange)"""
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            return number
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+
+
+def measure(function, repeat, min_time):
+    """
+    Tiempo por llamada de `function`
+
+    El número de llamadas por repetición se ajusta para que cada repetición dure
+    al menos min_time segundos. Cada repetición va precedida de una de
+    calibration_workload (de min_time / 4) y 'relative' es la mediana de los
+    cocientes repetición / calibración: mide el caso en unidades de la velocidad
+    que tenía la máquina en ese mismo momento.
+    """
+    function()  # Calentamiento: importaciones perezosas, tablas y cachés de módulo
+    timer = timeit.Timer(function)
+    calibration = timeit.Timer(calibration_workload)
+    number = _calls_per_repeat(timer, min_time)
+    calibration_number = _calls_per_repeat(calibration, min_time / 4)
+
+    times, relative = [], []
+    for _ in range(repeat):
+        reference = calibration.timeit(calibration_number) / calibration_number
+        times.append(timer.timeit(number) / number)
+        relative.append(times[-1] / reference)
+    return {'best': min(times), 'median': statistics.median(times), 'relative': statistics.median(relative),
+            'number': number, 'repeat': repeat}
+
+
+def compare(results, baseline, threshold):
+    """
+    Compara cada caso con la línea base
+
+    Se usa el tiempo relativo a la calibración ('relative') si ambos resultados lo
+    tienen y, si no, la mediana.
+
+    Returns:
+        Lista de (nombre, actual, base, cociente, es_regresion) de los casos comunes
+    """
+    rows = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if 'relative' in result and 'relative' in base:
+            ratio = result['relative'] / base['relative']
+        else:
+            ratio = result['median'] / base['median']
+        rows.append((name, result['median'], base['median'], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def format_time(seconds):
+    """Tiempo con la unidad más legible"""
+    for unit, factor in (('s', 1), ('ms', 1e-3), ('µs', 1e-6)):
+        if seconds >= factor:
+            return f"{seconds / factor:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', default=None, help='Ejecutar solo los casos cuyo nombre contenga este texto')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help='Duración mínima de cada repetición (s)')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Empeoramiento relativo máximo antes de marcar una regresión')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='Guardar los resultados como nueva línea base')
+    args = parser.parse_args()
+
+    cases = micro_cases() + macro_cases()
+    if args.filter:
+        cases = [case for case in cases if args.filter in case[1]]
+
+    results = {}
+    print(f"{'caso':<40}{'mejor':>12}{'mediana':>12}{'llamadas':>10}")
+    for group, name, function in cases:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            result = measure(function, args.repeat, args.min_time)
+        results[name] = {'group': group, **result}
+        print(f"{name:<40}{format_time(result['best']):>12}{format_time(result['median']):>12}"
+              f"{result['number']:>10}")
+
+    report = {
+        'meta': {
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResultados guardados en {os.path.relpath(args.output)}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Línea base actualizada: {os.path.relpath(args.baseline)}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("Sin línea base; créala con --save-baseline")
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+
+    rows = compare(results, baseline, args.threshold)
+    print(f"\n{'caso':<40}{'actual':>12}{'base':>12}{'cociente':>10}")
+    for name, current, base, ratio, regression in rows:
+        flag = '  REGRESIÓN' if regression else ''
+        print(f"{name:<40}{format_time(current):>12}{format_time(base):>12}{ratio:>10.2f}{flag}")
+
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print(f"\nERROR: {len(regressions)} caso(s) más de un {args.threshold:.0%} más lentos que la línea base")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,4 @@
 import numpy as np
-from colormath.color_objects import sRGBColor
 
 def relative_luminance(rgb):
     """Calcula luminancia relativa según WCAG 2.1"""
@@ -23,46 +22,100 @@ def contrast_ratio(color1, color2):
         
     return (lum1 + 0.05) / (lum2 + 0.05)
 
+def _linearize_array(rgb):
+    """Conversión gamma WCAG 2.1 vectorizada"""
+    rgb = np.asarray(rgb, dtype=np.float64)
+    return np.where(rgb <= 0.03928, rgb / 12.92, (np.maximum(rgb + 0.055, 0) / 1.055) ** 2.4)
+
+_LUMINANCE_WEIGHTS = np.array([0.2126, 0.7152, 0.0722])
+
+# Tabla de linealización para canales de 8 bits (colores hex). Se calcula con la
+# misma fórmula que relative_luminance, así que cada entrada es idéntica al cálculo
+# exacto; la luminancia solo difiere por redondeo en la suma (< 1e-16).
+LINEARIZE_LUT_8BIT = _linearize_array(np.arange(256) / 255.0)
+_use_luminance_lut = True
+
+def use_luminance_lut(enabled=True):
+    """Activa o desactiva la tabla de 8 bits en tiempo de ejecución"""
+    global _use_luminance_lut
+    _use_luminance_lut = bool(enabled)
+
+def relative_luminance_array(rgb):
+    """Calcula luminancia relativa WCAG 2.1 para un array (..., 3) de colores RGB"""
+    return _linearize_array(rgb) @ _LUMINANCE_WEIGHTS
+
+def relative_luminance_8bit(rgb8):
+    """Calcula luminancia relativa WCAG 2.1 para colores (..., 3) con canales enteros 0-255"""
+    rgb8 = np.asarray(rgb8)
+    if _use_luminance_lut:
+        return LINEARIZE_LUT_8BIT[rgb8] @ _LUMINANCE_WEIGHTS
+    return relative_luminance_array(rgb8 / 255.0)
+
+def relative_luminance_hex(hex_color):
+    """Calcula luminancia relativa WCAG 2.1 de un color hexadecimal #RRGGBB"""
+    h = hex_color.lstrip('#')
+    return float(relative_luminance_8bit([int(h[i:i+2], 16) for i in (0, 2, 4)]))
+
+def contrast_ratio_array(colors1, colors2):
+    """Calcula ratio de contraste WCAG 2.1 entre dos arrays (..., 3) de colores RGB"""
+    lum1 = relative_luminance_array(colors1)
+    lum2 = relative_luminance_array(colors2)
+    return (np.maximum(lum1, lum2) + 0.05) / (np.minimum(lum1, lum2) + 0.05)
+
+# Matrices de simulación basadas en modelo Machado et al. 2009, apiladas una sola vez
+CVD_TYPES = ('protanopia', 'deuteranopia', 'tritanopia')
+CVD_MATRICES = np.array([
+    # Protanopia (dificultad para ver rojo)
+    [[0.152, 1.052, -0.204],
+     [0.114, 0.786, 0.100],
+     [0.004, -0.048, 1.044]],
+    # Deuteranopia (dificultad para ver verde)
+    [[0.367, 0.861, -0.228],
+     [0.280, 0.673, 0.047],
+     [-0.011, 0.043, 0.968]],
+    # Tritanopia (dificultad para ver azul)
+    [[1.255, -0.077, -0.178],
+     [0.078, 0.930, -0.008],
+     [-0.026, 0.263, 0.763]]
+])
+
 def simulate_protanopia(rgb):
     """Simula protanopia (dificultad para ver rojo)"""
-    # Matriz de conversión basada en modelo Machado et al. 2009
-    matrix = np.array([
-        [0.152, 1.052, -0.204],
-        [0.114, 0.786, 0.100],
-        [0.004, -0.048, 1.044]
-    ])
-    return np.clip(np.dot(matrix, rgb), 0, 1)
+    return np.clip(np.asarray(rgb) @ CVD_MATRICES[0].T, 0, 1)
 
 def simulate_deuteranopia(rgb):
     """Simula deuteranopia (dificultad para ver verde)"""
-    matrix = np.array([
-        [0.367, 0.861, -0.228],
-        [0.280, 0.673, 0.047],
-        [-0.011, 0.043, 0.968]
-    ])
-    return np.clip(np.dot(matrix, rgb), 0, 1)
+    return np.clip(np.asarray(rgb) @ CVD_MATRICES[1].T, 0, 1)
 
 def simulate_tritanopia(rgb):
     """Simula tritanopia (dificultad para ver azul)"""
-    matrix = np.array([
-        [1.255, -0.077, -0.178],
-        [0.078, 0.930, -0.008],
-        [-0.026, 0.263, 0.763]
-    ])
-    return np.clip(np.dot(matrix, rgb), 0, 1)
+    return np.clip(np.asarray(rgb) @ CVD_MATRICES[2].T, 0, 1)
+
+def simulate_color_blindness_batch(rgbs):
+    """
+    Simula los tres tipos de daltonismo para un array (..., 3) de colores RGB
+
+    Returns:
+        Array (..., 3, 3) donde el penúltimo eje sigue el orden de CVD_TYPES
+    """
+    return np.clip(np.einsum('tij,...j->...ti', CVD_MATRICES, rgbs), 0, 1)
+
+def color_blindness_contrasts(rgbs, pairs):
+    """
+    Calcula los contrastes con daltonismo de todos los pares de todas las paletas
+
+    Args:
+        rgbs: Array (N, colores, 3) con los colores RGB de cada paleta
+        pairs: Secuencia de pares de índices de color (i, j)
+
+    Returns:
+        Array (N, pares, 3) con el ratio de contraste por par y tipo (orden de CVD_TYPES)
+    """
+    first, second = np.asarray(pairs).T
+    simulated = simulate_color_blindness_batch(rgbs)
+    return contrast_ratio_array(simulated[:, first], simulated[:, second])
 
 def evaluate_color_blindness(color1, color2):
     """Evalúa legibilidad con diferentes tipos de daltonismo"""
-    types = {
-        'protanopia': simulate_protanopia,
-        'deuteranopia': simulate_deuteranopia,
-        'tritanopia': simulate_tritanopia
-    }
-    
-    results = {}
-    for name, simulator in types.items():
-        c1_sim = simulator(color1)
-        c2_sim = simulator(color2)
-        results[name] = contrast_ratio(c1_sim, c2_sim)
-    
-    return results
\ No newline at end of file
+    contrasts = color_blindness_contrasts(np.array([[color1, color2]], dtype=np.float64), [(0, 1)])[0, 0]
+    return {name: float(contrast) for name, contrast in zip(CVD_TYPES, contrasts)}
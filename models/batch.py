@@ -0,0 +1,129 @@
+"""
+Generación de paletas por lotes: varias instancias de ColorPaletteGA (una por
+conjunto de colores iniciales) evolucionan a la vez y, en cada generación, los
+individuos pendientes de todas ellas se apilan en un único array y se evalúan
+en una sola pasada vectorizada.
+"""
+import time
+
+import numpy as np
+
+from models.genetic_algorithm import ColorPaletteGA, score_terms
+
+
+class BatchPaletteGA:
+    def __init__(self, items, **shared):
+        """
+        Inicialización del lote
+
+        Args:
+            items: Lista de diccionarios con 'initial_colors' y, opcionalmente,
+                   parámetros propios de ColorPaletteGA que sustituyen a los comunes
+            **shared: Parámetros comunes de ColorPaletteGA
+
+        Con la misma semilla, cada elemento evoluciona exactamente igual que una
+        instancia independiente de ColorPaletteGA con sus parámetros.
+        """
+        self.gas = [ColorPaletteGA(**{**shared, **item}) for item in items]
+        n_genes = {ga.n_genes for ga in self.gas}
+        if len(n_genes) > 1:
+            raise ValueError("Todas las paletas del lote deben tener el mismo número de colores")
+
+        # Parámetros de aptitud de cada elemento, indexables por el dueño de cada fila
+        self._reference_labs = np.array([ga.initial_labs for ga in self.gas], dtype=np.float64)
+        self._min_contrast = np.array([ga.min_contrast for ga in self.gas], dtype=np.float64)
+        self._accessibility_weight = np.array([ga.accessibility_weight for ga in self.gas], dtype=np.float64)
+        self._initial_weight = np.array([ga.initial_weight for ga in self.gas], dtype=np.float64)
+        self._contrast_mask = np.array([ga.contrast_mask for ga in self.gas])
+        self._min_good_contrasts = np.array([ga.min_good_contrasts for ga in self.gas])
+        self.pairs = self.gas[0].pairs
+
+    def __len__(self):
+        return len(self.gas)
+
+    def evaluate_stacked(self, genes, owners):
+        """
+        Aptitud de individuos de distintos elementos en una sola pasada
+
+        Args:
+            genes: Array (M, n_genes)
+            owners: Array (M,) con el índice del elemento al que pertenece cada fila
+
+        Returns:
+            Array (M,) con la aptitud
+        """
+        genes = np.asarray(genes, dtype=np.float64).reshape(len(owners), -1, 3)
+        if len(genes) == 0:
+            return np.zeros(0)
+        color_terms, pair_terms = ColorPaletteGA.palette_terms(genes, self._reference_labs[owners], self.pairs)
+        return score_terms(color_terms, pair_terms, self._min_contrast[owners],
+                           self._accessibility_weight[owners], self._initial_weight[owners],
+                           self._contrast_mask[owners], self._min_good_contrasts[owners])
+
+    def _evaluate_pending(self, indices, populations):
+        """Evalúa juntos los individuos pendientes de las poblaciones de los elementos `indices`"""
+        pending = [~population.evaluated for population in populations]
+        counts = [int(mask.sum()) for mask in pending]
+        if not any(counts):
+            return
+        genes = np.concatenate([population.genes[mask] for population, mask in zip(populations, pending)])
+        fitness = self.evaluate_stacked(genes, np.repeat(indices, counts))
+
+        start = 0
+        for i, population, mask, count in zip(indices, populations, pending, counts):
+            population.fitness[mask] = fitness[start:start + count]
+            population.evaluated[mask] = True
+            self.gas[i].evaluations += count
+            start += count
+
+    def run(self, time_budget=None, target_fitness=None, stagnation_window=None, stagnation_epsilon=1e-4,
+            callback=None):
+        """
+        Ejecuta todos los elementos hasta que cada uno cumpla su criterio de parada
+
+        Acepta los mismos criterios que ColorPaletteGA.run(); el presupuesto de
+        tiempo es común a todo el lote. callback, si se indica, se llama tras cada
+        generación con el número de generación; si devuelve True, los elementos
+        que sigan activos terminan con stop_reason = 'cancelled'.
+
+        Returns:
+            Lista de (hall_of_fame, logbook) por elemento
+        """
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+        for ga in self.gas:
+            ga.start()
+            ga.logbook.stop_reason = 'generations'
+
+        active = [i for i, ga in enumerate(self.gas) if ga.generations > 0]
+        gen = 0
+        while active:
+            self._evaluate_pending(active, [self.gas[i].population for i in active])
+            for i in active:
+                self.gas[i].breed()
+            self._evaluate_pending(active, [self.gas[i]._combined for i in active])
+            for i in active:
+                self.gas[i].survive()
+
+            still_active = []
+            for i in active:
+                ga = self.gas[i]
+                reason = ga._stop_reason(deadline, target_fitness, stagnation_window, stagnation_epsilon)
+                if reason:
+                    ga.logbook.stop_reason = reason
+                elif ga.generation < ga.generations:
+                    still_active.append(i)
+            active = still_active
+
+            if callback is not None and callback(gen) and active:
+                for i in active:
+                    self.gas[i].logbook.stop_reason = 'cancelled'
+                break
+            gen += 1
+
+        for ga in self.gas:
+            ga._observe_run()
+        return [(ga.hall_of_fame, ga.logbook) for ga in self.gas]
+
+    def get_best_palettes(self, num=3):
+        """Mejores paletas de cada elemento"""
+        return [ga.get_best_palettes(num) for ga in self.gas]
@@ -0,0 +1,205 @@
+"""
+Conversiones sRGB <-> XYZ <-> L*a*b* implementadas directamente con NumPy.
+
+Sustituye a colormath en el camino crítico del algoritmo genético y del
+extractor. Todas las funciones aceptan escalares en forma de tupla (3,) o
+arrays (..., 3) y devuelven arrays con la misma forma.
+
+Los resultados reproducen los de colormath con sus valores por defecto:
+    - sRGB -> LAB usa el blanco de referencia D65 (iluminante nativo de sRGB).
+    - LAB -> sRGB interpreta el color como D50 (valor por defecto de LabColor)
+      y aplica la adaptación cromática de Bradford a D65 antes de la matriz sRGB.
+"""
+import numpy as np
+
+# Umbrales de la función f(t) de CIE L*a*b*
+CIE_E = 216.0 / 24389.0
+CIE_K_LINEAR = 7.787
+
+D50_WHITE = np.array([0.96422, 1.0, 0.82521])
+D65_WHITE = np.array([0.95047, 1.0, 1.08883])
+
+BRADFORD = np.array([
+    [0.8951, 0.2664, -0.1614],
+    [-0.7502, 1.7135, 0.0367],
+    [0.0389, -0.0685, 1.0296]
+])
+
+# Matrices del espacio sRGB (blanco D65)
+RGB_TO_XYZ = np.array([
+    [0.412424, 0.357579, 0.180464],
+    [0.212656, 0.715158, 0.0721856],
+    [0.0193324, 0.119193, 0.950444]
+])
+XYZ_TO_RGB = np.array([
+    [3.24071, -1.53726, -0.498571],
+    [-0.969258, 1.87599, 0.0415557],
+    [0.0556352, -0.203996, 1.05707]
+])
+
+D50_TO_D65 = np.linalg.inv(BRADFORD) @ np.diag(
+    (BRADFORD @ D65_WHITE) / (BRADFORD @ D50_WHITE)) @ BRADFORD
+
+# Matriz combinada XYZ (D50) -> sRGB lineal
+_LAB_XYZ_TO_RGB = XYZ_TO_RGB @ D50_TO_D65
+
+
+def srgb_to_linear(rgb):
+    """Elimina la curva de compansión sRGB (valores 0-1)"""
+    rgb = np.asarray(rgb, dtype=np.float64)
+    return np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+
+
+def linear_to_srgb(linear):
+    """Aplica la curva de compansión sRGB a valores lineales no negativos"""
+    linear = np.asarray(linear, dtype=np.float64)
+    return np.where(
+        linear <= 0.0031308,
+        linear * 12.92,
+        1.055 * np.power(np.maximum(linear, 0.0), 1 / 2.4) - 0.055
+    )
+
+
+def _lab_f(t):
+    """Función f(t) de CIE L*a*b*"""
+    return np.where(t > CIE_E, np.cbrt(t), CIE_K_LINEAR * t + 16.0 / 116.0)
+
+
+def _lab_f_inverse(f):
+    """Inversa de f(t) de CIE L*a*b*"""
+    f3 = f ** 3
+    return np.where(f3 > CIE_E, f3, (f - 16.0 / 116.0) / CIE_K_LINEAR)
+
+
+def xyz_to_lab(xyz, white=D65_WHITE):
+    """Convierte XYZ a L*a*b* respecto al blanco de referencia indicado"""
+    f = _lab_f(np.asarray(xyz, dtype=np.float64) / white)
+    return np.stack([
+        116.0 * f[..., 1] - 16.0,
+        500.0 * (f[..., 0] - f[..., 1]),
+        200.0 * (f[..., 1] - f[..., 2])
+    ], axis=-1)
+
+
+def lab_to_xyz(lab, white=D50_WHITE):
+    """Convierte L*a*b* a XYZ respecto al blanco de referencia indicado"""
+    lab = np.asarray(lab, dtype=np.float64)
+    fy = (lab[..., 0] + 16.0) / 116.0
+    f = np.stack([lab[..., 1] / 500.0 + fy, fy, fy - lab[..., 2] / 200.0], axis=-1)
+    return _lab_f_inverse(f) * white
+
+
+def rgb_to_lab_array(rgb_colors):
+    """Convierte un array (..., 3) de colores sRGB (0-1) a L*a*b* (D65)"""
+    xyz = np.maximum(srgb_to_linear(rgb_colors) @ RGB_TO_XYZ.T, 0.0)
+    return xyz_to_lab(xyz, D65_WHITE)
+
+
+def _lab_to_linear_rgb_exact(lab_colors):
+    """Conversión exacta L*a*b* (D50) -> sRGB lineal"""
+    return lab_to_xyz(lab_colors, D50_WHITE) @ _LAB_XYZ_TO_RGB.T
+
+
+# --- Rejilla L*a*b* -> sRGB lineal con interpolación trilineal ---
+#
+# La rejilla cubre L en [0, 100] y a, b en [-128, 128]. La conversión exacta es
+# cúbica a trozos en cada eje, así que el error de la interpolación trilineal
+# crece con el cuadrado del paso. Con los pasos por defecto (L cada 2, a/b cada 4;
+# ~5 MB) el error máximo medido en sRGB lineal es < 1e-3 por canal, lo que
+# supone ΔE00 < 0.2 en los colores dentro del gamut y < 2e-4 en la aptitud.
+# Con L cada 1 y a/b cada 2 (~40 MB) el error baja a < 2.5e-4. Los puntos fuera
+# de la rejilla usan siempre la conversión exacta.
+LAB_GRID_BOUNDS = ((0.0, 100.0), (-128.0, 128.0), (-128.0, 128.0))
+_lab_grid = None
+_use_lab_grid = False
+
+
+def build_lab_grid(l_step=2.0, ab_step=4.0):
+    """Precalcula la rejilla L*a*b* -> sRGB lineal con los pasos indicados"""
+    global _lab_grid
+    steps = np.array([l_step, ab_step, ab_step], dtype=np.float64)
+    lows = np.array([b[0] for b in LAB_GRID_BOUNDS])
+    highs = np.array([b[1] for b in LAB_GRID_BOUNDS])
+    sizes = np.round((highs - lows) / steps).astype(int) + 1
+
+    axes = [lows[i] + steps[i] * np.arange(sizes[i]) for i in range(3)]
+    lab = np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1)
+    _lab_grid = (_lab_to_linear_rgb_exact(lab), lows, steps, sizes)
+    return _lab_grid
+
+
+def use_lab_grid(enabled=True, l_step=None, ab_step=None):
+    """
+    Activa o desactiva la rejilla interpolada en tiempo de ejecución
+
+    La rejilla se construye la primera vez que se activa o cuando cambian los pasos.
+    """
+    global _use_lab_grid
+    _use_lab_grid = bool(enabled)
+    if _use_lab_grid and (_lab_grid is None or l_step is not None or ab_step is not None):
+        build_lab_grid(l_step or 2.0, ab_step or 4.0)
+
+
+def _lab_to_linear_rgb_grid(lab_colors):
+    """Interpolación trilineal de sRGB lineal sobre la rejilla precalculada"""
+    grid, lows, steps, sizes = _lab_grid
+    lab = np.asarray(lab_colors, dtype=np.float64)
+    pos = (lab - lows) / steps
+    inside = np.all((pos >= 0) & (pos <= sizes - 1), axis=-1)
+
+    idx = np.minimum(np.clip(pos, 0, None).astype(np.intp), sizes - 2)
+    frac = np.clip(pos - idx, 0.0, 1.0)
+    fl, fa, fb = frac[..., 0:1], frac[..., 1:2], frac[..., 2:3]
+
+    # Índice plano de la esquina inferior y desplazamientos de las otras esquinas
+    stride_l, stride_a = sizes[1] * sizes[2], sizes[2]
+    base = idx[..., 0] * stride_l + idx[..., 1] * stride_a + idx[..., 2]
+    flat = grid.reshape(-1, 3)
+
+    # Interpolar primero en b, luego en a y por último en L
+    def corner_pair(offset):
+        return flat[base + offset] * (1 - fb) + flat[base + offset + 1] * fb
+
+    c00 = corner_pair(0)
+    c01 = corner_pair(stride_a)
+    c10 = corner_pair(stride_l)
+    c11 = corner_pair(stride_l + stride_a)
+    result = (c00 * (1 - fa) + c01 * fa) * (1 - fl) + (c10 * (1 - fa) + c11 * fa) * fl
+
+    if not np.all(inside):
+        result = np.where(inside[..., np.newaxis], result, _lab_to_linear_rgb_exact(lab))
+    return result
+
+
+def lab_to_linear_rgb(lab_colors):
+    """Convierte un array (..., 3) de colores L*a*b* (D50) a sRGB lineal sin recortar"""
+    if _use_lab_grid:
+        return _lab_to_linear_rgb_grid(lab_colors)
+    return _lab_to_linear_rgb_exact(lab_colors)
+
+
+def in_gamut(linear_rgb, tolerance=1e-9):
+    """Devuelve una máscara (...,) indicando qué colores lineales caben en sRGB"""
+    linear_rgb = np.asarray(linear_rgb, dtype=np.float64)
+    return np.all((linear_rgb >= -tolerance) & (linear_rgb <= 1.0 + tolerance), axis=-1)
+
+
+def lab_to_rgb_array(lab_colors, return_gamut=False):
+    """
+    Convierte un array (..., 3) de colores L*a*b* a sRGB (0-1)
+
+    Los valores lineales negativos se recortan a 0 y los mayores que 1 se
+    conservan, igual que colormath.
+
+    Args:
+        lab_colors: Array (..., 3) de colores L*a*b*
+        return_gamut: Si es True devuelve también la máscara de colores dentro del gamut sRGB
+
+    Returns:
+        Array (..., 3) de colores RGB, o tupla (rgb, mascara_gamut) si return_gamut es True
+    """
+    linear = lab_to_linear_rgb(lab_colors)
+    rgb = linear_to_srgb(np.maximum(linear, 0.0))
+    if return_gamut:
+        return rgb, in_gamut(linear)
+    return rgb
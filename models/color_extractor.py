@@ -1,21 +1,29 @@
 import re
-import requests
-from bs4 import BeautifulSoup
 from collections import Counter
 import numpy as np
-from sklearn.cluster import KMeans
 import colorsys
-from colormath.color_objects import sRGBColor, LabColor
-from colormath.color_conversions import convert_color
+from models.color_utils import rgb_to_lab
+from models.accessibility import relative_luminance_8bit, relative_luminance_array
+from models.profiling import PhaseTimer, timed
+from models import metrics
 from urllib.parse import urljoin, urlparse
-import cssutils # Necesitas instalar: pip install cssutils
 import logging
 import math
+import time
+
+# requests, BeautifulSoup, cssutils y sklearn se importan solo en las rutas de
+# extracción que los usan para no alargar el arranque del servidor
 
 # Configura el logging (opcional, pero útil para depurar)
 logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
-# Silenciar warnings de cssutils sobre propiedades desconocidas
-cssutils.log.setLevel(logging.CRITICAL)
+
+
+def _cssutils():
+    """Importa cssutils (pip install cssutils) la primera vez que se necesita"""
+    import cssutils
+    # Silenciar warnings de cssutils sobre propiedades desconocidas
+    cssutils.log.setLevel(logging.CRITICAL)
+    return cssutils
 
 # --- Constantes y Helpers ---
 
@@ -128,13 +136,11 @@ def _hex_to_rgb_normalized(hex_color):
 
 def _get_relative_luminance(rgb_normalized):
     """Calcula la luminancia relativa según WCAG."""
-    rgb = []
-    for val in rgb_normalized:
-        if val <= 0.03928:
-            rgb.append(val / 12.92)
-        else:
-            rgb.append(((val + 0.055) / 1.055) ** 2.4)
-    return 0.2126 * rgb[0] + 0.7152 * rgb[1] + 0.0722 * rgb[2]
+    # Los colores vienen de valores hex, así que sus canales son exactamente k/255
+    rgb8 = [int(round(val * 255)) for val in rgb_normalized]
+    if all(0 <= c <= 255 and abs(c - val * 255) < 1e-6 for c, val in zip(rgb8, rgb_normalized)):
+        return float(relative_luminance_8bit(rgb8))
+    return float(relative_luminance_array(rgb_normalized))
 
 def _calculate_contrast_ratio(hex_color1, hex_color2):
     """Calcula el ratio de contraste WCAG entre dos colores HEX."""
@@ -176,13 +182,20 @@ class ColorExtractor:
         # Propiedades de color relevantes
         self.color_properties = ['color', 'background-color', 'background', 'border-color', 'fill', 'stroke']
 
+        # Tiempo por fase: html_fetch, html_parse, css_fetch, css_parse y clustering
+        self.timer = PhaseTimer()
+
     def extract_from_url(self, url, timeout=10):
         """Extrae colores principales desde una URL."""
+        import requests
         try:
             headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-            response = requests.get(url, timeout=timeout, headers=headers)
+            with self.timer.phase('html_fetch'):
+                response = requests.get(url, timeout=timeout, headers=headers)
             response.raise_for_status() # Lanza excepción para códigos de error HTTP
             content_type = response.headers.get('content-type', '').lower()
+            if 'text/html' not in content_type:
+                metrics.FETCH_ERRORS.inc(resource='page', reason='not_html')
 
             if 'text/html' in content_type:
                 html_content = response.text
@@ -193,6 +206,7 @@ class ColorExtractor:
                 raise ValueError(f"La URL no devolvió HTML. Content-Type: {content_type}")
 
         except requests.exceptions.RequestException as e:
+            metrics.FETCH_ERRORS.inc(resource='page', reason='network')
             logging.error(f"Error al obtener URL {url}: {e}")
             raise Exception(f"Error de red al acceder a {url}: {e}") from e
         except Exception as e:
@@ -201,7 +215,9 @@ class ColorExtractor:
 
     def extract_from_html(self, html_content, base_url=None):
         """Método principal para extraer colores primarios, de fondo y de acento."""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        from bs4 import BeautifulSoup
+        with self.timer.phase('html_parse'):
+            soup = BeautifulSoup(html_content, 'html.parser')
 
         # 1. Extraer TODOS los colores (inline, <style>, CSS externo)
         all_colors_data = self._extract_all_colors_with_context(soup, base_url)
@@ -288,31 +304,43 @@ class ColorExtractor:
 
     def _fetch_and_parse_css(self, url, base_url, timeout=5):
         """Descarga y parsea un archivo CSS."""
+        import requests
+        cssutils = _cssutils()
         full_url = url
         if base_url and not urlparse(url).scheme:
             full_url = urljoin(base_url, url)
 
         try:
             headers = {'User-Agent': 'Mozilla/5.0'} # Ser un buen ciudadano web
-            response = requests.get(full_url, timeout=timeout, headers=headers)
-            response.raise_for_status()
-            # Intentar decodificar con la codificación detectada o UTF-8
-            response.encoding = response.apparent_encoding or 'utf-8'
-            css_text = response.text
+            start = time.perf_counter()
+            try:
+                with self.timer.phase('css_fetch'):
+                    response = requests.get(full_url, timeout=timeout, headers=headers)
+                    response.raise_for_status()
+                    # Intentar decodificar con la codificación detectada o UTF-8
+                    response.encoding = response.apparent_encoding or 'utf-8'
+                    css_text = response.text
+            finally:
+                metrics.STYLESHEET_FETCH_DURATION.observe(time.perf_counter() - start)
             # Parsear CSS - ignorar errores de propiedades específicas
             parser = cssutils.CSSParser(log=logging.getLogger('cssutils'), fetcher=lambda u: ('utf-8', b'')) # Evitar fetching recursivo
             sheet = parser.parseString(css_text, href=full_url)
             return sheet
         except requests.exceptions.RequestException as e:
+            metrics.FETCH_ERRORS.inc(resource='stylesheet', reason='network')
             logging.warning(f"No se pudo descargar CSS desde {full_url}: {e}")
             return None
         except Exception as e:
+            metrics.FETCH_ERRORS.inc(resource='stylesheet', reason='parse')
             logging.warning(f"Error al parsear CSS desde {full_url}: {e}")
             return None
 
+    # Incluye el parseo del CSS externo; su descarga se mide aparte como css_fetch
+    @timed('css_parse')
     def _extract_all_colors_with_context(self, soup, base_url):
         """Extrae todos los colores del HTML y CSS asociado, guardando contexto."""
         colors_data = [] # Lista de diccionarios {'color': hex, 'property': prop, 'is_background': bool}
+        cssutils = _cssutils()
 
         # 1. Estilos inline
         for tag in soup.find_all(style=True):
@@ -388,7 +416,7 @@ class ColorExtractor:
          # Estilo inline
          if element.has_attr('style'):
              try:
-                 style_declaration = cssutils.parseStyle(element['style'])
+                 style_declaration = _cssutils().parseStyle(element['style'])
                  for prop in style_declaration:
                      if prop.name in self.color_properties:
                          color = _parse_color_value(prop.value)
@@ -579,6 +607,7 @@ class ColorExtractor:
         return self.default_accent
 
 
+    @timed('clustering')
     def _analyze_by_clustering(self, hex_colors, n_clusters=5):
         """Utiliza K-means para encontrar colores representativos."""
         if not hex_colors or len(hex_colors) < n_clusters:
@@ -612,6 +641,7 @@ class ColorExtractor:
 
 
         try:
+            from sklearn.cluster import KMeans
             rgb_array = np.array(valid_rgb_colors)
             # n_init='auto' es la opción recomendada en versiones recientes de sklearn
             kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init='auto', max_iter=100) # max_iter bajo para velocidad
@@ -624,12 +654,11 @@ class ColorExtractor:
             for i, rgb_norm in enumerate(centroids_rgb_norm):
                  # Convertir centroide a Lab para evaluar luminosidad perceptual
                  try:
-                      rgb_obj = sRGBColor(rgb_norm[0], rgb_norm[1], rgb_norm[2], is_upscaled=True) # is_upscaled si son 0-1
-                      lab_obj = convert_color(rgb_obj, LabColor)
-                      lightness = lab_obj.lab_l # 0 (negro) a 100 (blanco)
+                      lab_l, lab_a, lab_b = rgb_to_lab(rgb_norm)
+                      lightness = lab_l # 0 (negro) a 100 (blanco)
                       # Calcular saturación (aproximada desde Lab o convertir a HSL/HSV)
                       # Usaremos una aproximación con a* y b* (distancia desde el eje gris)
-                      chroma = math.sqrt(lab_obj.lab_a**2 + lab_obj.lab_b**2)
+                      chroma = math.sqrt(lab_a**2 + lab_b**2)
                  except Exception as conv_err:
                       logging.debug(f"Error en conversión de color para centroide {rgb_norm}: {conv_err}")
                       lightness = 50 # Valor neutro
@@ -669,11 +698,10 @@ class ColorExtractor:
                 rgb_norm = _hex_to_rgb_normalized(hex_color)
                 if rgb_norm is None: continue
 
-                rgb_obj = sRGBColor(rgb_norm[0], rgb_norm[1], rgb_norm[2], is_upscaled=True)
-                lab_obj = convert_color(rgb_obj, LabColor)
+                lab_l = rgb_to_lab(rgb_norm)[0]
 
-                if lab_obj.lab_l > max_l:
-                    max_l = lab_obj.lab_l
+                if lab_l > max_l:
+                    max_l = lab_l
                     lightest_color = hex_color
             except Exception as e:
                 logging.debug(f"Error al calcular L* para {hex_color}: {e}")
@@ -690,22 +718,21 @@ class ColorExtractor:
             # Blancos y negros puros
             if hex_color in ["#FFFFFF", "#000000"]: return True
 
-            rgb_obj = sRGBColor(rgb_norm[0], rgb_norm[1], rgb_norm[2], is_upscaled=True)
-            lab_obj = convert_color(rgb_obj, LabColor)
+            lab_l, lab_a, lab_b = rgb_to_lab(rgb_norm)
 
             # Comprobar si está cerca del eje acromático (a* y b* cerca de 0)
             # y no es extremadamente claro u oscuro (esos son blanco/negro)
-            chroma = math.sqrt(lab_obj.lab_a**2 + lab_obj.lab_b**2)
+            chroma = math.sqrt(lab_a**2 + lab_b**2)
 
             # Es gris si tiene baja cromaticidad
             # Aumentamos el umbral de 'threshold' para considerar más colores como neutros
             # si su luminosidad es muy alta o muy baja.
-            l = lab_obj.lab_l
+            l = lab_l
             adjusted_threshold = threshold
             if l > 90 or l < 10: # Si es casi blanco o casi negro
                  adjusted_threshold = threshold * 1.8 # Permitir más desviación a/b
 
-            # print(f"Color: {hex_color}, L*: {l:.1f}, a*: {lab_obj.lab_a:.1f}, b*: {lab_obj.lab_b:.1f}, Chroma: {chroma:.1f}, Threshold: {adjusted_threshold:.1f}")
+            # print(f"Color: {hex_color}, L*: {l:.1f}, a*: {lab_a:.1f}, b*: {lab_b:.1f}, Chroma: {chroma:.1f}, Threshold: {adjusted_threshold:.1f}")
 
             return chroma < adjusted_threshold
 
@@ -73,4 +73,81 @@ def delta_e_cie2000(color1, color2, Kl=1, Kc=1, Kh=1):
     dE00 = np.sqrt((dL / (Kl * Sl))**2 + (dC / (Kc * Sc))**2 + (dH / (Kh * Sh))**2 + Rt * (dC / (Kc * Sc)) * (dH / (Kh * Sh)))
     
     # Devolvemos el valor como un flotante Python estándar
-    return float(dE00)
\ No newline at end of file
+    return float(dE00)
+
+
+def delta_e_cie2000_array(lab1, lab2, Kl=1, Kc=1, Kh=1):
+    """
+    Versión vectorizada de delta_e_cie2000 sobre arrays (..., 3) de valores L*a*b*.
+
+    Los argumentos se combinan con las reglas de broadcasting de NumPy y el
+    resultado tiene la forma del broadcast sin el último eje.
+    """
+    lab1 = np.asarray(lab1, dtype=np.float64)
+    lab2 = np.asarray(lab2, dtype=np.float64)
+    L1, a1, b1 = lab1[..., 0], lab1[..., 1], lab1[..., 2]
+    L2, a2, b2 = lab2[..., 0], lab2[..., 1], lab2[..., 2]
+
+    C1 = np.sqrt(a1**2 + b1**2)
+    C2 = np.sqrt(a2**2 + b2**2)
+    Cab = (C1 + C2) / 2.0
+
+    G = 0.5 * (1 - np.sqrt(Cab**7 / (Cab**7 + 25**7)))
+
+    ap1 = (1 + G) * a1
+    ap2 = (1 + G) * a2
+    Cp1 = np.sqrt(ap1**2 + b1**2)
+    Cp2 = np.sqrt(ap2**2 + b2**2)
+
+    # Ángulos de tono en [0, 2π) usando máscaras en lugar de ramas
+    hp1 = np.arctan2(b1, ap1)
+    hp1 = np.where(hp1 < 0, hp1 + 2 * np.pi, hp1)
+    hp2 = np.arctan2(b2, ap2)
+    hp2 = np.where(hp2 < 0, hp2 + 2 * np.pi, hp2)
+
+    dL = L2 - L1
+    dC = Cp2 - Cp1
+
+    dhp = hp2 - hp1
+    dhp = np.where(dhp > np.pi, dhp - 2 * np.pi, dhp)
+    dhp = np.where(dhp < -np.pi, dhp + 2 * np.pi, dhp)
+
+    dH = 2 * np.sqrt(Cp1 * Cp2) * np.sin(dhp / 2.0)
+
+    Lp = (L1 + L2) / 2.0
+    Cp = (Cp1 + Cp2) / 2.0
+
+    hp = (hp1 + hp2) / 2.0
+    hp = np.where(np.abs(hp1 - hp2) > np.pi, hp + np.pi, hp)
+
+    T = 1 - 0.17 * np.cos(hp - np.pi/6) + 0.24 * np.cos(2*hp) + 0.32 * np.cos(3*hp + np.pi/30) - 0.2 * np.cos(4*hp - 21*np.pi/60)
+
+    dTheta = 30 * np.exp(-((hp - 275*np.pi/180) / (25*np.pi/180))**2)
+
+    Rc = 2 * np.sqrt(Cp**7 / (Cp**7 + 25**7))
+
+    Sl = 1 + (0.015 * (Lp - 50)**2) / np.sqrt(20 + (Lp - 50)**2)
+    Sc = 1 + 0.045 * Cp
+    Sh = 1 + 0.015 * Cp * T
+
+    Rt = -np.sin(2 * dTheta * np.pi / 180) * Rc
+
+    dE00 = np.sqrt((dL / (Kl * Sl))**2 + (dC / (Kc * Sc))**2 + (dH / (Kh * Sh))**2 + Rt * (dC / (Kc * Sc)) * (dH / (Kh * Sh)))
+
+    return dE00
+
+
+def delta_e_cie2000_matrix(labs1, labs2=None, Kl=1, Kc=1, Kh=1):
+    """
+    Calcula la matriz de distancias CIEDE2000 entre dos conjuntos de colores
+
+    Args:
+        labs1: Array (M, 3) de colores L*a*b*
+        labs2: Array (K, 3) de colores L*a*b*; si es None se usa labs1
+
+    Returns:
+        Array (M, K) donde [i, j] es la distancia entre labs1[i] y labs2[j]
+    """
+    labs1 = np.asarray(labs1, dtype=np.float64).reshape(-1, 3)
+    labs2 = labs1 if labs2 is None else np.asarray(labs2, dtype=np.float64).reshape(-1, 3)
+    return delta_e_cie2000_array(labs1[:, np.newaxis, :], labs2[np.newaxis, :, :], Kl, Kc, Kh)
@@ -1,9 +1,7 @@
 import numpy as np
 import colorsys
-from colormath.color_objects import LabColor, sRGBColor
-from colormath.color_conversions import convert_color
-# Importar nuestra versión modificada en lugar de la original
-from models.color_patch import delta_e_cie2000
+from models.color_conversions import rgb_to_lab_array, lab_to_rgb_array
+from models.color_patch import delta_e_cie2000_array
 
 def hex_to_rgb(hex_color):
     """Convierte color hexadecimal a RGB (0-1)"""
@@ -11,27 +9,19 @@ def hex_to_rgb(hex_color):
     return tuple(int(h[i:i+2], 16)/255 for i in (0, 2, 4))
 
 def rgb_to_hex(rgb_color):
-    """Convierte RGB (0-1) a hexadecimal"""
+    """Convierte RGB (0-1) a hexadecimal; los componentes fuera de [0, 1] se recortan"""
     return '#{:02x}{:02x}{:02x}'.format(
-        int(rgb_color[0]*255), 
-        int(rgb_color[1]*255), 
-        int(rgb_color[2]*255)
+        *(int(min(max(component, 0.0), 1.0) * 255) for component in rgb_color[:3])
     )
 
 def rgb_to_lab(rgb_color):
     """Convierte RGB a LAB para cálculos perceptuales"""
-    rgb_obj = sRGBColor(rgb_color[0], rgb_color[1], rgb_color[2])
-    lab_obj = convert_color(rgb_obj, LabColor)
-    return (lab_obj.lab_l, lab_obj.lab_a, lab_obj.lab_b)
+    return tuple(float(v) for v in rgb_to_lab_array(rgb_color))
 
 def lab_to_rgb(lab_color):
     """Convierte LAB a RGB"""
-    lab_obj = LabColor(lab_color[0], lab_color[1], lab_color[2])
-    rgb_obj = convert_color(lab_obj, sRGBColor)
-    return (rgb_obj.rgb_r, rgb_obj.rgb_g, rgb_obj.rgb_b)
+    return tuple(float(v) for v in lab_to_rgb_array(lab_color))
 
 def get_delta_e(color1, color2):
     """Calcula la distancia perceptual entre dos colores en LAB"""
-    lab1 = LabColor(color1[0], color1[1], color1[2])
-    lab2 = LabColor(color2[0], color2[1], color2[2])
-    return delta_e_cie2000(lab1, lab2)
\ No newline at end of file
+    return float(delta_e_cie2000_array(color1, color2))
\ No newline at end of file
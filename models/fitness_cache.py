@@ -0,0 +1,185 @@
+from collections import OrderedDict
+
+import numpy as np
+
+
+class FitnessCache:
+    """
+    Caché LRU acotada de aptitud indexada por el vector de genes
+
+    La clave son los bytes del vector de genes, opcionalmente redondeado a
+    `decimals` decimales para que individuos casi idénticos compartan entrada.
+    """
+
+    def __init__(self, maxsize=10000, decimals=None):
+        self.maxsize = maxsize
+        self.decimals = decimals
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evaluations = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def _keys(self, genes):
+        """Claves de cada fila del array de genes"""
+        if self.decimals is not None:
+            genes = np.round(genes, self.decimals)
+        # Sumar 0.0 normaliza -0.0 a 0.0 para que ambas compartan clave
+        genes = np.ascontiguousarray(genes + 0.0)
+        return [row.tobytes() for row in genes]
+
+    def lookup(self, genes, evaluate):
+        """
+        Devuelve la aptitud de cada fila, evaluando solo las que no están en caché
+
+        Args:
+            genes: Array (N, n_genes)
+            evaluate: Función que recibe un array (M, n_genes) y devuelve (M,)
+
+        Returns:
+            Array (N,) con la aptitud
+        """
+        genes = np.asarray(genes, dtype=np.float64)
+        keys = self._keys(genes)
+        result = np.empty(len(keys), dtype=np.float64)
+
+        # Filas pendientes agrupadas por clave para evaluar cada individuo una sola vez
+        pending = {}
+        for i, key in enumerate(keys):
+            value = self._data.get(key)
+            if value is None:
+                pending.setdefault(key, []).append(i)
+            else:
+                self._data.move_to_end(key)
+                result[i] = value
+        self.hits += len(keys) - sum(len(rows) for rows in pending.values())
+
+        if pending:
+            self.misses += sum(len(rows) for rows in pending.values())
+            first_rows = [rows[0] for rows in pending.values()]
+            values = evaluate(genes[first_rows])
+            self.evaluations += len(first_rows)
+
+            for (key, rows), value in zip(pending.items(), values):
+                result[rows] = value
+                self._data[key] = float(value)
+
+            # Expulsar las entradas usadas hace más tiempo
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+        return result
+
+    def clear(self):
+        """Vacía la caché y reinicia los contadores"""
+        self._data.clear()
+        self.hits = self.misses = self.evaluations = 0
+
+    def stats(self):
+        """Contadores de uso de la caché"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evaluations': self.evaluations,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self._data),
+        }
+
+
+class TermCache:
+    """
+    Caché vectorizada de términos parciales de aptitud (por color o por par)
+
+    Cada entrada asocia un vector clave de floats (por ejemplo el rol y los genes
+    L*a*b* de un color) a un vector de términos. Las claves se resumen en un hash
+    de 64 bits guardado en un array ordenado, de modo que la búsqueda de todo un
+    lote es un `np.searchsorted`; la clave completa se compara después para
+    descartar colisiones. Al superar `maxsize` se conservan las entradas usadas
+    más recientemente.
+    """
+
+    _MIX = np.uint64(0x9E3779B97F4A7C15)
+
+    def __init__(self, key_width, value_width, maxsize=50000):
+        self.maxsize = maxsize
+        self._hashes = np.zeros(0, dtype=np.uint64)
+        self._keys = np.zeros((0, key_width), dtype=np.float64)
+        self._values = np.zeros((0, value_width), dtype=np.float64)
+        self._stamps = np.zeros(0, dtype=np.int64)
+        self._clock = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def _hash(self, keys):
+        """Hash de 64 bits de cada fila de claves"""
+        bits = np.ascontiguousarray(keys + 0.0).view(np.uint64)
+        h = np.zeros(len(keys), dtype=np.uint64)
+        for column in bits.T:
+            h = (h ^ column) * self._MIX
+            h ^= h >> np.uint64(29)
+        return h
+
+    def lookup(self, keys, compute):
+        """
+        Devuelve los términos de cada clave, calculando solo las que faltan
+
+        Args:
+            keys: Array (N, key_width)
+            compute: Función que recibe las filas de `keys` pendientes (M, key_width)
+                     y devuelve sus términos (M, value_width)
+
+        Returns:
+            Array (N, value_width)
+        """
+        keys = np.asarray(keys, dtype=np.float64)
+        hashes = self._hash(keys)
+        self._clock += 1
+
+        pos = np.minimum(np.searchsorted(self._hashes, hashes), max(len(self._hashes) - 1, 0))
+        if len(self._hashes):
+            found = (self._hashes[pos] == hashes) & np.all(self._keys[pos] == keys, axis=1)
+        else:
+            found = np.zeros(len(keys), dtype=bool)
+
+        result = np.empty((len(keys), self._values.shape[1]), dtype=np.float64)
+        result[found] = self._values[pos[found]]
+        self._stamps[pos[found]] = self._clock
+        self.hits += int(found.sum())
+
+        missing = np.flatnonzero(~found)
+        if len(missing):
+            self.misses += len(missing)
+            # Calcular cada clave nueva una sola vez aunque aparezca varias veces en el lote
+            _, first, inverse = np.unique(hashes[missing], return_index=True, return_inverse=True)
+            new_rows = missing[first]
+            new_values = np.asarray(compute(keys[new_rows]), dtype=np.float64)
+            result[missing] = new_values[inverse.ravel()]
+            self._insert(hashes[new_rows], keys[new_rows], new_values)
+
+        return result
+
+    def _insert(self, hashes, keys, values):
+        """Añade entradas nuevas manteniendo el orden por hash y el tamaño máximo"""
+        all_hashes = np.concatenate([self._hashes, hashes])
+        all_keys = np.concatenate([self._keys, keys])
+        all_values = np.concatenate([self._values, values])
+        all_stamps = np.concatenate([self._stamps, np.full(len(hashes), self._clock)])
+
+        if len(all_hashes) > self.maxsize:
+            recent = np.argsort(-all_stamps, kind='stable')[:self.maxsize]
+            all_hashes, all_keys = all_hashes[recent], all_keys[recent]
+            all_values, all_stamps = all_values[recent], all_stamps[recent]
+
+        order = np.argsort(all_hashes, kind='stable')
+        self._hashes, self._keys = all_hashes[order], all_keys[order]
+        self._values, self._stamps = all_values[order], all_stamps[order]
+
+    def clear(self):
+        """Vacía la caché y reinicia los contadores"""
+        self.__init__(self._keys.shape[1], self._values.shape[1], self.maxsize)
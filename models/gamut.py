@@ -0,0 +1,126 @@
+"""
+Reparación de colores L*a*b* fuera del gamut sRGB.
+
+Los genes cubren a, b en [-128, 128], pero para cada L y tono solo una fracción
+de ese rango corresponde a colores sRGB reales. La tabla precalculada guarda el
+croma máximo representable por L y tono; repair_labs() proyecta los colores que
+quedan fuera reduciendo su croma (conserva L y el tono) en bloque.
+
+El gamut se interpreta igual que lab_to_rgb_array (L*a*b* D50 con adaptación de
+Bradford a sRGB D65).
+"""
+import numpy as np
+
+from models.color_conversions import _lab_to_linear_rgb_exact, in_gamut
+
+# Croma máximo buscado: cubre todo el rango a, b de los genes
+MAX_CHROMA = 128.0 * np.sqrt(2.0)
+
+# Margen en sRGB lineal: el blanco D50 adaptado queda ~8e-5 por encima de 1 en el
+# canal rojo, y cualquier valor por debajo de 1 + 1e-3 sigue siendo 255 en hex
+GAMUT_TOLERANCE = 1e-3
+
+# La interpolación bilineal sobrestima el límite en ~90 % de los casos, aunque casi
+# siempre en menos de 0.01 de croma; este margen (ΔE < 0.1) deja dentro ~99.5 %
+# de las proyecciones sin recurrir a la bisección
+CHROMA_MARGIN = 0.1
+
+_boundary = None
+
+
+def _bisect_scale(labs, low, high, iterations):
+    """
+    Mayor factor de croma en [low, high] que deja cada color dentro del gamut
+
+    Supone que, para L y tono fijos, los cromas válidos forman un intervalo [0, máximo].
+    """
+    low = np.array(low, dtype=np.float64)
+    high = np.array(high, dtype=np.float64)
+    for _ in range(iterations):
+        mid = (low + high) / 2
+        candidate = labs.copy()
+        candidate[..., 1:] *= mid[..., np.newaxis]
+        inside = in_gamut(_lab_to_linear_rgb_exact(candidate), GAMUT_TOLERANCE)
+        low = np.where(inside, mid, low)
+        high = np.where(inside, high, mid)
+    return low
+
+
+def build_gamut_boundary(l_step=1.0, hue_step=1.0, iterations=24):
+    """
+    Precalcula el croma máximo sRGB para una rejilla de L (0-100) y tono (0-360)
+
+    Returns:
+        Array (L, tonos + 1); la última columna repite la primera para interpolar
+        sin tratar aparte el cruce por 360°
+    """
+    global _boundary
+    lightness = np.arange(0.0, 100.0 + l_step / 2, l_step)
+    hues = np.radians(np.arange(0.0, 360.0, hue_step))
+    L, h = np.meshgrid(lightness, hues, indexing='ij')
+    labs = np.stack([L, MAX_CHROMA * np.cos(h), MAX_CHROMA * np.sin(h)], axis=-1)
+
+    chroma = MAX_CHROMA * _bisect_scale(labs, np.zeros(L.shape), np.ones(L.shape), iterations)
+    table = np.concatenate([chroma, chroma[:, :1]], axis=1)
+    _boundary = (table, l_step, hue_step)
+    return _boundary
+
+
+def max_chroma(L, hue):
+    """
+    Croma máximo sRGB interpolado de la tabla (bilineal en L y tono)
+
+    Args:
+        L: Array de luminosidades (0-100)
+        hue: Array de tonos en grados (0-360)
+    """
+    if _boundary is None:
+        build_gamut_boundary()
+    table, l_step, hue_step = _boundary
+    pos_l = np.clip(np.asarray(L, dtype=np.float64), 0.0, 100.0) / l_step
+    pos_h = np.mod(np.asarray(hue, dtype=np.float64), 360.0) / hue_step
+
+    i = np.minimum(pos_l.astype(np.intp), table.shape[0] - 2)
+    j = np.minimum(pos_h.astype(np.intp), table.shape[1] - 2)
+    fl = pos_l - i
+    fh = pos_h - j
+    low = table[i, j] * (1 - fh) + table[i, j + 1] * fh
+    high = table[i + 1, j] * (1 - fh) + table[i + 1, j + 1] * fh
+    return low * (1 - fl) + high * fl
+
+
+def repair_labs(labs, iterations=12):
+    """
+    Proyecta sobre el gamut sRGB los colores L*a*b* que quedan fuera
+
+    Se reduce el croma hasta el máximo de la tabla (menos CHROMA_MARGIN)
+    conservando L y tono. Los pocos colores que siguen fuera, junto a las
+    aristas del gamut, se ajustan con una bisección corta sobre la conversión exacta.
+
+    Args:
+        labs: Array (..., 3) de colores L*a*b*
+
+    Returns:
+        (colores reparados, máscara (...,) de colores que se han modificado)
+    """
+    labs = np.array(labs, dtype=np.float64)
+    outside = ~in_gamut(_lab_to_linear_rgb_exact(labs), GAMUT_TOLERANCE)
+    if not outside.any():
+        return labs, outside
+
+    bad = labs[outside]
+    chroma = np.hypot(bad[:, 1], bad[:, 2])
+    hue = np.degrees(np.arctan2(bad[:, 2], bad[:, 1]))
+    limit = np.maximum(max_chroma(bad[:, 0], hue) - CHROMA_MARGIN, 0.0)
+    scale = np.where(chroma > 0, np.minimum(limit / np.where(chroma > 0, chroma, 1.0), 1.0), 1.0)
+
+    candidate = bad.copy()
+    candidate[:, 1:] *= scale[:, np.newaxis]
+    still_outside = ~in_gamut(_lab_to_linear_rgb_exact(candidate), GAMUT_TOLERANCE)
+    if still_outside.any():
+        scale[still_outside] = _bisect_scale(bad[still_outside], np.zeros(int(still_outside.sum())),
+                                             scale[still_outside], iterations)
+        candidate[still_outside, 1:] = bad[still_outside, 1:] * scale[still_outside, np.newaxis]
+
+    labs[outside] = candidate
+    return labs, outside
@@ -1,7 +1,16 @@
-import random
+import time
 import numpy as np
-from models.color_utils import hex_to_rgb, rgb_to_lab, lab_to_rgb, rgb_to_hex, get_delta_e
-from models.accessibility import contrast_ratio, evaluate_color_blindness
+from models.color_utils import hex_to_rgb, rgb_to_lab, rgb_to_hex
+from models.color_conversions import lab_to_rgb_array
+from models.gamut import repair_labs
+from models.accessibility import (contrast_ratio_array, color_blindness_contrasts,
+                                  relative_luminance_array, simulate_color_blindness_batch)
+from models.color_patch import delta_e_cie2000_array
+from models.population import Population
+from models.fitness_cache import FitnessCache, TermCache
+from models.profiling import PhaseTimer, timed
+from models import metrics
+from models.selection import check_kwargs, get_operator, truncation
 import logging
 
 cssutils_logger = logging.getLogger('cssutils')
@@ -10,6 +19,8 @@ class SimpleLogbook:
     """Clase simple para emular el comportamiento de DEAP Logbook"""
     def __init__(self):
         self.data = {}
+        # Criterio que detuvo la ejecución: 'generations', 'time_budget', 'target_fitness' o 'stagnation'
+        self.stop_reason = None
         
     def record(self, gen, **kwargs):
         """Registra datos para una generación"""
@@ -25,21 +36,163 @@ class SimpleLogbook:
         """Selecciona columna de datos"""
         return self.data.get(key, [])
 
+def default_min_good_contrasts(n_pairs):
+    """Pares que deben cumplir el contraste mínimo si no hay máscara: dos tercios (2 de 3 con tres colores)"""
+    return -(-2 * n_pairs // 3)
+
+def score_objectives(color_terms, pair_terms, min_contrast, contrast_mask=None, min_good_contrasts=None):
+    """
+    Componentes de la aptitud por separado, (N, 2): [accesibilidad, estética]
+
+    La estética no incluye el factor (1 + initial_weight) que aplica score_terms.
+    Pueden contener valores no finitos si la conversión de color no es válida.
+
+    Args:
+        min_contrast: Escalar o array (N,) con el contraste mínimo de cada paleta
+        contrast_mask: Máscara (pares,) o (N, pares) de los pares sujetos al contraste
+                       mínimo; las puntuaciones de contraste y daltonismo solo los
+                       consideran a ellos (None = todos)
+        min_good_contrasts: Pares de la máscara que deben cumplir el contraste para
+                            evitar la penalización (None = dos tercios de los pares)
+    """
+    n_pairs = pair_terms.shape[1]
+    min_contrast = np.reshape(min_contrast, (-1, 1))
+    if contrast_mask is None:
+        weights = np.ones((1, n_pairs))
+    else:
+        weights = np.asarray(contrast_mask, dtype=np.float64).reshape(-1, n_pairs)
+    n_required = weights.sum(axis=1)
+    if min_good_contrasts is None:
+        min_good_contrasts = default_min_good_contrasts(n_pairs)
+
+    # 1. Evaluar contraste entre colores
+    contrasts = pair_terms[:, :, 0]
+    avg_contrast_score = (np.minimum(contrasts / min_contrast, 1.0) * weights).sum(axis=1) / n_required
+
+    # Fuerte penalización si no hay suficientes buenos contrastes
+    good_contrasts = ((contrasts >= min_contrast) * weights).sum(axis=1)
+    contrast_penalty = np.where(good_contrasts < min_good_contrasts, 0.5, 1.0)
+
+    # 2. Evaluar fidelidad a los colores iniciales
+    delta_e = color_terms[:, :, 4]
+    avg_fidelity_score = np.maximum(0, 1.0 - delta_e / 30.0).mean(axis=1)
+
+    # 3. Evaluar legibilidad con daltonismo
+    cb_contrasts = pair_terms[:, :, 1:4]
+    cb_scores = np.minimum(cb_contrasts / min_contrast[..., np.newaxis], 1.0) * weights[..., np.newaxis]
+    avg_cb_score = cb_scores.sum(axis=(1, 2)) / (n_required * cb_contrasts.shape[2])
+
+    # 4. Evaluar armonía de colores (distancia perceptual balanceada)
+    pair_delta_e = pair_terms[:, :, 4]
+    # Penalizar colores muy cercanos (< 15) o extremadamente distantes (> 100)
+    harmony_factors = np.where(
+        pair_delta_e < 15,
+        pair_delta_e / 15,
+        np.where(pair_delta_e > 100, np.maximum(0, 1 - (pair_delta_e - 100) / 50), 1.0)
+    )
+    harmony_score = harmony_factors.prod(axis=1)
+
+    accessibility_score = (avg_contrast_score * 0.6 + avg_cb_score * 0.4) * contrast_penalty
+    aesthetic_score = avg_fidelity_score * 0.7 + harmony_score * 0.3
+    return np.column_stack([accessibility_score, aesthetic_score])
+
+def score_terms(color_terms, pair_terms, min_contrast, accessibility_weight, initial_weight,
+                contrast_mask=None, min_good_contrasts=None):
+    """
+    Combina términos (N, colores, 5) y (N, pares, 5) en la aptitud final (N,)
+
+    min_contrast, accessibility_weight, initial_weight y min_good_contrasts pueden
+    ser escalares o arrays (N,) con un valor por paleta, de modo que paletas de
+    configuraciones distintas se puntúan en la misma pasada. contrast_mask y
+    min_good_contrasts son los de score_objectives.
+    """
+    objectives = score_objectives(color_terms, pair_terms, min_contrast, contrast_mask, min_good_contrasts)
+    return combine_objectives(objectives, accessibility_weight, initial_weight)
+
+def combine_objectives(objectives, accessibility_weight, initial_weight):
+    """
+    Aptitud final (N,) a partir de los objetivos (N, 2) de score_objectives
+
+    accessibility_weight e initial_weight pueden ser escalares o arrays (N,). Las
+    paletas con valores no finitos reciben aptitud 0.
+    """
+    accessibility_weight = np.asarray(accessibility_weight)
+    initial_weight = np.asarray(initial_weight)
+
+    # Puntuación final
+    accessibility_score = objectives[:, 0]
+    aesthetic_score = objectives[:, 1] * (1 + initial_weight)
+
+    final_score = (accessibility_score * accessibility_weight +
+           aesthetic_score * (1 - accessibility_weight))
+
+    # Si la conversión produce valores no válidos, penalizar
+    return np.where(np.isfinite(final_score), final_score, 0.0)
+
 class ColorPaletteGA:
+    # Rangos de L* por defecto de los roles primario, fondo (luminosidad alta) y acento;
+    # los roles adicionales usan DEFAULT_EXTRA_L_RANGE
+    DEFAULT_L_RANGES = ((20, 80), (50, 100), (20, 80))
+    DEFAULT_EXTRA_L_RANGE = (0, 100)
+    
+    # Fases cuyo tiempo se registra en el logbook por generación (time_<fase>)
+    PHASES = ('init', 'evaluation', 'selection', 'crossover', 'mutation', 'repair', 'pruning')
+    
+    # Lote mínimo que se envía al pool en modo paralelo: por debajo (hall of fame,
+    # fitness() de un individuo) el IPC cuesta más que evaluar en proceso
+    PARALLEL_MIN_BATCH = 64
+
     def __init__(self, initial_colors, wcag_level="AA", population_size=50, generations=30, 
-                 mutation_prob=0.15, accessibility_weight=0.7, initial_weight=0.3):
+                 mutation_prob=0.15, accessibility_weight=0.7, initial_weight=0.3, seed=None,
+                 parallel=False, parallel_threshold=1000, max_workers=None,
+                 cache_size=0, cache_decimals=None, incremental=False, term_cache_size=50000,
+                 L_ranges=None, pair_mask=None, repair_gamut=True, selection='tournament',
+                 selection_kwargs=None):
         """
         Inicialización del algoritmo genético para paletas de colores
         
         Args:
-            initial_colors: Lista de tres colores iniciales [primario, fondo, acento] en formato hex
+            initial_colors: Lista de colores iniciales en formato hex, uno por rol
+                            (por defecto [primario, fondo, acento]); al menos dos
             wcag_level: Nivel de accesibilidad 'AA' o 'AAA'
             population_size: Tamaño de la población
             generations: Número de generaciones
             mutation_prob: Probabilidad de mutación
             accessibility_weight: Peso relativo accesibilidad vs estética (0-1)
             initial_weight: Peso para preservar similitud con colores iniciales (0-1)
+            seed: Semilla del generador aleatorio propio de la instancia (None = no determinista)
+            parallel: Evaluar la aptitud en un pool de procesos persistente
+            parallel_threshold: Tamaño de población a partir del cual se usa el pool. Se compara
+                                con population_size y no con cada lote: tras la generación 0
+                                solo se evalúan los descendientes nuevos (~40% de la población)
+            max_workers: Número de procesos del pool (por defecto, número de CPUs)
+            cache_size: Entradas máximas de la caché LRU de aptitud (0 o None, por defecto, la
+                        desactiva). Durante run() no ahorra evaluaciones, porque la población ya
+                        no reevalúa a los individuos puntuados, y su búsqueda por fila cuesta tanto
+                        como evaluar; solo compensa con llamadas repetidas a fitness()
+            cache_decimals: Decimales a los que se redondean los genes para la clave de la caché
+            incremental: Guardar en caché los términos de aptitud por color y por par. Compensa con
+                         operadores que conservan colores completos; con el cruce blend por gen
+                         casi todos los colores cambian y es más rápido evaluar todo en bloque
+            term_cache_size: Entradas máximas de cada caché de términos
+            L_ranges: Rango (min, max) de L* de cada rol, con 0 <= min <= max <= 100
+                      (por defecto DEFAULT_L_RANGES); ValueError si alguno no lo cumple
+            pair_mask: Matriz booleana (colores, colores) con los pares que deben cumplir
+                       el contraste mínimo; el par (i, j) se exige si pair_mask[i][j] o
+                       pair_mask[j][i]. None = todos los pares, de los que basta con que
+                       cumplan dos tercios; con máscara deben cumplirlo todos. Otra
+                       forma lanza ValueError
+            repair_gamut: Proyectar sobre el gamut sRGB los colores que quedan fuera tras
+                          la inicialización, el cruce y la mutación, en lugar de evaluar
+                          paletas que no se pueden representar
+            selection: Operador de selección de padres de models.selection: 'tournament',
+                       'rank', 'sus' o 'truncation'
+            selection_kwargs: Parámetros adicionales del operador (p. ej. {'size': 3} en
+                              'tournament' o {'pressure': 1.5} en 'rank'); ValueError si
+                              el operador no los admite o están fuera de rango
         """
+        if len(initial_colors) < 2:
+            raise ValueError("Se necesitan al menos dos colores iniciales")
         self.initial_colors = initial_colors
         self.initial_rgbs = [hex_to_rgb(color) for color in initial_colors]
         self.initial_labs = [rgb_to_lab(rgb) for rgb in self.initial_rgbs]
@@ -54,430 +207,591 @@ class ColorPaletteGA:
         self.bit_mutation_prob = 0.2  # Probabilidad de mutación por componente
         self.accessibility_weight = accessibility_weight
         self.initial_weight = initial_weight
+        self.selection = selection
+        self._select_parents = get_operator(selection)
+        self.selection_kwargs = dict(selection_kwargs or {})
+        check_kwargs(self._select_parents, self.selection_kwargs)
+        
+        # Generador aleatorio propio: ejecuciones concurrentes no comparten estado
+        # y semillas iguales producen ejecuciones idénticas
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        
+        # Evaluación en paralelo (solo para lotes grandes, para no pagar IPC en peticiones pequeñas)
+        self.parallel = parallel
+        self.parallel_threshold = parallel_threshold
+        self.max_workers = max_workers
+        
+        # Caché de aptitud y contador de evaluaciones reales de la función de aptitud
+        self.fitness_cache = FitnessCache(cache_size, cache_decimals) if cache_size else None
+        self.evaluations = 0
+        
+        # Cachés de términos parciales por color y por par (evaluación incremental)
+        self.incremental = incremental
+        self._color_cache = TermCache(key_width=4, value_width=5, maxsize=term_cache_size)
+        self._pair_cache = TermCache(key_width=6, value_width=5, maxsize=term_cache_size)
         
         # Definimos límites para los valores LAB
-        self.L_ranges = [
-            (20, 80),  # Rango para primario
-            (50, 100), # Luminosidad alta para fondos
-            (20, 80)   # Para acentos, más rango de luminosidad
-        ]
+        self.n_colors = len(self.initial_labs)
+        if L_ranges is None:
+            L_ranges = list(self.DEFAULT_L_RANGES[:self.n_colors])
+            L_ranges += [self.DEFAULT_EXTRA_L_RANGE] * (self.n_colors - len(L_ranges))
+        if len(L_ranges) != self.n_colors:
+            raise ValueError("L_ranges debe tener un rango por color inicial")
+        self.L_ranges = [self._validate_L_range(L_range) for L_range in L_ranges]
         self.a_b_range = (-128, 128)  # Rango completo para a y b
         
+        # Todos los pares de roles (i < j) y los que están sujetos al contraste mínimo
+        self.pairs = np.column_stack(np.triu_indices(self.n_colors, 1))
+        self.pair_mask = None if pair_mask is None else np.asarray(pair_mask, dtype=bool)
+        if self.pair_mask is not None and self.pair_mask.shape != (self.n_colors, self.n_colors):
+            raise ValueError(f"pair_mask debe ser una matriz ({self.n_colors}, {self.n_colors}); "
+                             f"tiene forma {self.pair_mask.shape}")
+        if self.pair_mask is None:
+            self.contrast_mask = np.ones(len(self.pairs), dtype=bool)
+            self.min_good_contrasts = default_min_good_contrasts(len(self.pairs))
+        else:
+            mask = self.pair_mask | self.pair_mask.T
+            self.contrast_mask = mask[self.pairs[:, 0], self.pairs[:, 1]]
+            if not self.contrast_mask.any():
+                raise ValueError("pair_mask debe incluir al menos un par")
+            self.min_good_contrasts = int(self.contrast_mask.sum())
+        
+        # Límites y desviación de mutación por gen [L, a, b] * número de colores
+        self.n_genes = 3 * self.n_colors
+        self.lower_bounds = np.array([bound for L_range in self.L_ranges
+                                      for bound in (L_range[0], self.a_b_range[0], self.a_b_range[0])], dtype=np.float64)
+        self.upper_bounds = np.array([bound for L_range in self.L_ranges
+                                      for bound in (L_range[1], self.a_b_range[1], self.a_b_range[1])], dtype=np.float64)
+        self.mutation_std = np.array([std for L_range in self.L_ranges
+                                      for std in ((L_range[1] - L_range[0]) / 10, 10, 10)], dtype=np.float64)
+        
+        # Reparación de gamut: individuos generados y reparados desde la última generación registrada
+        self.repair_gamut = repair_gamut
+        self._generated = 0
+        self._repaired = 0
+        
+        # Tiempo por fase; timer.totals acumula toda la vida de la instancia
+        self.timer = PhaseTimer()
+        
         # Resultados
         self.hall_of_fame = []
         self.logbook = SimpleLogbook()
         
+    @staticmethod
+    def _validate_L_range(L_range):
+        """Comprueba que un rango de L* sea un par (min, max) con 0 <= min <= max <= 100"""
+        try:
+            low, high = (float(value) for value in L_range)
+        except (TypeError, ValueError):
+            raise ValueError(f"Cada rango de L_ranges debe ser un par (min, max): {L_range!r}") from None
+        if not 0 <= low <= high <= 100:
+            raise ValueError(f"Rango de L* fuera de [0, 100] o invertido: {L_range!r}")
+        return low, high
+
+    @timed('init')
     def initialize_population(self):
         """Inicializa la población de paletas basadas en los colores iniciales"""
-        population = []
-        
-        # Incluir la paleta original como parte de la población inicial
-        initial_palette = []
-        for lab in self.initial_labs:
-            initial_palette.extend([lab[0], lab[1], lab[2]])
-        population.append(initial_palette)
-        
-        # Generar el resto de la población con variaciones de los colores iniciales
-        for _ in range(self.population_size - 1):
-            palette = []
-            for i, initial_lab in enumerate(self.initial_labs):
-                # Variación aleatoria basada en el color inicial
-                L_range = self.L_ranges[i]
-                
-                # Variación de L con sesgo hacia el valor original
-                L = initial_lab[0] + random.gauss(0, 10)
-                L = max(L_range[0], min(L_range[1], L))
-                
-                # Variación de a y b
-                a = initial_lab[1] + random.gauss(0, 15)
-                a = max(self.a_b_range[0], min(self.a_b_range[1], a))
-                
-                b = initial_lab[2] + random.gauss(0, 15)
-                b = max(self.a_b_range[0], min(self.a_b_range[1], b))
-                
-                palette.extend([L, a, b])
-            
-            population.append(palette)
+        population = Population(self.n_genes, capacity=self.population_size)
+        initial_palette = np.array(self.initial_labs, dtype=np.float64).ravel()
+        
+        # Incluir la paleta original como parte de la población inicial, proyectada
+        # sobre el gamut como el resto: un color saturado puede quedar fuera de él
+        population.append_genes(self._repair(initial_palette[np.newaxis]))
+        
+        # Generar el resto de la población con variaciones de los colores iniciales:
+        # L con desviación 10 y a, b con desviación 15
+        init_std = np.tile([10.0, 15.0, 15.0], len(self.initial_labs))
+        variations = initial_palette + self.rng.normal(0, 1, (self.population_size - 1, self.n_genes)) * init_std
+        population.append_genes(self._repair(np.clip(variations, self.lower_bounds, self.upper_bounds)))
             
         return population
     
     def fitness(self, individual):
         """Evalúa la aptitud de una paleta completa"""
-        # Extraer componentes LAB de los tres colores
-        primary_lab = tuple(individual[0:3])
-        bg_lab = tuple(individual[3:6])
-        accent_lab = tuple(individual[6:9])
-        
-        # Convertir a RGB para cálculos de contraste
-        try:
-            primary_rgb = lab_to_rgb(primary_lab)
-            bg_rgb = lab_to_rgb(bg_lab)
-            accent_rgb = lab_to_rgb(accent_lab)
-        except:
-            # Si la conversión falla (fuera de gamut), penalizar
-            return 0.0
-        
-        # 1. Evaluar contraste entre colores
-        contrasts = [
-            contrast_ratio(primary_rgb, bg_rgb),
-            contrast_ratio(primary_rgb, accent_rgb),
-            contrast_ratio(bg_rgb, accent_rgb)
-        ]
-        
-        # Necesitamos que al menos dos contrastes cumplan con el mínimo
-        contrast_scores = [min(c / self.min_contrast, 1.0) for c in contrasts]
-        avg_contrast_score = sum(contrast_scores) / len(contrast_scores)
-        
-        # Contar cuántos pares tienen buen contraste
-        good_contrasts = sum(1 for c in contrasts if c >= self.min_contrast)
-        
-        # Fuerte penalización si no hay al menos dos buenos contrastes
-        if good_contrasts < 2:
-            contrast_penalty = 0.5
+        return float(self.evaluate_population([individual])[0])
+
+    def _evaluation_config(self):
+        """Argumentos de construcción que determinan la función de aptitud"""
+        return {
+            'initial_colors': list(self.initial_colors),
+            'wcag_level': self.wcag_level,
+            'accessibility_weight': self.accessibility_weight,
+            'initial_weight': self.initial_weight,
+            'pair_mask': None if self.pair_mask is None else tuple(map(tuple, self.pair_mask.tolist())),
+        }
+
+    @timed('evaluation')
+    def evaluate_population(self, population):
+        """
+        Evalúa la aptitud de toda la población en un solo paso vectorizado
+
+        Los individuos ya evaluados se resuelven con la caché de aptitud. Si el modo
+        paralelo está activo, la población tiene al menos parallel_threshold
+        individuos y el lote pendiente al menos PARALLEL_MIN_BATCH, la evaluación se
+        reparte entre el pool de procesos compartido.
+
+        Args:
+            population: Array (N, n_genes) o lista de individuos con los valores LAB de cada color
+
+        Returns:
+            Array (N,) con la aptitud de cada individuo
+        """
+        genes = np.asarray(population, dtype=np.float64).reshape(-1, self.n_genes)
+        if self.fitness_cache is not None:
+            return self.fitness_cache.lookup(genes, self._evaluate_uncached)
+        return self._evaluate_uncached(genes)
+
+    def _evaluate_uncached(self, genes):
+        """Evalúa sin caché, en el pool de procesos o en el proceso actual"""
+        self.evaluations += len(genes)
+        if (self.parallel and self.population_size >= self.parallel_threshold
+                and len(genes) >= self.PARALLEL_MIN_BATCH):
+            from models.parallel import get_parallel_evaluator
+            return get_parallel_evaluator(self.max_workers).evaluate(genes, self._evaluation_config())
+        return self._evaluate_batch(genes)
+
+    def _evaluate_batch(self, population):
+        """
+        Evaluación vectorizada en el proceso actual
+
+        La aptitud se descompone en términos por color (luminancia, luminancias con
+        daltonismo y fidelidad al color inicial) y por par (contraste, contrastes con
+        daltonismo y ΔE de armonía). Con evaluación incremental cada término se
+        guarda en caché según los genes implicados, de modo que un descendiente que
+        hereda dos colores intactos solo calcula el color nuevo y sus dos pares.
+        """
+        genes = np.asarray(population, dtype=np.float64).reshape(-1, self.n_colors, 3)
+        if len(genes) == 0:
+            return np.zeros(0)
+
+        n, n_colors = genes.shape[0], genes.shape[1]
+        first, second = self.pairs.T
+
+        if self.incremental:
+            # Claves por color [rol, L, a, b] y por par [L1, a1, b1, L2, a2, b2]
+            roles = np.broadcast_to(np.arange(n_colors, dtype=np.float64)[:, np.newaxis], (n, n_colors, 1))
+            color_keys = np.concatenate([roles, genes], axis=2).reshape(-1, 4)
+            pair_keys = np.concatenate([genes[:, first], genes[:, second]], axis=2).reshape(-1, 6)
+            color_terms = self._color_cache.lookup(color_keys, self._color_terms)
+            pair_terms = self._pair_cache.lookup(pair_keys, self._pair_terms)
         else:
-            contrast_penalty = 1.0
-        
-        # 2. Evaluar fidelidad a los colores iniciales
-        fidelity_scores = []
-        for i, color_lab in enumerate([primary_lab, bg_lab, accent_lab]):
-            initial_lab = self.initial_labs[i]
-            delta_e = get_delta_e(color_lab, initial_lab)
-            fidelity_score = max(0, 1.0 - (delta_e / 30.0))
-            fidelity_scores.append(fidelity_score)
-        
-        avg_fidelity_score = sum(fidelity_scores) / len(fidelity_scores)
-        
-        # 3. Evaluar legibilidad con daltonismo
-        cb_scores = []
-        for i in range(len(contrasts)):
-            rgb1, rgb2 = [(primary_rgb, bg_rgb), (primary_rgb, accent_rgb), (bg_rgb, accent_rgb)][i]
-            cb_results = evaluate_color_blindness(rgb1, rgb2)
-            
-            for cb_type, cb_contrast in cb_results.items():
-                cb_scores.append(min(cb_contrast / self.min_contrast, 1.0))
-        
-        avg_cb_score = sum(cb_scores) / len(cb_scores)
-        
-        # 4. Evaluar armonía de colores (distancia perceptual balanceada)
-        harmony_score = 1.0
-        
-        # Queremos que los colores tengan buena separación pero no excesiva
-        for i in range(len(contrasts)):
-            color1_lab, color2_lab = [(primary_lab, bg_lab), (primary_lab, accent_lab), (bg_lab, accent_lab)][i]
-            delta_e = get_delta_e(color1_lab, color2_lab)
-            
-            # Penalizar colores muy cercanos o extremadamente distantes
-            # Ideal: entre 25 y 80
-            if delta_e < 15:
-                harmony_factor = delta_e / 15
-            elif delta_e > 100:
-                harmony_factor = max(0, 1 - (delta_e - 100) / 50)
-            else:
-                harmony_factor = 1.0
-            
-            harmony_score *= harmony_factor
-        
-        # Puntuación final
-        accessibility_score = (avg_contrast_score * 0.6 + avg_cb_score * 0.4) * contrast_penalty
-        aesthetic_score = (avg_fidelity_score * 0.7 + harmony_score * 0.3)
-        
-        aesthetic_score = (avg_fidelity_score * 0.7 + harmony_score * 0.3) * (1 + self.initial_weight)
-        
-        final_score = (accessibility_score * self.accessibility_weight + 
-               aesthetic_score * (1 - self.accessibility_weight))
-        
-        return final_score
-    
+            color_terms, pair_terms = self.palette_terms(genes, np.array(self.initial_labs), self.pairs)
+
+        return self._score_terms(color_terms.reshape(n, n_colors, -1), pair_terms.reshape(n, len(first), -1))
+
+    @classmethod
+    def palette_terms(cls, genes, reference_labs, pairs):
+        """
+        Términos por color (N, colores, 5) y por par (N, pares, 5) sin caché
+
+        Las luminancias (normal y con daltonismo) se calculan una vez por color y
+        los contrastes de todos los pares se obtienen indexándolas, de modo que
+        solo el ΔE de armonía crece con el número de pares.
+
+        Args:
+            genes: Array (N, colores, 3) con los colores L*a*b* de cada paleta
+            reference_labs: Colores iniciales (colores, 3), o (N, colores, 3) si cada
+                            paleta tiene los suyos
+            pairs: Pares de índices de color evaluados
+        """
+        n, n_colors = genes.shape[0], genes.shape[1]
+        first, second = np.asarray(pairs).T
+        luminances = cls._luminances(genes.reshape(-1, 3)).reshape(n, n_colors, -1)
+        fidelity_delta_e = delta_e_cie2000_array(genes, reference_labs)
+        color_terms = np.concatenate([luminances, fidelity_delta_e[..., np.newaxis]], axis=2)
+        pair_terms = cls._combine_pair(luminances[:, first], luminances[:, second],
+                                       genes[:, first], genes[:, second])
+        return color_terms, pair_terms
+
+    @staticmethod
+    def _luminances(labs):
+        """Luminancia relativa normal y con los tres tipos de daltonismo, (M, 4)"""
+        rgbs = lab_to_rgb_array(labs)
+        return np.column_stack([
+            relative_luminance_array(rgbs),
+            relative_luminance_array(simulate_color_blindness_batch(rgbs))
+        ])
+
+    def _color_terms(self, keys):
+        """Términos por color a partir de claves (M, 4) [rol, L, a, b]: luminancias (4) y ΔE al inicial"""
+        roles = keys[:, 0].astype(np.intp)
+        labs = keys[:, 1:]
+        fidelity_delta_e = delta_e_cie2000_array(labs, np.array(self.initial_labs)[roles])
+        return np.column_stack([self._luminances(labs), fidelity_delta_e])
+
+    def _pair_terms(self, keys):
+        """Términos por par a partir de claves (M, 6): contraste normal, con daltonismo (3) y ΔE"""
+        return self._combine_pair(self._luminances(keys[:, :3]), self._luminances(keys[:, 3:]),
+                                  keys[:, :3], keys[:, 3:])
+
+    @staticmethod
+    def _combine_pair(lum1, lum2, labs1, labs2):
+        """Términos de par a partir de las luminancias (..., 4) y los colores L*a*b* de ambos"""
+        contrasts = (np.maximum(lum1, lum2) + 0.05) / (np.minimum(lum1, lum2) + 0.05)
+        delta_e = delta_e_cie2000_array(labs1, labs2)
+        return np.concatenate([contrasts, delta_e[..., np.newaxis]], axis=-1)
+
+    def _score_terms(self, color_terms, pair_terms):
+        """Combina términos (N, colores, 5) y (N, pares, 5) en la aptitud final (N,)"""
+        return score_terms(color_terms, pair_terms, self.min_contrast,
+                           self.accessibility_weight, self.initial_weight,
+                           self.contrast_mask, self.min_good_contrasts)
+
+    @timed('selection')
     def select_best(self, population, num_selected=None):
         """Selecciona los mejores individuos de la población"""
         if num_selected is None:
-            num_selected = max(self.min_population, len(population) // 2)
+            num_selected = min(max(self.min_population, len(population) // 2), len(population))
             
-        # Calcular fitness para toda la población
-        fitness_values = [(individual, self.fitness(individual)) for individual in population]
-        
-        # Ordenar por fitness (mayor a menor)
-        sorted_population = sorted(fitness_values, key=lambda x: x[1], reverse=True)
-        
-        # Seleccionar los mejores
-        selected = [ind for ind, _ in sorted_population[:num_selected]]
+        # Calcular fitness solo de los individuos pendientes
+        fitness_values = population.evaluate(self.evaluate_population)
         
-        return selected
+        # Truncamiento: los mejores, de mayor a menor fitness
+        return population.take(truncation(fitness_values, num_selected))
     
+    @timed('selection')
     def select_for_mating(self, population):
-        """Selección por torneo para reproducción"""
-        tournament_size = 3
-        selected_pairs = []
-        
+        """Selección de padres con el operador configurado; devuelve índices de los padres"""
         # Determinar cuántos pares necesitamos para mantener el tamaño de población
         num_pairs = max(self.min_population, len(population) // 2)
+        fitness_values = population.evaluate(self.evaluate_population)
         
-        for _ in range(num_pairs):
-            # Seleccionar individuos para el torneo
-            tournament1 = random.sample(population, tournament_size)
-            tournament2 = random.sample(population, tournament_size)
-            
-            # Seleccionar ganadores del torneo
-            winner1 = max(tournament1, key=self.fitness)
-            winner2 = max(tournament2, key=self.fitness)
-            
-            # Añadir par para cruce
-            selected_pairs.append((winner1, winner2))
-            
-        return selected_pairs
+        # Un solo muestreo en bloque para todos los padres
+        parents = self._select_parents(fitness_values, 2 * num_pairs, self.rng, **self.selection_kwargs)
+        
+        return parents[:num_pairs], parents[num_pairs:]
     
+    @timed('crossover')
     def crossover(self, population):
-        """Realiza cruce entre pares seleccionados"""
-        # Seleccionar pares para cruce
-        pairs = self.select_for_mating(population)
-        
-        # Nueva población después del cruce
-        new_population = []
-        
-        # Realizar cruce blend
-        for parent1, parent2 in pairs:
-            # Verificar probabilidad de cruce
-            if random.random() <= 0.7:  # Probabilidad de cruce
-                alpha = 0.5  # Parámetro de mezcla para cruce blend
-                
-                child1 = []
-                child2 = []
-                
-                # Para cada componente
-                for i in range(len(parent1)):
-                    # Determinar el rango apropiado para este componente
-                    if i % 3 == 0:  # Componente L
-                        color_idx = i // 3
-                        value_range = self.L_ranges[color_idx]
-                    else:  # Componentes a y b
-                        value_range = self.a_b_range
-                    
-                    # Cruce blend: mezcla usando alpha
-                    gamma = (1.0 + 2.0 * alpha) * random.random() - alpha
-                    
-                    # Crear hijos como mezcla de padres
-                    value1 = (1.0 - gamma) * parent1[i] + gamma * parent2[i]
-                    value2 = gamma * parent1[i] + (1.0 - gamma) * parent2[i]
-                    
-                    # Asegurar que están dentro de los límites
-                    value1 = max(value_range[0], min(value_range[1], value1))
-                    value2 = max(value_range[0], min(value_range[1], value2))
-                    
-                    child1.append(value1)
-                    child2.append(value2)
-                
-                new_population.extend([child1, child2])
-            else:
-                # Si no hay cruce, los padres pasan directamente
-                new_population.extend([parent1[:], parent2[:]])
-        
-        return new_population, len(pairs)
+        """Realiza cruce blend entre pares seleccionados"""
+        parents1, parents2 = self.select_for_mating(population)
+        num_pairs = len(parents1)
+        
+        # Los hijos empiezan como copia de los padres (conservando su fitness)
+        offspring = population.take(np.concatenate([parents1, parents2]))
+        children1, children2, crossed = self._blend_pairs(population.genes[parents1], population.genes[parents2])
+        offspring.genes[:num_pairs] = children1
+        offspring.genes[num_pairs:] = children2
+        offspring.invalidate(np.concatenate([crossed, crossed]))
+        
+        return offspring, num_pairs
+    
+    @timed('crossover')
+    def _blend_pairs(self, genes1, genes2):
+        """
+        Cruce blend de cada par (genes1[i], genes2[i]) con probabilidad 0.7
+
+        Returns:
+            (hijos1, hijos2, cruzados): los pares no cruzados son copia de los padres
+        """
+        children1, children2 = genes1.copy(), genes2.copy()
+        
+        # Verificar probabilidad de cruce por par
+        crossed = self.rng.random(len(genes1)) <= 0.7
+        
+        # Cruce blend: mezcla usando alpha con un gamma distinto por componente
+        alpha = 0.5
+        gamma = (1.0 + 2.0 * alpha) * self.rng.random((int(crossed.sum()), self.n_genes)) - alpha
+        g1, g2 = genes1[crossed], genes2[crossed]
+        child1 = (1.0 - gamma) * g1 + gamma * g2
+        child2 = gamma * g1 + (1.0 - gamma) * g2
+        
+        # Asegurar que están dentro de los límites
+        children1[crossed] = self._repair(np.clip(child1, self.lower_bounds, self.upper_bounds))
+        children2[crossed] = self._repair(np.clip(child2, self.lower_bounds, self.upper_bounds))
+        return children1, children2, crossed
     
-    def _mutate_palette(self, individual, indpb):
-        """Operador de mutación para paleta completa"""
-        mutated = individual[:]
-        individual_mutated = False
-        
-        for i in range(len(individual)):
-            if random.random() < indpb:
-                # Determinar el rango apropiado para este componente
-                if i % 3 == 0:  # Componente L
-                    color_idx = i // 3
-                    value_range = self.L_ranges[color_idx]
-                    # Mutación gaussiana con desviación estándar basada en el rango
-                    std_dev = (value_range[1] - value_range[0]) / 10
-                    mutated[i] += random.gauss(0, std_dev)
-                    mutated[i] = max(value_range[0], min(value_range[1], mutated[i]))
-                else:  # Componentes a y b
-                    mutated[i] += random.gauss(0, 10)  # Mayor variación en color
-                    mutated[i] = max(self.a_b_range[0], min(self.a_b_range[1], mutated[i]))
-                
-                individual_mutated = True
-        
-        return (mutated,)
+    @timed('mutation')
+    def _mutate_palette(self, genes, indpb):
+        """Operador de mutación gaussiana para un array (N, n_genes) de paletas"""
+        genes = np.asarray(genes, dtype=np.float64)
+        
+        # Cada componente muta con probabilidad indpb; L con desviación según su rango
+        mask = self.rng.random(genes.shape) < indpb
+        noise = self.rng.normal(0, 1, genes.shape) * self.mutation_std
+        mutated = np.where(mask, genes + noise, genes)
+        
+        return self._repair(np.clip(mutated, self.lower_bounds, self.upper_bounds))
+    
+    @timed('repair')
+    def _repair(self, genes):
+        """Proyecta sobre el gamut sRGB los colores fuera de él de un array (N, n_genes) de paletas"""
+        if not self.repair_gamut or len(genes) == 0:
+            return genes
+        labs, repaired = repair_labs(genes.reshape(-1, self.n_colors, 3))
+        
+        # Un individuo cuenta como reparado si se ha modificado alguno de sus colores
+        self._generated += len(genes)
+        self._repaired += int(repaired.any(axis=1).sum())
+        return labs.reshape(genes.shape)
     
+    @timed('pruning')
     def prune_population(self, population):
-        """Reduce la población al tamaño máximo permitido"""
+        """Reduce la población al tamaño máximo permitido (en el mismo buffer)"""
         if len(population) <= self.max_population:
             return population
         
         # Eliminar duplicados si hubiera
-        population_tuples = [tuple(ind) for ind in population]
-        unique_indices = []
-        seen = set()
-        
-        for i, tup in enumerate(population_tuples):
-            if tup not in seen:
-                seen.add(tup)
-                unique_indices.append(i)
-        
-        population = [population[i] for i in unique_indices]
+        population.keep(population.unique_indices())
         
         if len(population) <= self.max_population:
             return population
         
-        # Calcular fitness para cada individuo
-        fitness_values = [(individual, self.fitness(individual)) for individual in population]
-        
-        # Ordenar por fitness (mayor a menor)
-        sorted_population = sorted(fitness_values, key=lambda x: x[1], reverse=True)
-        
-        # Asegurar que el mejor individuo siempre está presente
-        best_individual = sorted_population[0][0]
-        
-        # Seleccionar aleatoriamente del resto para mantener diversidad
-        remaining = [ind for ind, _ in sorted_population[1:]]
+        # Calcular fitness y ordenar (mayor a menor)
+        fitness_values = population.evaluate(self.evaluate_population)
+        order = np.argsort(-fitness_values, kind='stable')
         
+        # Asegurar que el mejor individuo siempre está presente y
+        # seleccionar aleatoriamente del resto para mantener diversidad
+        remaining = order[1:]
         if len(remaining) + 1 > self.max_population:
-            # Usar numpy para selección aleatoria eficiente
-            indices = np.random.choice(
+            remaining = remaining[self.rng.choice(
                 len(remaining),
                 size=self.max_population - 1,
                 replace=False
-            )
-            remaining = [remaining[i] for i in indices]
+            )]
         
         # Población final: mejor individuo + selección aleatoria del resto
-        final_population = [best_individual] + remaining
-        
-        return final_population
+        return population.keep(np.concatenate([order[:1], remaining]))
     
-    def run(self):
-        """Ejecuta el algoritmo genético"""
-        # Inicializar población
-        pop = self.initialize_population()
+    def start(self):
+        """Prepara el estado de una ejecución: población inicial, hall of fame y registro"""
+        self._generated = self._repaired = 0
+        self.timer = PhaseTimer()
+        self._run_start = (self.evaluations, self._cache_counts())
+        self.population = self.initialize_population()
+        
+        # Buffer reutilizado para población + descendencia en cada generación
+        self._combined = Population(self.n_genes, capacity=2 * self.max_population + 2 * self.min_population)
         
         # Para almacenar el mejor individuo global
         self.hall_of_fame = []
+        self._best_fitness = -np.inf
         
         # Registro para estadísticas
-        logbook = SimpleLogbook()
-        
-        # Ejecutar generaciones
-        for gen in range(self.generations):
-            # Calcular fitness de la población actual
-            fitness_values = [self.fitness(ind) for ind in pop]
-            avg_fitness = np.mean(fitness_values)
-            min_fitness = np.min(fitness_values)
-            max_fitness = np.max(fitness_values)
-            
-            # Registrar estadísticas con nombres compatibles con DEAP
-            logbook.record(gen, avg=avg_fitness, max=max_fitness, min=min_fitness)
-            
-            # Imprimir progreso
-            print(f"Gen {gen}: Avg={avg_fitness:.4f}, Max={max_fitness:.4f}, Min={min_fitness:.4f}")
-            
-            # Actualizar hall of fame con el mejor individuo
-            best_idx = np.argmax(fitness_values)
-            best_ind = pop[best_idx]
-            
-            # Añadir a hall of fame si es bueno
-            if not self.hall_of_fame or self.fitness(best_ind) > self.fitness(self.hall_of_fame[0]):
-                if len(self.hall_of_fame) >= 10:
-                    self.hall_of_fame.pop()  # Eliminar el peor
-                self.hall_of_fame.insert(0, best_ind)  # Insertar al principio
-            
-            # Selección
-            selected = self.select_best(pop)
-            
-            # Cruce
-            offspring, _ = self.crossover(selected)
-            
-            # Mutación - aplicar a cada individuo
-            mutated_offspring = []
-            for ind in offspring:
-                if random.random() <= self.mutation_prob:
-                    mutated = self._mutate_palette(ind, 0.4)[0]
-                    mutated_offspring.append(mutated)
-                else:
-                    mutated_offspring.append(ind)
-            
-            # Combinar con la población anterior para mantener elitismo
-            combined = pop + mutated_offspring
-            
-            # Podar para volver al tamaño máximo
-            pop = self.prune_population(combined)
+        self.logbook = SimpleLogbook()
+        self.generation = 0
+    
+    def step(self):
+        """Ejecuta una generación sobre el estado creado por start()"""
+        self.breed()
+        self.survive()
+    
+    def breed(self):
+        """
+        Primera mitad de una generación: estadísticas, hall of fame, selección,
+        cruce y mutación. Deja población + descendencia en self._combined; los
+        descendientes nuevos quedan pendientes de evaluar hasta survive().
+        """
+        pop = self.population
+        
+        # Calcular fitness de los individuos nuevos de la población actual
+        fitness_values = pop.evaluate(self.evaluate_population)
+        self._record_generation(pop.genes, fitness_values)
         
-        # Guardar registro final
-        self.logbook = logbook
+        # Selección
+        selected = self.select_best(pop)
+        
+        # Cruce
+        offspring, _ = self.crossover(selected)
+        
+        # Mutación - aplicar a cada individuo con probabilidad mutation_prob
+        mutate = self.rng.random(len(offspring)) <= self.mutation_prob
+        if mutate.any():
+            offspring.genes[mutate] = self._mutate_palette(offspring.genes[mutate], 0.4)
+            offspring.invalidate(mutate)
+        
+        # Combinar con la población anterior para mantener elitismo
+        self._combined.clear()
+        self._combined.extend(pop)
+        self._combined.extend(offspring)
+    
+    def _record_generation(self, genes, fitness_values, **extra):
+        """Registra las estadísticas de la generación actual y actualiza el hall of fame"""
+        gen = self.generation
+        avg_fitness = np.mean(fitness_values)
+        min_fitness = np.min(fitness_values)
+        max_fitness = np.max(fitness_values)
+        
+        # Registrar estadísticas con nombres compatibles con DEAP y contadores acumulados de evaluación
+        cache_stats = self.fitness_cache.stats() if self.fitness_cache is not None else {}
+        # Fracción de los individuos generados desde la generación anterior que se han reparado
+        repaired = self._repaired / self._generated if self._generated else 0.0
+        self._generated = self._repaired = 0
+        # Segundos por fase desde el registro anterior (la generación 0 incluye la inicialización)
+        phase_times = {f'time_{name}': seconds for name, seconds in self.timer.flush(self.PHASES).items()}
+        self.logbook.record(gen, avg=avg_fitness, max=max_fitness, min=min_fitness,
+                            evaluations=self.evaluations,
+                            cache_hits=cache_stats.get('hits', 0),
+                            cache_misses=cache_stats.get('misses', 0),
+                            cache_hit_rate=cache_stats.get('hit_rate', 0.0),
+                            repaired=repaired, **phase_times, **extra)
+        
+        # Imprimir progreso
+        print(f"Gen {gen}: Avg={avg_fitness:.4f}, Max={max_fitness:.4f}, Min={min_fitness:.4f}")
+        
+        # Añadir a hall of fame si mejora al mejor conocido
+        best_idx = np.argmax(fitness_values)
+        if fitness_values[best_idx] > self._best_fitness:
+            self._best_fitness = fitness_values[best_idx]
+            if len(self.hall_of_fame) >= 10:
+                self.hall_of_fame.pop()  # Eliminar el peor
+            self.hall_of_fame.insert(0, genes[best_idx].copy())  # Insertar al principio
+    
+    def survive(self):
+        """Segunda mitad de una generación: poda de self._combined a la nueva población"""
+        # Podar para volver al tamaño máximo
+        self.population.assign(self.prune_population(self._combined))
+        self.generation += 1
+    
+    def _stop_reason(self, deadline=None, target_fitness=None, stagnation_window=None, stagnation_epsilon=1e-4):
+        """Comprueba los criterios de parada tras una generación; None si debe continuar"""
+        max_history = self.logbook.select('max')
+        if target_fitness is not None and max_history and max_history[-1] >= target_fitness:
+            return 'target_fitness'
+        if stagnation_window and len(max_history) > stagnation_window:
+            # Mejora del máximo en las últimas stagnation_window generaciones
+            if max_history[-1] - max_history[-1 - stagnation_window] < stagnation_epsilon:
+                return 'stagnation'
+        if deadline is not None and time.monotonic() >= deadline:
+            return 'time_budget'
+        return None
+    
+    def evolve(self, time_budget=None, target_fitness=None, stagnation_window=None, stagnation_epsilon=1e-4):
+        """
+        Ejecuta el algoritmo genético generación a generación
+
+        Acepta los mismos criterios de parada que run() y produce, tras cada
+        generación, un diccionario con 'gen', 'avg', 'max' y 'min'. Si quien
+        consume el generador deja de iterar (lo cierra), la ejecución termina con
+        logbook.stop_reason = 'cancelled' y el hall of fame queda disponible.
+        """
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+        self.start()
+        
+        # Ejecutar generaciones hasta el máximo o hasta que se cumpla un criterio de parada
+        self.logbook.stop_reason = 'generations'
+        try:
+            for _ in range(self.generations):
+                self.step()
+                reason = self._stop_reason(deadline, target_fitness, stagnation_window, stagnation_epsilon)
+                if reason:
+                    self.logbook.stop_reason = reason
+                yield {key: self.logbook.select(key)[-1] for key in ('gen', 'avg', 'max', 'min')}
+                if reason:
+                    break
+        except GeneratorExit:
+            self.logbook.stop_reason = 'cancelled'
+            raise
+        finally:
+            self._observe_run()
+    
+    def _cache_counts(self):
+        """(aciertos, fallos) acumulados de la caché de aptitud"""
+        if self.fitness_cache is None:
+            return 0, 0
+        return self.fitness_cache.hits, self.fitness_cache.misses
+    
+    def _observe_run(self):
+        """Publica en las métricas del servicio el resumen de la ejecución que termina"""
+        evaluations, (hits, misses) = self._run_start
+        current_hits, current_misses = self._cache_counts()
+        metrics.GA_RUNS.inc(stop_reason=self.logbook.stop_reason)
+        metrics.GA_GENERATIONS.observe(len(self.logbook.select('gen')))
+        metrics.GA_EVALUATIONS.observe(self.evaluations - evaluations)
+        metrics.GA_FITNESS_CACHE.inc(current_hits - hits, result='hit')
+        metrics.GA_FITNESS_CACHE.inc(current_misses - misses, result='miss')
+    
+    def run(self, time_budget=None, target_fitness=None, stagnation_window=None, stagnation_epsilon=1e-4,
+            callback=None):
+        """
+        Ejecuta el algoritmo genético
+
+        Args:
+            time_budget: Tiempo máximo de reloj en segundos (None = sin límite)
+            target_fitness: Detener al alcanzar esta aptitud máxima
+            stagnation_window: Detener si el máximo mejora menos de stagnation_epsilon
+                               en las últimas stagnation_window generaciones
+            stagnation_epsilon: Mejora mínima considerada progreso
+            callback: Función opcional llamada tras cada generación con las estadísticas
+                      de evolve(); si devuelve True la ejecución se detiene ('cancelled')
+
+        El criterio que detiene la ejecución queda en logbook.stop_reason.
+        """
+        generations = self.evolve(time_budget, target_fitness, stagnation_window, stagnation_epsilon)
+        for stats in generations:
+            if callback is not None and callback(stats):
+                generations.close()
+                break
         
         return self.hall_of_fame, self.logbook
     
+    def emigrants(self, num):
+        """Devuelve una copia de los genes de los `num` mejores individuos actuales"""
+        fitness_values = self.population.evaluate(self.evaluate_population)
+        order = np.argsort(-fitness_values, kind='stable')
+        return self.population.genes[order[:num]].copy()
+    
+    def immigrate(self, genes):
+        """Sustituye a los peores individuos actuales por los genes recibidos"""
+        genes = np.asarray(genes, dtype=np.float64).reshape(-1, self.n_genes)
+        fitness_values = self.population.evaluate(self.evaluate_population)
+        worst = np.argsort(fitness_values, kind='stable')[:len(genes)]
+        self.population.genes[worst] = genes[:len(worst)]
+        self.population.invalidate(worst)
+    
     def get_best_palettes(self, num=3):
         """Devuelve las mejores paletas encontradas"""
         if not self.hall_of_fame:
             return []
         
         # Calcular fitness para todos los individuos en el hall of fame
-        hall_fitness = [(ind, self.fitness(ind)) for ind in self.hall_of_fame]
+        hall_fitness = self.evaluate_population(self.hall_of_fame)
         
         # Ordenar por fitness (mayor a menor)
-        sorted_hall = sorted(hall_fitness, key=lambda x: x[1], reverse=True)
+        order = np.argsort(-hall_fitness, kind='stable')
         
         # Limitar al número solicitado
-        top_individuals = [ind for ind, _ in sorted_hall[:num]]
-        
+        top_individuals = [self.hall_of_fame[i] for i in order[:num]]
+        return self._describe_palettes(top_individuals)
+    
+    def _describe_palettes(self, individuals, extra=None):
+        """
+        Colores hex y métricas de cada paleta para la respuesta
+
+        Args:
+            individuals: Genes de las paletas
+            extra: Lista opcional de diccionarios que se añaden a cada paleta
+        """
+        # Evaluar todas las paletas seleccionadas en bloque
+        colors_lab = np.asarray(individuals, dtype=np.float64).reshape(-1, self.n_colors, 3)
+        colors_rgb = lab_to_rgb_array(colors_lab)
+        contrast_pairs = self.pairs[self.contrast_mask]
+        first, second = contrast_pairs.T
+
+        # Promedio de contraste de los pares sujetos al contraste mínimo
+        avg_contrasts = contrast_ratio_array(colors_rgb[:, first], colors_rgb[:, second]).mean(axis=1)
+
+        # Delta-E respecto a colores originales (promedio)
+        avg_delta_es = delta_e_cie2000_array(colors_lab, np.array(self.initial_labs)).mean(axis=1)
+
+        # Porcentaje de combinaciones que cumplen con el contraste mínimo para daltónicos
+        cb_contrasts = color_blindness_contrasts(colors_rgb, contrast_pairs)
+        cb_percents = (cb_contrasts >= self.min_contrast).mean(axis=(1, 2)) * 100
+
         palettes = []
-        for ind in top_individuals:
-            # Extraer los tres colores
-            colors_lab = [
-                tuple(ind[0:3]),    # Color primario
-                tuple(ind[3:6]),    # Color de fondo
-                tuple(ind[6:9])     # Color de acento
-            ]
-            
-            try:
-                # Convertir a RGB y HEX
-                colors_rgb = [lab_to_rgb(lab) for lab in colors_lab]
-                colors_hex = [rgb_to_hex(rgb) for rgb in colors_rgb]
-                
-                # Calcular métricas
-                contrasts = [
-                    contrast_ratio(colors_rgb[0], colors_rgb[1]),  # Primario vs Fondo
-                    contrast_ratio(colors_rgb[0], colors_rgb[2]),  # Primario vs Acento
-                    contrast_ratio(colors_rgb[1], colors_rgb[2])   # Fondo vs Acento
-                ]
-                
-                # Promedio de contraste
-                avg_contrast = sum(contrasts) / len(contrasts)
-                
-                # Delta-E respecto a colores originales (promedio)
-                delta_es = [get_delta_e(colors_lab[i], self.initial_labs[i]) for i in range(3)]
-                avg_delta_e = sum(delta_es) / len(delta_es)
-                
-                # Evaluación con daltonismo (promedio)
-                cb_results = {}
-                for i in range(len(contrasts)):
-                    rgb1, rgb2 = [(colors_rgb[0], colors_rgb[1]), 
-                                  (colors_rgb[0], colors_rgb[2]), 
-                                  (colors_rgb[1], colors_rgb[2])][i]
-                    cb = evaluate_color_blindness(rgb1, rgb2)
-                    
-                    for cb_type, cb_contrast in cb.items():
-                        if cb_type not in cb_results:
-                            cb_results[cb_type] = []
-                        cb_results[cb_type].append(cb_contrast)
-                
-                # Porcentaje de combinaciones que cumplen con el contraste mínimo para daltónicos
-                cb_valid_count = 0
-                cb_total = 0
-                
-                for cb_type, cb_contrasts in cb_results.items():
-                    for contrast in cb_contrasts:
-                        cb_total += 1
-                        if contrast >= self.min_contrast:
-                            cb_valid_count += 1
-                
-                cb_percent = (cb_valid_count / cb_total * 100) if cb_total > 0 else 0
-                
-                palettes.append({
-                    "colors": colors_hex,
-                    "contrast": f"{avg_contrast:.2f}:1",
-                    "delta_e": f"{avg_delta_e:.2f}",
-                    "daltonism": f"{cb_percent:.0f}% válido"
-                })
-            except:
-                # Si hay error en la conversión, omitir esta paleta
+        for i in range(len(colors_lab)):
+            # Si hay valores no válidos en la conversión, omitir esta paleta
+            if not np.all(np.isfinite(colors_rgb[i])):
                 continue
+
+            palettes.append({
+                "colors": [rgb_to_hex(rgb) for rgb in colors_rgb[i]],
+                "contrast": f"{avg_contrasts[i]:.2f}:1",
+                "delta_e": f"{avg_delta_es[i]:.2f}",
+                "daltonism": f"{cb_percents[i]:.0f}% válido",
+                **(extra[i] if extra is not None else {})
+            })
         
         return palettes
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""
+Modelo de islas: varias instancias de ColorPaletteGA evolucionan en procesos
+separados y cada cierto número de generaciones intercambian sus mejores
+individuos siguiendo un anillo (la isla i envía a la isla i + 1).
+"""
+import contextlib
+import io
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from models.genetic_algorithm import ColorPaletteGA, SimpleLogbook
+from models.parallel import pool_context
+
+
+def _drop_caches(ga):
+    """Vacía las cachés de términos de la isla para no serializarlas en cada época"""
+    ga._color_cache.clear()
+    ga._pair_cache.clear()
+    return ga
+
+
+def _evolve_island(ga, num_generations, quiet=True):
+    """Tarea de un worker: ejecuta `num_generations` generaciones y devuelve la isla"""
+    with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+        for _ in range(num_generations):
+            ga.step()
+    return _drop_caches(ga)
+
+
+class IslandModel:
+    def __init__(self, initial_colors, islands=4, migration_interval=5, migration_size=2,
+                 generations=30, seed=None, island_params=None, max_workers=None, quiet=True, **ga_kwargs):
+        """
+        Inicialización del modelo de islas
+
+        Args:
+            initial_colors: Colores iniciales comunes a todas las islas
+            islands: Número de islas (poblaciones independientes)
+            migration_interval: Generaciones entre migraciones
+            migration_size: Individuos que emigra cada isla en cada migración
+            generations: Número total de generaciones
+            seed: Semilla base; cada isla recibe una semilla derivada distinta
+            island_params: Lista opcional de diccionarios con parámetros propios de cada isla
+                           (por ejemplo mutation_prob o accessibility_weight)
+            max_workers: Procesos del pool (por defecto, uno por isla)
+            quiet: Silenciar el progreso que imprime cada isla
+            **ga_kwargs: Parámetros comunes de ColorPaletteGA. Las islas se crean sin
+                         caché de aptitud (cache_size=0): viajan al pool en cada época y
+                         la caché se serializaría con ellas
+        """
+        self.initial_colors = initial_colors
+        self.num_islands = islands
+        self.migration_interval = max(1, migration_interval)
+        self.migration_size = migration_size
+        self.generations = generations
+        self.max_workers = max_workers or islands
+        self.quiet = quiet
+        self.ga_kwargs = {**ga_kwargs, 'cache_size': 0}
+
+        island_params = list(island_params or [])
+        island_params += [{}] * (islands - len(island_params))
+        seeds = [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(islands)]
+
+        self.islands = [
+            ColorPaletteGA(initial_colors, generations=generations,
+                           **{**self.ga_kwargs, 'seed': island_seed, **params, 'cache_size': 0})
+            for island_seed, params in zip(seeds, island_params[:islands])
+        ]
+
+        for island in self.islands:
+            island.start()
+
+        # Referencia con los parámetros comunes para ordenar el hall of fame combinado
+        self.reference = ColorPaletteGA(initial_colors, generations=generations, **self.ga_kwargs)
+
+        self.hall_of_fame = []
+        self.logbook = SimpleLogbook()
+
+    def migrate(self):
+        """Migración en anillo: los mejores de cada isla sustituyen a los peores de la siguiente"""
+        if self.migration_size <= 0 or self.num_islands < 2:
+            return
+        emigrants = [island.emigrants(self.migration_size) for island in self.islands]
+        for i, island in enumerate(self.islands):
+            island.immigrate(emigrants[i - 1])
+
+    def _merge_results(self):
+        """Une los hall of fame y los registros de todas las islas"""
+        candidates = [ind for island in self.islands for ind in island.hall_of_fame]
+        if candidates:
+            # Tras las migraciones las islas comparten élites: cada paleta una sola vez
+            candidates = list(np.unique(np.array(candidates), axis=0))
+            fitness_values = self.reference.evaluate_population(candidates)
+            order = np.argsort(-fitness_values, kind='stable')[:10]
+            self.hall_of_fame = [candidates[i] for i in order]
+        self.reference.hall_of_fame = self.hall_of_fame
+
+        # Columnas globales compatibles con DEAP más columnas por isla (avg_0, max_0, ...)
+        logbook = SimpleLogbook()
+        for gen in range(min(len(island.logbook.select('gen')) for island in self.islands)):
+            columns = {}
+            for i, island in enumerate(self.islands):
+                for key in ('avg', 'max', 'min'):
+                    columns[f"{key}_{i}"] = island.logbook.select(key)[gen]
+            logbook.record(
+                gen,
+                avg=float(np.mean([columns[f"avg_{i}"] for i in range(self.num_islands)])),
+                max=float(max(columns[f"max_{i}"] for i in range(self.num_islands))),
+                min=float(min(columns[f"min_{i}"] for i in range(self.num_islands))),
+                **columns
+            )
+        self.logbook = logbook
+
+    def run(self):
+        """Ejecuta todas las islas en paralelo con migraciones periódicas"""
+        with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=pool_context()) as executor:
+            remaining = self.generations
+            while remaining > 0:
+                epoch = min(self.migration_interval, remaining)
+                futures = [executor.submit(_evolve_island, _drop_caches(island), epoch, self.quiet)
+                           for island in self.islands]
+                self.islands = [future.result() for future in futures]
+                remaining -= epoch
+                if remaining > 0:
+                    self.migrate()
+
+        self._merge_results()
+        return self.hall_of_fame, self.logbook
+
+    def get_best_palettes(self, num=3):
+        """Devuelve las mejores paletas del hall of fame combinado"""
+        return self.reference.get_best_palettes(num)
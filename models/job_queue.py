@@ -0,0 +1,167 @@
+"""
+Cola de trabajos en proceso para ejecutar generaciones de paletas fuera del
+hilo de la petición HTTP.
+
+Un pool acotado de hilos ejecuta los trabajos; la profundidad de la cola
+(trabajos en espera) también está limitada. Cada trabajo tiene un evento de
+cancelación que la función de trabajo consulta entre generaciones.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class QueueFullError(Exception):
+    """La cola ha alcanzado su profundidad máxima"""
+
+
+class Job:
+    """Estado de un trabajo de la cola"""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    def __init__(self, job_id):
+        self.id = job_id
+        self.status = Job.QUEUED
+        self.result = None
+        self.error = None
+        self.progress = {}
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    @property
+    def finished(self):
+        return self.status in (Job.DONE, Job.FAILED, Job.CANCELLED)
+
+    def cancelled(self):
+        """True si se ha pedido la cancelación; pensado para usarse como callback entre generaciones"""
+        return self.cancel_event.is_set()
+
+    def to_dict(self):
+        data = {
+            'job_id': self.id,
+            'status': self.status,
+            'progress': self.progress,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+        if self.result is not None:
+            # Un trabajo cancelado en curso conserva el resultado parcial
+            data['result'] = self.result
+        if self.error is not None:
+            data['error'] = self.error
+        return data
+
+
+class JobQueue:
+    def __init__(self, max_workers=2, max_queue_depth=16, max_finished=200):
+        """
+        Args:
+            max_workers: Trabajos ejecutándose a la vez
+            max_queue_depth: Trabajos en espera admitidos antes de rechazar nuevos
+            max_finished: Trabajos terminados que se conservan para consultar su resultado
+        """
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='palette-job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _count(self, status):
+        return sum(1 for job in self._jobs.values() if job.status == status)
+
+    def submit(self, function):
+        """
+        Encola `function(job)` y devuelve el Job creado
+
+        La función recibe el propio Job para consultar job.cancelled() y
+        actualizar job.progress; su valor de retorno pasa a ser job.result.
+
+        Raises:
+            QueueFullError: Si ya hay max_queue_depth trabajos en espera
+        """
+        with self._lock:
+            if self._count(Job.QUEUED) >= self.max_queue_depth:
+                raise QueueFullError(f"La cola tiene {self.max_queue_depth} trabajos en espera")
+            job = Job(uuid.uuid4().hex)
+            self._jobs[job.id] = job
+            self._prune_finished()
+            job.future = self._executor.submit(self._run, job, function)
+        return job
+
+    def _run(self, job, function):
+        with self._lock:
+            if job.cancel_event.is_set():
+                job.status = Job.CANCELLED
+                job.finished_at = time.time()
+                return
+            job.status = Job.RUNNING
+            job.started_at = time.time()
+        try:
+            result = function(job)
+        except Exception as e:
+            job.error = str(e)
+            status = Job.FAILED
+        else:
+            job.result = result
+            status = Job.CANCELLED if job.cancel_event.is_set() else Job.DONE
+        with self._lock:
+            job.status = status
+            job.finished_at = time.time()
+
+    def _prune_finished(self):
+        """Olvida los trabajos terminados más antiguos por encima de max_finished"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        """Devuelve el Job o None si no existe"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """
+        Pide la cancelación de un trabajo
+
+        Un trabajo en espera no llega a ejecutarse; uno en curso se detiene
+        cuando la función consulta job.cancelled() (en la siguiente generación).
+        Devuelve el Job o None si no existe.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job.cancel_event.set()
+            if job.status == Job.QUEUED and job.future.cancel():
+                job.status = Job.CANCELLED
+                job.finished_at = time.time()
+            return job
+
+    def stats(self):
+        """Número de trabajos por estado"""
+        with self._lock:
+            return {
+                'queued': self._count(Job.QUEUED),
+                'running': self._count(Job.RUNNING),
+                'max_workers': self.max_workers,
+                'max_queue_depth': self.max_queue_depth,
+            }
+
+    def shutdown(self, wait=True):
+        """Cancela los trabajos pendientes y detiene el pool"""
+        with self._lock:
+            for job in self._jobs.values():
+                job.cancel_event.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
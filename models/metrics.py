@@ -0,0 +1,223 @@
+"""
+Métricas en formato de exposición de texto de Prometheus, sin dependencias externas.
+
+Contadores, gauges e histogramas con etiquetas, seguros entre hilos. Los valores
+viven en memoria del proceso: con varios procesos (gunicorn con workers) cada uno
+expone los suyos.
+
+Las métricas del servicio se definen al final del módulo y se alimentan desde
+app.py, ColorPaletteGA y ColorExtractor; render() genera el cuerpo de /metrics.
+"""
+import bisect
+import threading
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Límites por defecto de los histogramas de latencia (segundos)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if value == float('-inf'):
+        return '-Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in list(zip(names, values)) + list(extra)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if any(existing.name == metric.name for existing in self._metrics):
+                raise ValueError(f"Métrica duplicada: {metric.name}")
+            self._metrics.append(metric)
+
+    def render(self):
+        """Todas las métricas registradas en formato de exposición de texto"""
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} espera las etiquetas {self.labelnames}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _items(self):
+        with self._lock:
+            return sorted(self._values.items())
+
+
+class Counter(_Metric):
+    """Valor que solo crece"""
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError("Un contador no puede decrecer")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+                for key, value in self._items()]
+
+
+class Gauge(_Metric):
+    """Valor que sube y baja, o que se calcula al exponerlo con set_function()"""
+    type = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), registry=REGISTRY):
+        super().__init__(name, documentation, labelnames, registry)
+        self._function = None
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, function):
+        """
+        Calcula el valor al exponerlo
+
+        function() devuelve un número, un diccionario {tupla de etiquetas: valor}
+        si la métrica tiene etiquetas, o None para omitir la muestra.
+        """
+        self._function = function
+
+    def samples(self):
+        if self._function is None:
+            items = self._items()
+        else:
+            value = self._function()
+            if value is None:
+                return []
+            items = sorted(value.items()) if isinstance(value, dict) else [((), value)]
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+                for key, value in items]
+
+
+class Histogram(_Metric):
+    """Distribución de observaciones en cubetas acumuladas, con su suma y su número"""
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, registry=REGISTRY):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets if bound != float('inf')))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        # Cubeta con el primer límite >= value (la última es +Inf)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def samples(self):
+        lines = []
+        for key, (counts, total) in self._items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, [('le', _format_value(bound))])
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+def render():
+    """Cuerpo de /metrics con las métricas del registro por defecto"""
+    return REGISTRY.render()
+
+
+# --- Métricas del servicio ---
+
+# Peticiones HTTP (app.py); 'endpoint' es la regla de la ruta, no la URL concreta
+REQUEST_DURATION = Histogram('palette_http_request_duration_seconds',
+                             'Latencia de las peticiones HTTP por ruta', ('endpoint', 'method'))
+REQUESTS = Counter('palette_http_requests_total', 'Peticiones HTTP por ruta y código de estado',
+                   ('endpoint', 'method', 'status'))
+REQUESTS_IN_FLIGHT = Gauge('palette_http_requests_in_flight', 'Peticiones HTTP en curso por ruta', ('endpoint',))
+
+# Algoritmo genético (ColorPaletteGA)
+GA_RUNS = Counter('palette_ga_runs_total', 'Ejecuciones del algoritmo genético por criterio de parada',
+                  ('stop_reason',))
+GA_GENERATIONS = Histogram('palette_ga_generations', 'Generaciones ejecutadas por ejecución',
+                           buckets=(1, 5, 10, 20, 30, 50, 100, 200, 300))
+GA_EVALUATIONS = Histogram('palette_ga_fitness_evaluations', 'Evaluaciones de aptitud por ejecución',
+                           buckets=(100, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000))
+GA_FITNESS_CACHE = Counter('palette_ga_fitness_cache_lookups_total',
+                           'Consultas a la caché de aptitud por resultado', ('result',))
+
+# Extracción de colores (ColorExtractor)
+STYLESHEET_FETCH_DURATION = Histogram('palette_stylesheet_fetch_duration_seconds',
+                                      'Duración de la descarga de hojas de estilo externas')
+FETCH_ERRORS = Counter('palette_extraction_fetch_errors_total',
+                       'Errores al descargar páginas u hojas de estilo', ('resource', 'reason'))
+
+# Caché de resultados de /generate (app.py)
+RESULT_CACHE = Counter('palette_result_cache_lookups_total',
+                       'Consultas a la caché de resultados por resultado y nivel', ('result', 'tier'))
+
+
+def _cache_hit_ratios():
+    """Fracción de aciertos de cada caché a partir de sus contadores (primera etiqueta 'result')"""
+    ratios = {}
+    for name, counter in (('result', RESULT_CACHE), ('fitness', GA_FITNESS_CACHE)):
+        hits = sum(value for key, value in counter._items() if key[0] == 'hit')
+        misses = sum(value for key, value in counter._items() if key[0] == 'miss')
+        if hits + misses:
+            ratios[(name,)] = hits / (hits + misses)
+    return ratios
+
+
+CACHE_HIT_RATIO = Gauge('palette_cache_hit_ratio', 'Fracción de aciertos acumulada de cada caché', ('cache',))
+CACHE_HIT_RATIO.set_function(_cache_hit_ratios)
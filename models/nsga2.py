@@ -0,0 +1,199 @@
+"""
+Modo multiobjetivo NSGA-II: en lugar de ponderar accesibilidad y estética con
+accessibility_weight, ambas se optimizan a la vez y una sola ejecución
+devuelve el frente de Pareto completo.
+
+Los objetivos se guardan en un array (N, 2) y tanto la ordenación no dominada
+como la distancia de crowding operan sobre arrays completos.
+"""
+import numpy as np
+
+from models.genetic_algorithm import ColorPaletteGA, combine_objectives, score_objectives
+from models.profiling import timed
+
+OBJECTIVES = ('accessibility', 'aesthetic')
+
+
+def fast_non_dominated_sort(objectives):
+    """
+    Frente de Pareto de cada individuo (todos los objetivos se maximizan)
+
+    Args:
+        objectives: Array (N, M)
+
+    Returns:
+        Array (N,) con el rango: 0 para el frente no dominado, 1 para el siguiente...
+    """
+    objectives = np.asarray(objectives, dtype=np.float64)
+    n = len(objectives)
+    # dominates[i, j]: i es al menos igual en todo y mejor en algún objetivo que j
+    at_least = (objectives[:, np.newaxis, :] >= objectives[np.newaxis, :, :]).all(axis=2)
+    better = (objectives[:, np.newaxis, :] > objectives[np.newaxis, :, :]).any(axis=2)
+    dominates = at_least & better
+    dominated_count = dominates.sum(axis=0)
+
+    ranks = np.full(n, -1, dtype=np.intp)
+    front = np.flatnonzero(dominated_count == 0)
+    rank = 0
+    while front.size:
+        ranks[front] = rank
+        # Los ya asignados quedan en negativo y no vuelven a entrar
+        dominated_count[front] = -1
+        dominated_count -= dominates[front].sum(axis=0)
+        front = np.flatnonzero(dominated_count == 0)
+        rank += 1
+    return ranks
+
+
+def crowding_distance(objectives, ranks):
+    """
+    Distancia de crowding de cada individuo dentro de su frente
+
+    Los extremos de cada frente reciben distancia infinita; el resto, la suma
+    por objetivo del hueco entre sus vecinos normalizado por la amplitud del frente.
+    """
+    objectives = np.asarray(objectives, dtype=np.float64)
+    n = len(objectives)
+    distance = np.zeros(n)
+    if n == 0:
+        return distance
+
+    for values in objectives.T:
+        # Ordenar por frente y, dentro de cada frente, por el objetivo
+        order = np.lexsort((values, ranks))
+        r, v = ranks[order], values[order]
+        first = np.r_[True, r[1:] != r[:-1]]
+        last = np.r_[r[1:] != r[:-1], True]
+
+        starts = np.flatnonzero(first)
+        span = np.maximum.reduceat(v, starts) - np.minimum.reduceat(v, starts)
+        span = np.repeat(span, np.diff(np.r_[starts, n]))
+
+        gap = np.zeros(n)
+        interior = ~(first | last)
+        if n > 2:
+            gap[1:-1] = v[2:] - v[:-2]
+        d = np.where(interior & (span > 0), gap / np.where(span > 0, span, 1.0), 0.0)
+        d[first | last] = np.inf
+        distance[order] += d
+    return distance
+
+
+class NSGA2PaletteGA(ColorPaletteGA):
+    """
+    Variante NSGA-II de ColorPaletteGA
+
+    Usa los mismos parámetros, operadores de variación y criterios de parada
+    (run/evolve). accessibility_weight e initial_weight ya no guían la
+    búsqueda, pero siguen definiendo la aptitud escalar que se registra en el
+    logbook (avg/max/min) y que ordena el hall of fame de get_best_palettes().
+    """
+
+    @timed('evaluation')
+    def evaluate_objectives(self, genes):
+        """
+        Objetivos (N, 2) [accesibilidad, estética] y aptitud escalar (N,) de un array de genes
+        """
+        genes = np.asarray(genes, dtype=np.float64).reshape(-1, self.n_colors, 3)
+        self.evaluations += len(genes)
+        color_terms, pair_terms = self.palette_terms(genes, np.array(self.initial_labs), self.pairs)
+        objectives = score_objectives(color_terms, pair_terms, self.min_contrast,
+                                      self.contrast_mask, self.min_good_contrasts)
+        fitness = combine_objectives(objectives, self.accessibility_weight, self.initial_weight)
+        objectives[~np.isfinite(objectives).all(axis=1)] = 0.0
+        return objectives, fitness
+
+    def start(self):
+        """Prepara la ejecución y clasifica la población inicial en frentes"""
+        super().start()
+        self.objectives, fitness = self.evaluate_objectives(self.population.genes)
+        self.population.fitness[:] = fitness
+        self.population.evaluated[:] = True
+        self._rank()
+
+    def _rank(self):
+        """Frentes y distancias de crowding de la población actual"""
+        self.ranks = fast_non_dominated_sort(self.objectives)
+        self.crowding = crowding_distance(self.objectives, self.ranks)
+
+    @timed('selection')
+    def _crowded_tournament(self, num):
+        """Torneo binario: gana el de menor frente y, a igualdad, el de mayor crowding"""
+        candidates = self.rng.integers(0, len(self.population), (num, 2))
+        a, b = candidates[:, 0], candidates[:, 1]
+        a_wins = (self.ranks[a] < self.ranks[b]) | (
+            (self.ranks[a] == self.ranks[b]) & (self.crowding[a] >= self.crowding[b]))
+        return np.where(a_wins, a, b)
+
+    def breed(self):
+        """Registra la generación y crea la descendencia a partir de torneos por frente y crowding"""
+        pop = self.population
+        front_size = int((self.ranks == 0).sum())
+        self._record_generation(pop.genes, pop.fitness, front_size=front_size,
+                                max_accessibility=float(self.objectives[:, 0].max()),
+                                max_aesthetic=float(self.objectives[:, 1].max()))
+
+        num_pairs = (len(pop) + 1) // 2
+        parents = self._crowded_tournament(2 * num_pairs)
+        children1, children2, _ = self._blend_pairs(pop.genes[parents[:num_pairs]],
+                                                    pop.genes[parents[num_pairs:]])
+        children = np.concatenate([children1, children2])
+
+        # Mutación - aplicar a cada individuo con probabilidad mutation_prob
+        mutate = self.rng.random(len(children)) <= self.mutation_prob
+        if mutate.any():
+            children[mutate] = self._mutate_palette(children[mutate], 0.4)
+
+        offspring_objectives, offspring_fitness = self.evaluate_objectives(children)
+
+        # Población + descendencia (sin duplicados) con sus objetivos
+        self._combined.clear()
+        self._combined.extend(pop)
+        self._combined.append_genes(children)
+        self._combined.fitness[len(pop):] = offspring_fitness
+        self._combined.evaluated[:] = True
+        self._combined_objectives = np.concatenate([self.objectives, offspring_objectives])
+
+    @timed('pruning')
+    def survive(self):
+        """Selección de supervivientes NSGA-II: frentes completos y, en el último, mayor crowding"""
+        combined = self._combined
+        unique = combined.unique_indices()
+        objectives = self._combined_objectives[unique]
+        ranks = fast_non_dominated_sort(objectives)
+        crowding = crowding_distance(objectives, ranks)
+
+        order = np.lexsort((-crowding, ranks))[:self.population_size]
+        survivors = unique[order]
+        self.population.assign(combined.take(survivors))
+        self.objectives = self._combined_objectives[survivors]
+        self._rank()
+        self.generation += 1
+
+    def pareto_front(self):
+        """
+        Genes y objetivos del frente no dominado actual, ordenado por accesibilidad descendente
+
+        Returns:
+            (genes (K, n_genes), objetivos (K, 2))
+        """
+        front = np.flatnonzero(self.ranks == 0)
+        front = front[np.argsort(-self.objectives[front, 0], kind='stable')]
+        return self.population.genes[front].copy(), self.objectives[front].copy()
+
+    def get_pareto_palettes(self):
+        """Paletas del frente de Pareto con sus dos objetivos, de más accesible a más fiel"""
+        genes, objectives = self.pareto_front()
+        extra = [{name: round(float(value), 4) for name, value in zip(OBJECTIVES, row)}
+                 for row in objectives]
+        palettes = self._describe_palettes(genes, extra)
+
+        # Paletas distintas en genes pueden coincidir en hex: conservar la primera
+        seen = set()
+        unique = []
+        for palette in palettes:
+            key = tuple(palette['colors'])
+            if key not in seen:
+                seen.add(key)
+                unique.append(palette)
+        return unique
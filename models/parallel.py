@@ -0,0 +1,149 @@
+"""
+Evaluación de aptitud en paralelo con un pool de procesos persistente.
+
+Los genes y la aptitud resultante viajan por memoria compartida: el proceso
+principal copia la población en un segmento `SharedMemory` y cada worker lee
+su trozo y escribe la aptitud en otro segmento, sin serializar listas. Por
+cada tarea solo se envían el nombre de los segmentos, el rango de filas y la
+configuración de aptitud del algoritmo (unos pocos valores).
+
+Los workers se crean con 'forkserver' (o 'spawn' donde no existe): con 'fork'
+un proceso con hilos, como el servidor Flask o la cola de trabajos, puede
+bloquearse al heredar un lock tomado por otro hilo.
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Evaluadores construidos en cada worker, indexados por su configuración
+_worker_evaluators = {}
+
+
+def pool_context():
+    """Contexto de multiprocessing seguro con hilos: forkserver si existe, si no spawn"""
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(method)
+
+
+def _attach_shared_memory(name):
+    """Abre un segmento existente sin que el worker se haga responsable de liberarlo"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: los workers comparten el resource tracker del proceso
+        # principal, que ya tiene registrado el segmento y lo libera con unlink()
+        return shared_memory.SharedMemory(name=name)
+
+
+def _evaluate_chunk(genes_name, fitness_name, shape, start, end, config):
+    """Tarea del worker: evalúa las filas [start, end) de la población compartida"""
+    key = tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in config.items()))
+    ga = _worker_evaluators.get(key)
+    if ga is None:
+        from models.genetic_algorithm import ColorPaletteGA
+        ga = _worker_evaluators[key] = ColorPaletteGA(**config)
+
+    genes_shm = _attach_shared_memory(genes_name)
+    fitness_shm = _attach_shared_memory(fitness_name)
+    try:
+        genes = np.ndarray(shape, dtype=np.float64, buffer=genes_shm.buf)
+        fitness = np.ndarray(shape[0], dtype=np.float64, buffer=fitness_shm.buf)
+        fitness[start:end] = ga._evaluate_batch(genes[start:end])
+        del genes, fitness
+    finally:
+        genes_shm.close()
+        fitness_shm.close()
+    return end - start
+
+
+class ParallelEvaluator:
+    """
+    Reparte la evaluación de una población entre un pool de procesos persistente
+
+    Los segmentos de memoria compartida se reservan una vez y se reutilizan
+    mientras la población quepa en ellos.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=pool_context())
+        self._genes_shm = None
+        self._fitness_shm = None
+        self._capacity = 0
+        self._lock = threading.Lock()
+
+    def _reserve(self, rows, n_genes):
+        """Asegura segmentos compartidos con espacio para `rows` individuos"""
+        if self._genes_shm is not None and rows * n_genes <= self._capacity:
+            return
+        self._release()
+        capacity = max(rows * n_genes, 2 * self._capacity)
+        self._genes_shm = shared_memory.SharedMemory(create=True, size=capacity * 8)
+        self._fitness_shm = shared_memory.SharedMemory(create=True, size=capacity * 8)
+        self._capacity = capacity
+
+    def _release(self):
+        for shm in (self._genes_shm, self._fitness_shm):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+        self._genes_shm = self._fitness_shm = None
+        self._capacity = 0
+
+    def evaluate(self, genes, config):
+        """
+        Evalúa un array (N, n_genes) en el pool y devuelve la aptitud (N,)
+
+        Args:
+            genes: Genes de la población
+            config: Argumentos de ColorPaletteGA que determinan la aptitud
+        """
+        genes = np.ascontiguousarray(genes, dtype=np.float64)
+        n_rows = len(genes)
+        with self._lock:
+            self._reserve(n_rows, genes.shape[1])
+            np.ndarray(genes.shape, dtype=np.float64, buffer=self._genes_shm.buf)[:] = genes
+
+            # Un trozo por worker, todos del mismo tamaño salvo el último
+            bounds = np.linspace(0, n_rows, min(self.max_workers, n_rows) + 1).astype(int)
+            futures = [
+                self._executor.submit(_evaluate_chunk, self._genes_shm.name, self._fitness_shm.name,
+                                      genes.shape, int(start), int(end), config)
+                for start, end in zip(bounds[:-1], bounds[1:]) if end > start
+            ]
+            for future in futures:
+                future.result()
+
+            return np.ndarray(n_rows, dtype=np.float64, buffer=self._fitness_shm.buf).copy()
+
+    def shutdown(self):
+        """Detiene el pool y libera la memoria compartida"""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            self._release()
+
+
+# Evaluadores compartidos del proceso, uno por número de workers
+_shared_evaluators = {}
+_shared_lock = threading.Lock()
+
+
+def get_parallel_evaluator(max_workers=None):
+    """
+    Devuelve el evaluador compartido del proceso con `max_workers` workers
+
+    Se crea uno la primera vez que se pide cada número de workers y se reutiliza
+    en las llamadas siguientes; None equivale a os.cpu_count().
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    with _shared_lock:
+        evaluator = _shared_evaluators.get(max_workers)
+        if evaluator is None:
+            evaluator = _shared_evaluators[max_workers] = ParallelEvaluator(max_workers)
+            atexit.register(evaluator.shutdown)
+        return evaluator
@@ -0,0 +1,153 @@
+import numpy as np
+
+
+class Population:
+    """
+    Población del algoritmo genético respaldada por arrays contiguos
+
+    Los genes se guardan en un array float64 (capacidad, n_genes) junto con una
+    columna de aptitud y una máscara de individuos ya evaluados. Solo las primeras
+    `len(poblacion)` filas son válidas; el resto es espacio reservado que se
+    reutiliza entre generaciones para evitar nuevas reservas de memoria.
+    """
+
+    def __init__(self, n_genes=9, capacity=0):
+        self.n_genes = n_genes
+        self._genes = np.empty((capacity, n_genes), dtype=np.float64)
+        self._fitness = np.zeros(capacity, dtype=np.float64)
+        self._evaluated = np.zeros(capacity, dtype=bool)
+        self._size = 0
+
+    @classmethod
+    def from_genes(cls, genes, capacity=None):
+        """Crea una población (sin evaluar) a partir de un array (N, n_genes)"""
+        genes = np.asarray(genes, dtype=np.float64)
+        genes = genes.reshape(len(genes), -1)
+        population = cls(genes.shape[1], max(capacity or 0, len(genes)))
+        population.append_genes(genes)
+        return population
+
+    # --- Vistas sobre la parte válida de los buffers ---
+
+    @property
+    def genes(self):
+        return self._genes[:self._size]
+
+    @property
+    def fitness(self):
+        return self._fitness[:self._size]
+
+    @property
+    def evaluated(self):
+        return self._evaluated[:self._size]
+
+    @property
+    def capacity(self):
+        return len(self._genes)
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        return self.genes[index]
+
+    def __iter__(self):
+        return iter(self.genes)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.genes if dtype is None else self.genes.astype(dtype)
+
+    # --- Gestión de memoria ---
+
+    def reserve(self, capacity):
+        """Asegura espacio para al menos `capacity` individuos sin perder los datos"""
+        if capacity <= self.capacity:
+            return
+        capacity = max(capacity, 2 * self.capacity)
+        genes = np.empty((capacity, self.n_genes), dtype=np.float64)
+        fitness = np.zeros(capacity, dtype=np.float64)
+        evaluated = np.zeros(capacity, dtype=bool)
+        genes[:self._size] = self.genes
+        fitness[:self._size] = self.fitness
+        evaluated[:self._size] = self.evaluated
+        self._genes, self._fitness, self._evaluated = genes, fitness, evaluated
+
+    def clear(self):
+        """Vacía la población manteniendo los buffers"""
+        self._size = 0
+
+    # --- Operaciones sobre individuos ---
+
+    def append_genes(self, genes):
+        """Añade individuos nuevos (sin evaluar) y devuelve la vista de sus genes"""
+        genes = np.asarray(genes, dtype=np.float64).reshape(-1, self.n_genes)
+        start, end = self._size, self._size + len(genes)
+        self.reserve(end)
+        self._genes[start:end] = genes
+        self._evaluated[start:end] = False
+        self._size = end
+        return self._genes[start:end]
+
+    def extend(self, other):
+        """Añade los individuos de otra población conservando su aptitud"""
+        start, end = self._size, self._size + len(other)
+        self.reserve(end)
+        self._genes[start:end] = other.genes
+        self._fitness[start:end] = other.fitness
+        self._evaluated[start:end] = other.evaluated
+        self._size = end
+
+    def assign(self, other):
+        """Copia el contenido de otra población en los buffers de esta"""
+        if other is not self:
+            self.clear()
+            self.extend(other)
+
+    def take(self, indices, out=None):
+        """Devuelve una población con los individuos indicados (en `out` si se pasa)"""
+        indices = np.asarray(indices, dtype=np.intp)
+        if out is None:
+            out = Population(self.n_genes, len(indices))
+        # Copiar antes de escribir por si `out` es esta misma población
+        genes, fitness, evaluated = self.genes[indices], self.fitness[indices], self.evaluated[indices]
+        out.clear()
+        out.reserve(len(indices))
+        out._genes[:len(indices)] = genes
+        out._fitness[:len(indices)] = fitness
+        out._evaluated[:len(indices)] = evaluated
+        out._size = len(indices)
+        return out
+
+    def keep(self, indices):
+        """Conserva solo los individuos indicados, compactándolos en el mismo buffer"""
+        return self.take(indices, out=self)
+
+    def unique_indices(self):
+        """Índices (en orden original) de la primera aparición de cada individuo"""
+        if self._size == 0:
+            return np.zeros(0, dtype=np.intp)
+        _, first = np.unique(self.genes, axis=0, return_index=True)
+        return np.sort(first)
+
+    def invalidate(self, mask=None):
+        """Marca individuos como pendientes de evaluar (todos si no hay máscara)"""
+        if mask is None:
+            self.evaluated[:] = False
+        else:
+            self.evaluated[mask] = False
+
+    def evaluate(self, fitness_function):
+        """
+        Calcula la aptitud solo de los individuos pendientes
+
+        Args:
+            fitness_function: Función que recibe un array (M, n_genes) y devuelve (M,)
+
+        Returns:
+            Vista (N,) con la aptitud de toda la población
+        """
+        pending = ~self.evaluated
+        if pending.any():
+            self.fitness[pending] = fitness_function(self.genes[pending])
+            self.evaluated[pending] = True
+        return self.fitness
@@ -0,0 +1,59 @@
+"""
+Temporizadores por fase de bajo coste para el algoritmo genético y el extractor.
+
+Cada fase acumula su tiempo exclusivo: si una fase se abre dentro de otra (por
+ejemplo, la evaluación dentro de la poda), el tiempo de la interior se descuenta
+de la exterior, de modo que la suma de las fases no cuenta nada dos veces.
+"""
+import functools
+import time
+from contextlib import contextmanager
+
+
+class PhaseTimer:
+    def __init__(self):
+        # Totales desde la creación y tiempos pendientes desde el último flush()
+        self.totals = {}
+        self._pending = {}
+        self._stack = []
+
+    @contextmanager
+    def phase(self, name):
+        """Mide el bloque como la fase `name`"""
+        self._stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            self._add(name, elapsed)
+            if self._stack:
+                self._add(self._stack[-1], -elapsed)
+
+    def _add(self, name, seconds):
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+        self._pending[name] = self._pending.get(name, 0.0) + seconds
+
+    def flush(self, phases=()):
+        """
+        Tiempos acumulados desde la llamada anterior, que vuelven a cero
+
+        Args:
+            phases: Fases que deben aparecer siempre en el resultado (con 0.0 si no se han medido)
+        """
+        pending = {name: 0.0 for name in phases}
+        pending.update(self._pending)
+        self._pending = {}
+        return pending
+
+
+def timed(phase):
+    """Decorador de métodos: mide cada llamada como `phase` con el PhaseTimer de self.timer"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.timer.phase(phase):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,142 @@
+"""
+Caché de respuestas de generación con dos niveles.
+
+El primer nivel es una LRU en memoria con caducidad (TTL). El segundo, opcional,
+es una base de datos SQLite en disco que sobrevive a los reinicios y comparten
+todos los procesos del servidor que apunten al mismo fichero.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+def normalize_hex(color):
+    """Normaliza un color hexadecimal a '#rrggbb' en minúsculas"""
+    h = color.strip().lstrip('#').lower()
+    if len(h) == 3:
+        h = ''.join(c * 2 for c in h)
+    return '#' + h
+
+
+def make_key(params):
+    """
+    Clave estable de un diccionario de parámetros
+
+    Los colores de 'initial_colors' se normalizan para que '#FFF' y '#ffffff'
+    compartan entrada; el resto se serializa en JSON con las claves ordenadas.
+    """
+    params = dict(params)
+    if 'initial_colors' in params:
+        params['initial_colors'] = [normalize_hex(c) for c in params['initial_colors']]
+    encoded = json.dumps(params, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Caché LRU en memoria con TTL y nivel SQLite opcional
+
+    Los valores deben ser serializables en JSON. get() devuelve (valor, nivel)
+    con nivel 'memory' o 'sqlite', o (None, None) si la clave no está o caducó.
+    """
+
+    def __init__(self, maxsize=256, ttl=3600, sqlite_path=None):
+        """
+        Args:
+            maxsize: Entradas máximas en memoria
+            ttl: Segundos de validez de cada entrada (None = sin caducidad)
+            sqlite_path: Fichero SQLite del segundo nivel (None = solo memoria)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.sqlite_path = sqlite_path
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if sqlite_path:
+            with self._connect() as conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS results "
+                             "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL)")
+
+    @contextmanager
+    def _connect(self):
+        """Conexión de una sola operación (sqlite3 no comparte conexiones entre hilos)"""
+        conn = sqlite3.connect(self.sqlite_path, timeout=5)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _expires(self):
+        return time.time() + self.ttl if self.ttl is not None else None
+
+    def get(self, key):
+        """Busca la clave en memoria y, si no está, en SQLite (promoviéndola a memoria)"""
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires is None or expires > now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value, 'memory'
+                del self._data[key]
+
+        if self.sqlite_path:
+            with self._connect() as conn:
+                row = conn.execute("SELECT value, expires FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None and (row[1] is None or row[1] > now):
+                    value = json.loads(row[0])
+                    with self._lock:
+                        self._store(key, value, row[1])
+                        self.hits += 1
+                    return value, 'sqlite'
+                if row is not None:
+                    conn.execute("DELETE FROM results WHERE key = ?", (key,))
+
+        with self._lock:
+            self.misses += 1
+        return None, None
+
+    def _store(self, key, value, expires):
+        self._data[key] = (expires, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def set(self, key, value):
+        """Guarda el valor en ambos niveles"""
+        expires = self._expires()
+        with self._lock:
+            self._store(key, value, expires)
+        if self.sqlite_path:
+            with self._connect() as conn:
+                conn.execute("INSERT OR REPLACE INTO results (key, value, expires) VALUES (?, ?, ?)",
+                             (key, json.dumps(value), expires))
+
+    def clear(self):
+        """Vacía ambos niveles y reinicia los contadores"""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+        if self.sqlite_path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM results")
+
+    def stats(self):
+        """Contadores de uso de la caché"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self._data),
+        }
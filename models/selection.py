@@ -0,0 +1,117 @@
+"""
+Operadores de selección sobre vectores de aptitud ya calculados.
+
+Todos reciben el array (N,) de aptitud, el número de individuos a seleccionar
+y un np.random.Generator, y devuelven un array de índices (num,). Ninguno
+evalúa la aptitud: el muestreo se hace en bloque con el generador, de modo que
+su coste es despreciable frente a la evaluación.
+"""
+import inspect
+
+import numpy as np
+
+
+def tournament(fitness, num, rng, size=3):
+    """
+    Selección por torneo: cada ganador es el mejor de `size` individuos al azar
+
+    Los participantes se eligen con reemplazo (como selTournament de DEAP).
+    """
+    if size < 1:
+        raise ValueError(f"El tamaño del torneo debe ser al menos 1: {size!r}")
+    fitness = np.asarray(fitness)
+    entrants = rng.integers(0, len(fitness), (num, size))
+    return entrants[np.arange(num), np.argmax(fitness[entrants], axis=1)]
+
+
+def rank(fitness, num, rng, pressure=1.5):
+    """
+    Selección por rango lineal: la probabilidad depende de la posición, no de la aptitud
+
+    Args:
+        pressure: Número esperado de copias del mejor individuo (1-2); el peor
+                  recibe 2 - pressure
+    """
+    if not 1 <= pressure <= 2:
+        raise ValueError(f"pressure debe estar en [1, 2]: {pressure!r}")
+    fitness = np.asarray(fitness)
+    n = len(fitness)
+    if n == 1:
+        return np.zeros(num, dtype=np.intp)
+    # Posición 0 para el peor y n - 1 para el mejor
+    ranks = np.empty(n)
+    ranks[np.argsort(fitness, kind='stable')] = np.arange(n)
+    probabilities = (2 - pressure + 2 * (pressure - 1) * ranks / (n - 1)) / n
+    return rng.choice(n, size=num, p=probabilities / probabilities.sum())
+
+
+def sus(fitness, num, rng):
+    """
+    Muestreo universal estocástico: proporcional a la aptitud con una sola
+    ruleta de `num` punteros equiespaciados (varianza mínima)
+
+    Se usa la aptitud tal cual si no es negativa, de modo que el peor individuo
+    conserva su parte de la ruleta; solo si hay valores negativos se desplazan
+    para que el mínimo sea 0. Si la suma es 0 la selección es uniforme. El
+    resultado se devuelve en orden aleatorio.
+    """
+    fitness = np.asarray(fitness, dtype=np.float64)
+    weights = fitness - min(fitness.min(), 0.0)
+    if not weights.sum() > 0:
+        weights = np.ones(len(fitness))
+    cumulative = np.cumsum(weights)
+    step = cumulative[-1] / num
+    pointers = rng.random() * step + step * np.arange(num)
+    selected = np.minimum(np.searchsorted(cumulative, pointers, side='right'), len(fitness) - 1)
+    return rng.permutation(selected)
+
+
+def truncation(fitness, num, rng=None):
+    """
+    Selección por truncamiento: los `num` mejores (repitiendo en orden si num > N)
+
+    Sin rng se devuelven de mayor a menor aptitud; con rng, en orden aleatorio.
+    """
+    fitness = np.asarray(fitness)
+    order = np.argsort(-fitness, kind='stable')
+    selected = order[np.arange(num) % len(order)]
+    return rng.permutation(selected) if rng is not None else selected
+
+
+OPERATORS = {
+    'tournament': tournament,
+    'rank': rank,
+    'sus': sus,
+    'truncation': truncation,
+}
+
+
+def get_operator(name):
+    """Operador de selección por nombre ('tournament', 'rank', 'sus' o 'truncation')"""
+    try:
+        return OPERATORS[name]
+    except KeyError:
+        raise ValueError(f"Operador de selección desconocido: {name!r} "
+                         f"(disponibles: {', '.join(OPERATORS)})") from None
+
+
+def check_kwargs(operator, kwargs):
+    """
+    Comprueba los parámetros adicionales de un operador antes de usarlo
+
+    Rechaza los nombres que el operador no admite y hace una selección de prueba
+    sobre dos individuos (con un generador propio) para que los valores fuera de
+    rango fallen al configurar y no a mitad de una ejecución.
+
+    Raises:
+        ValueError: Si algún parámetro no es válido
+    """
+    accepted = list(inspect.signature(operator).parameters)[3:]
+    unknown = sorted(set(kwargs) - set(accepted))
+    if unknown:
+        raise ValueError(f"Parámetros no admitidos por {operator.__name__}: {', '.join(unknown)} "
+                         f"(admite: {', '.join(accepted) or 'ninguno'})")
+    try:
+        operator(np.array([0.0, 1.0]), 2, np.random.default_rng(0), **kwargs)
+    except TypeError as e:
+        raise ValueError(f"Parámetros no válidos para {operator.__name__}: {e}") from None
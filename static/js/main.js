@@ -8,6 +8,7 @@ document.addEventListener("DOMContentLoaded", function () {
     .querySelector("tbody");
   const palettePreview = document.getElementById("palette-preview");
   const convergenceChart = document.getElementById("convergence-chart");
+  const convergenceCanvas = document.getElementById("convergence-canvas");
 
   // Sincronizar selectores de color con inputs de texto
   const colorInputs = [
@@ -87,15 +88,24 @@ document.addEventListener("DOMContentLoaded", function () {
         resultsContainer.style.display = "block";
         document.getElementById("generate-btn").disabled = false;
 
-        // Mostrar resultados
-        displayPalettes(data.palettes, data.initial_colors);
-
-        // Mostrar gráficos
-        convergenceChart.src = `data:image/png;base64,${data.convergence_chart}`;
+        // Mostrar resultados (en modo NSGA-II, todo el frente de Pareto)
+        const shownPalettes = data.pareto_front || data.palettes;
+        displayPalettes(shownPalettes, data.initial_colors);
+
+        // Mostrar gráficos: el PNG del servidor solo llega si se pidió server_chart
+        if (data.convergence_chart) {
+          convergenceChart.src = `data:image/png;base64,${data.convergence_chart}`;
+          convergenceChart.style.display = "block";
+          convergenceCanvas.style.display = "none";
+        } else {
+          convergenceChart.style.display = "none";
+          convergenceCanvas.style.display = "block";
+          drawConvergenceChart(convergenceCanvas, data.convergence);
+        }
 
-        // Seleccionar primera paleta por defecto
-        if (data.palettes.length > 0) {
-          displayPreview(data.palettes[0].colors, data.initial_colors);
+        // Seleccionar por defecto la primera paleta mostrada
+        if (shownPalettes.length > 0) {
+          displayPreview(shownPalettes[0].colors, data.initial_colors);
         }
       })
       .catch((error) => {
@@ -108,6 +118,100 @@ document.addEventListener("DOMContentLoaded", function () {
       });
   });
 
+  // Dibuja la curva de convergencia (aptitud promedio y mejor aptitud por generación)
+  function drawConvergenceChart(canvas, series) {
+    const ratio = window.devicePixelRatio || 1;
+    const width = canvas.clientWidth;
+    const height = 300;
+    canvas.style.height = `${height}px`;
+    canvas.width = width * ratio;
+    canvas.height = height * ratio;
+
+    const ctx = canvas.getContext("2d");
+    ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+    ctx.clearRect(0, 0, width, height);
+    if (!series || series.gen.length === 0) return;
+
+    const margin = { top: 30, right: 15, bottom: 40, left: 55 };
+    const plotWidth = width - margin.left - margin.right;
+    const plotHeight = height - margin.top - margin.bottom;
+
+    const values = series.avg.concat(series.max);
+    let minY = Math.min(...values);
+    let maxY = Math.max(...values);
+    if (maxY === minY) {
+      minY -= 0.5;
+      maxY += 0.5;
+    }
+    const minX = series.gen[0];
+    const maxX = Math.max(series.gen[series.gen.length - 1], minX + 1);
+    const x = (g) => margin.left + ((g - minX) / (maxX - minX)) * plotWidth;
+    const y = (v) => margin.top + (1 - (v - minY) / (maxY - minY)) * plotHeight;
+
+    // Rejilla y etiquetas de los ejes
+    ctx.font = "12px sans-serif";
+    ctx.strokeStyle = "#e0e0e0";
+    ctx.fillStyle = "#555";
+    ctx.lineWidth = 1;
+    const ticks = 5;
+    for (let i = 0; i <= ticks; i++) {
+      const v = minY + ((maxY - minY) * i) / ticks;
+      ctx.beginPath();
+      ctx.moveTo(margin.left, y(v));
+      ctx.lineTo(margin.left + plotWidth, y(v));
+      ctx.stroke();
+      ctx.textAlign = "right";
+      ctx.textBaseline = "middle";
+      ctx.fillText(v.toFixed(3), margin.left - 6, y(v));
+
+      const g = Math.round(minX + ((maxX - minX) * i) / ticks);
+      ctx.beginPath();
+      ctx.moveTo(x(g), margin.top);
+      ctx.lineTo(x(g), margin.top + plotHeight);
+      ctx.stroke();
+      ctx.textAlign = "center";
+      ctx.textBaseline = "top";
+      ctx.fillText(g, x(g), margin.top + plotHeight + 6);
+    }
+    ctx.fillText("Generación", margin.left + plotWidth / 2, height - 16);
+    ctx.save();
+    ctx.translate(14, margin.top + plotHeight / 2);
+    ctx.rotate(-Math.PI / 2);
+    ctx.textBaseline = "middle";
+    ctx.fillText("Aptitud", 0, 0);
+    ctx.restore();
+
+    // Curvas
+    const curves = [
+      { key: "avg", color: "#dc3545", label: "Aptitud promedio" },
+      { key: "max", color: "#0d6efd", label: "Mejor aptitud" },
+    ];
+    ctx.lineWidth = 2;
+    curves.forEach((curve) => {
+      ctx.strokeStyle = curve.color;
+      ctx.beginPath();
+      series.gen.forEach((g, i) => {
+        const px = x(g);
+        const py = y(series[curve.key][i]);
+        if (i === 0) ctx.moveTo(px, py);
+        else ctx.lineTo(px, py);
+      });
+      ctx.stroke();
+    });
+
+    // Leyenda
+    ctx.textAlign = "left";
+    ctx.textBaseline = "middle";
+    let legendX = margin.left;
+    curves.forEach((curve) => {
+      ctx.fillStyle = curve.color;
+      ctx.fillRect(legendX, 10, 18, 3);
+      ctx.fillStyle = "#333";
+      ctx.fillText(curve.label, legendX + 24, 12);
+      legendX += ctx.measureText(curve.label).width + 44;
+    });
+  }
+
   // Función para mostrar paletas en la tabla
   function displayPalettes(palettes, initialColors) {
     // Limpiar tabla existente
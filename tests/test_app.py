@@ -0,0 +1,89 @@
+"""
+Rutas de la aplicación Flask: lectura de parámetros y límites del servidor.
+"""
+import pytest
+
+from app import _parse_generation_params, app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setitem(app.config, 'RESULT_CACHE_ENABLED', False)
+    return app.test_client()
+
+
+def parse(**params):
+    with app.app_context():
+        return _parse_generation_params(params)
+
+
+def test_defaults():
+    ga_kwargs, run_kwargs = parse()
+    assert ga_kwargs['initial_colors'] == ['#3a5fcd', '#ffffff', '#f08080']
+    assert ga_kwargs['population_size'] == 50
+    assert ga_kwargs['generations'] == 20
+    assert ga_kwargs['seed'] is None
+    assert run_kwargs['time_budget'] == app.config['GA_DEFAULT_TIME_BUDGET']
+    assert run_kwargs['stagnation_window'] is None
+
+
+@pytest.mark.parametrize('name, value, expected', [
+    ('population_size', '-5', 2),
+    ('population_size', '1', 2),
+    ('population_size', '100000', app.config['GA_MAX_POPULATION']),
+    ('generations', '-3', 0),
+    ('generations', '100000', app.config['GA_MAX_GENERATIONS']),
+])
+def test_population_and_generations_are_capped(name, value, expected):
+    ga_kwargs, _ = parse(**{name: value})
+    assert ga_kwargs[name] == expected
+
+
+@pytest.mark.parametrize('name, value, expected', [
+    ('time_budget', '-1', 0.0),
+    ('time_budget', '1e300', app.config['GA_MAX_TIME_BUDGET']),
+    ('stagnation_window', '-4', 1),
+    ('stagnation_window', '0.5', 1),
+    ('stagnation_window', '1e300', app.config['GA_MAX_STAGNATION_WINDOW']),
+])
+def test_stopping_criteria_are_capped(name, value, expected):
+    _, run_kwargs = parse(**{name: value})
+    assert run_kwargs[name] == expected
+
+
+@pytest.mark.parametrize('params', [
+    {'generations': 'abc'},
+    {'population_size': '10x'},
+    {'seed': 'foo'},
+    {'seed': '-1'},
+    {'mutation_prob': 'mucho'},
+    {'time_budget': 'nan'},
+    {'time_budget': 'inf'},
+    {'time_budget': '-inf'},
+    {'stagnation_window': 'nan'},
+    {'stagnation_window': 'inf'},
+    {'stagnation_epsilon': 'nan'},
+    {'target_fitness': 'inf'},
+    {'accessibility_weight': 'nan'},
+])
+def test_invalid_numbers_return_400(client, params):
+    for response in (client.post('/generate', data=params),
+                     client.get('/generate/stream', query_string=params),
+                     client.post('/jobs', data=params)):
+        assert response.status_code == 400
+        assert response.get_json()['error'].startswith('Parámetros no válidos')
+
+
+def test_invalid_numbers_in_batch_return_400(client):
+    response = client.post('/generate/batch', json={
+        'params': {'time_budget': float('nan')},
+        'items': [{'initial_colors': ['#000000', '#FFFFFF']}],
+    })
+    assert response.status_code == 400
+
+
+def test_capped_request_runs(client):
+    response = client.post('/generate', data={'population_size': '-5', 'generations': '2',
+                                              'time_budget': '-1', 'seed': '1'})
+    assert response.status_code == 200
+    assert response.get_json()['generations_run'] <= 1
@@ -0,0 +1,104 @@
+"""
+Generación por lotes: equivalencia con instancias independientes, evaluación
+apilada, criterios de parada por elemento y ruta /generate/batch.
+"""
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from app import app
+from models.batch import BatchPaletteGA
+from models.genetic_algorithm import ColorPaletteGA
+
+ITEMS = [
+    {'initial_colors': ['#3A5FCD', '#FFFFFF', '#F08080'], 'seed': 1},
+    {'initial_colors': ['#112233', '#EEEEEE', '#FFAA00'], 'seed': 2, 'wcag_level': 'AAA'},
+    {'initial_colors': ['#000000', '#FFFFFF', '#00AA55'], 'seed': 3, 'accessibility_weight': 0.3},
+]
+
+
+def quiet(function, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args, **kwargs)
+
+
+def test_batch_matches_independent_runs():
+    batch = BatchPaletteGA(ITEMS, population_size=20, generations=6)
+    results = quiet(batch.run)
+
+    for item, (hall_of_fame, logbook) in zip(ITEMS, results):
+        ga = ColorPaletteGA(**{'population_size': 20, 'generations': 6, **item})
+        quiet(ga.run)
+        np.testing.assert_allclose(np.array(hall_of_fame), np.array(ga.hall_of_fame), rtol=0, atol=1e-12)
+        np.testing.assert_allclose(logbook.select('max'), ga.logbook.select('max'), rtol=0, atol=1e-12)
+        assert logbook.stop_reason == 'generations'
+
+
+def test_evaluate_stacked_matches_each_item():
+    batch = BatchPaletteGA(ITEMS)
+    genes = [ga.initialize_population().genes[:7] for ga in batch.gas]
+    owners = np.repeat(np.arange(len(ITEMS)), 7)
+    stacked = batch.evaluate_stacked(np.concatenate(genes), owners)
+    expected = np.concatenate([ga.evaluate_population(g) for ga, g in zip(batch.gas, genes)])
+    np.testing.assert_allclose(stacked, expected, rtol=0, atol=1e-12)
+
+
+def test_items_stop_independently():
+    items = [{**ITEMS[0], 'generations': 2}, {**ITEMS[1], 'generations': 5}, {**ITEMS[2], 'generations': 0}]
+    results = quiet(BatchPaletteGA(items, population_size=10).run)
+    assert [len(logbook.select('gen')) for _, logbook in results] == [2, 5, 0]
+
+
+def test_callback_cancels_active_items():
+    batch = BatchPaletteGA(ITEMS, population_size=10, generations=20)
+    results = quiet(batch.run, callback=lambda gen: gen == 1)
+    assert all(logbook.stop_reason == 'cancelled' for _, logbook in results)
+    assert all(len(logbook.select('gen')) == 2 for _, logbook in results)
+
+
+def test_items_need_the_same_number_of_colors():
+    with pytest.raises(ValueError):
+        BatchPaletteGA([ITEMS[0], {'initial_colors': ['#000000', '#FFFFFF']}])
+
+
+def test_batch_route():
+    client = app.test_client()
+    response = client.post('/generate/batch', json={
+        'params': {'generations': 3, 'population_size': 10},
+        'items': [{'initial_colors': item['initial_colors'], 'seed': item['seed']} for item in ITEMS],
+    })
+    assert response.status_code == 200
+    items = response.get_json()['items']
+    assert len(items) == len(ITEMS)
+    assert all(item['palettes'] and item['generations_run'] == 3 for item in items)
+
+    assert client.post('/generate/batch', json={'items': []}).status_code == 400
+    too_many = [{'initial_colors': ['#000000', '#FFFFFF']}] * (app.config['GA_MAX_BATCH_ITEMS'] + 1)
+    assert client.post('/generate/batch', json={'items': too_many}).status_code == 400
+    mixed = [{'initial_colors': ['#000000', '#FFFFFF']}, {'initial_colors': ['#000000', '#FFFFFF', '#FF0000']}]
+    assert client.post('/generate/batch', json={'items': mixed}).status_code == 400
+
+
+@pytest.mark.parametrize('body', [
+    [1, 2],
+    {'params': [1], 'items': [{'initial_colors': ['#000000', '#FFFFFF']}]},
+    {'params': 'rápido', 'items': [{'initial_colors': ['#000000', '#FFFFFF']}]},
+    {'items': [['#000000', '#FFFFFF']]},
+    {'items': [{'initial_colors': ['#000000', '#FFFFFF']}, 'otro']},
+    {'items': [{'initial_colors': [1, 2]}]},
+    {'items': [{'initial_colors': ['#000000', None]}]},
+    {'items': [{'initial_colors': ['#000000', '#FFFFFG']}]},
+    {'items': [{'initial_colors': ['#000000', '#FFFFFF'], 'population_size': [10]}]},
+    {'items': [{'initial_colors': ['#000000', '#FFFFFF'], 'pair_mask': [[1, 0, 0]]}]},
+])
+def test_malformed_batch_bodies_return_400(body):
+    response = app.test_client().post('/generate/batch', json=body)
+    assert response.status_code == 400
+    assert isinstance(response.get_json()['error'], str)
+
+
+def test_non_json_batch_body_returns_400():
+    response = app.test_client().post('/generate/batch', data='no es json', content_type='text/plain')
+    assert response.status_code == 400
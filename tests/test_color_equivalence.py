@@ -0,0 +1,105 @@
+"""
+Regresión de los kernels NumPy frente a las implementaciones de referencia:
+colormath para las conversiones, delta_e_cie2000 escalar para ΔE y la función
+de aptitud escalar original (un color cada vez) para evaluate_population.
+"""
+import numpy as np
+import pytest
+
+colormath = pytest.importorskip('colormath')
+from colormath.color_conversions import convert_color  # noqa: E402
+from colormath.color_objects import LabColor, sRGBColor  # noqa: E402
+
+from models.accessibility import (contrast_ratio, simulate_deuteranopia,  # noqa: E402
+                                  simulate_protanopia, simulate_tritanopia)
+from models.color_patch import delta_e_cie2000, delta_e_cie2000_matrix  # noqa: E402
+from models.color_utils import lab_to_rgb, rgb_to_lab  # noqa: E402
+from models.genetic_algorithm import ColorPaletteGA  # noqa: E402
+
+INITIAL_COLORS = ['#3A5FCD', '#FFFFFF', '#F08080']
+
+
+def random_labs(rng, size):
+    return np.column_stack([rng.uniform(0, 100, size), rng.uniform(-128, 128, (size, 2))])
+
+
+def reference_rgb_to_lab(rgb):
+    lab = convert_color(sRGBColor(*rgb), LabColor)
+    return lab.lab_l, lab.lab_a, lab.lab_b
+
+
+def reference_lab_to_rgb(lab):
+    rgb = convert_color(LabColor(*lab), sRGBColor)
+    return rgb.rgb_r, rgb.rgb_g, rgb.rgb_b
+
+
+def reference_delta_e(lab1, lab2):
+    return delta_e_cie2000(LabColor(*lab1), LabColor(*lab2))
+
+
+def reference_fitness(ga, individual):
+    """Aptitud escalar original de tres colores con colormath y ΔE escalar"""
+    labs = [tuple(individual[i:i + 3]) for i in (0, 3, 6)]
+    rgbs = [reference_lab_to_rgb(lab) for lab in labs]
+    pairs = [(0, 1), (0, 2), (1, 2)]
+
+    contrasts = [contrast_ratio(rgbs[i], rgbs[j]) for i, j in pairs]
+    avg_contrast_score = sum(min(c / ga.min_contrast, 1.0) for c in contrasts) / len(contrasts)
+    good_contrasts = sum(1 for c in contrasts if c >= ga.min_contrast)
+    contrast_penalty = 0.5 if good_contrasts < 2 else 1.0
+
+    fidelity = [max(0, 1.0 - reference_delta_e(lab, initial) / 30.0) for lab, initial in zip(labs, ga.initial_labs)]
+    avg_fidelity_score = sum(fidelity) / len(fidelity)
+
+    cb_scores = []
+    for i, j in pairs:
+        for simulate in (simulate_protanopia, simulate_deuteranopia, simulate_tritanopia):
+            cb_contrast = contrast_ratio(simulate(np.array(rgbs[i])), simulate(np.array(rgbs[j])))
+            cb_scores.append(min(cb_contrast / ga.min_contrast, 1.0))
+    avg_cb_score = sum(cb_scores) / len(cb_scores)
+
+    harmony_score = 1.0
+    for i, j in pairs:
+        delta_e = reference_delta_e(labs[i], labs[j])
+        if delta_e < 15:
+            harmony_score *= delta_e / 15
+        elif delta_e > 100:
+            harmony_score *= max(0, 1 - (delta_e - 100) / 50)
+
+    accessibility_score = (avg_contrast_score * 0.6 + avg_cb_score * 0.4) * contrast_penalty
+    aesthetic_score = (avg_fidelity_score * 0.7 + harmony_score * 0.3) * (1 + ga.initial_weight)
+    return accessibility_score * ga.accessibility_weight + aesthetic_score * (1 - ga.accessibility_weight)
+
+
+def test_delta_e_matrix_matches_scalar():
+    rng = np.random.default_rng(0)
+    labs1, labs2 = random_labs(rng, 40), random_labs(rng, 30)
+    matrix = delta_e_cie2000_matrix(labs1, labs2)
+    expected = np.array([[reference_delta_e(a, b) for b in labs2] for a in labs1])
+    np.testing.assert_allclose(matrix, expected, rtol=0, atol=1e-10)
+
+
+def test_rgb_to_lab_matches_colormath():
+    rng = np.random.default_rng(1)
+    for rgb in rng.random((200, 3)):
+        np.testing.assert_allclose(rgb_to_lab(rgb), reference_rgb_to_lab(rgb), rtol=0, atol=1e-10)
+
+
+def test_lab_to_rgb_matches_colormath():
+    # Incluye colores fuera del gamut: los negativos se recortan a 0 y los > 1 se conservan
+    rng = np.random.default_rng(2)
+    for lab in random_labs(rng, 200):
+        np.testing.assert_allclose(lab_to_rgb(lab), reference_lab_to_rgb(lab), rtol=0, atol=1e-10)
+
+
+@pytest.mark.parametrize('params', [{}, {'wcag_level': 'AAA', 'accessibility_weight': 0.3}])
+def test_evaluate_population_matches_scalar_fitness(params):
+    ga = ColorPaletteGA(INITIAL_COLORS, seed=0, **params)
+    rng = np.random.default_rng(3)
+    population = np.concatenate([
+        ga.initialize_population().genes,
+        random_labs(rng, 150).reshape(-1, 9),
+    ])
+    fitness = ga.evaluate_population(population)
+    expected = np.array([reference_fitness(ga, individual) for individual in population])
+    np.testing.assert_allclose(fitness, expected, rtol=0, atol=1e-10)
@@ -0,0 +1,93 @@
+"""
+Reparación de gamut: proyección de colores L*a*b* sobre sRGB y su uso en el
+algoritmo genético.
+"""
+import contextlib
+import io
+import re
+
+import numpy as np
+import pytest
+
+from models.color_conversions import _lab_to_linear_rgb_exact, in_gamut
+from models.color_utils import rgb_to_hex
+from models.gamut import CHROMA_MARGIN, GAMUT_TOLERANCE, _bisect_scale, max_chroma, repair_labs
+from models.genetic_algorithm import ColorPaletteGA
+
+HEX = re.compile(r'#[0-9a-f]{6}')
+
+
+def inside(labs):
+    return in_gamut(_lab_to_linear_rgb_exact(labs), GAMUT_TOLERANCE)
+
+
+def random_labs(seed, size):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.uniform(0, 100, size), rng.uniform(-128, 128, (size, 2))])
+
+
+def test_colors_inside_the_gamut_are_unchanged():
+    labs = np.array([[50.0, 0.0, 0.0], [70.0, 10.0, -10.0], [100.0, 0.0, 0.0], [0.0, 0.0, 0.0]])
+    repaired, changed = repair_labs(labs)
+    assert not changed.any()
+    np.testing.assert_array_equal(repaired, labs)
+
+
+def test_repair_keeps_lightness_and_hue_and_lands_on_the_boundary():
+    labs = random_labs(0, 2000)
+    repaired, changed = repair_labs(labs)
+    assert changed.any()
+    assert inside(repaired).all()
+    np.testing.assert_array_equal(repaired[:, 0], labs[:, 0])
+
+    moved = changed & (np.hypot(labs[:, 1], labs[:, 2]) > 1e-6) & (np.hypot(repaired[:, 1], repaired[:, 2]) > 1e-6)
+    hue_before = np.arctan2(labs[moved, 2], labs[moved, 1])
+    hue_after = np.arctan2(repaired[moved, 2], repaired[moved, 1])
+    np.testing.assert_allclose(hue_after, hue_before, atol=1e-9)
+
+    # Casi todos quedan a CHROMA_MARGIN del límite exacto; junto a las aristas del
+    # gamut la interpolación de la tabla subestima el límite en unas pocas unidades
+    exact = _bisect_scale(labs[changed], np.zeros(changed.sum()), np.ones(changed.sum()), 40)
+    chroma = np.hypot(labs[changed, 1], labs[changed, 2])
+    gap = chroma * exact - np.hypot(repaired[changed, 1], repaired[changed, 2])
+    assert (gap > -1e-6).all()
+    assert np.median(gap) < CHROMA_MARGIN + 0.01
+    assert np.percentile(gap, 95) < CHROMA_MARGIN + 0.05
+    assert gap.max() < 10.0
+
+
+def test_boundary_table_matches_exact_bisection():
+    L = np.array([5.0, 30.5, 50.0, 75.25, 95.0])
+    hue = np.array([0.0, 90.5, 200.0, 300.75, 359.9])
+    h = np.radians(hue)
+    labs = np.column_stack([L, 200 * np.cos(h), 200 * np.sin(h)])
+    exact = 200 * _bisect_scale(labs, np.zeros(5), np.ones(5), 40)
+    np.testing.assert_allclose(max_chroma(L, hue), exact, atol=1.0)
+
+
+def test_rgb_to_hex_clamps_out_of_range_components():
+    assert rgb_to_hex((1.008, -0.01, 0.5)) == '#ff007f'
+    assert rgb_to_hex((0.0, 0.0, 0.0)) == '#000000'
+    assert rgb_to_hex((1.0, 1.0, 1.0)) == '#ffffff'
+
+
+@pytest.mark.parametrize('repair_gamut', [True, False])
+def test_saturated_inputs_give_valid_hex(repair_gamut):
+    ga = ColorPaletteGA(['#00ff00', '#000000', '#0000ff'], population_size=30, generations=10,
+                        seed=0, repair_gamut=repair_gamut)
+    with contextlib.redirect_stdout(io.StringIO()):
+        ga.run()
+    for palette in ga.get_best_palettes(3):
+        assert all(HEX.fullmatch(color) for color in palette['colors'])
+
+    colors = ga.population.genes.reshape(-1, 3)
+    assert inside(colors).all() == repair_gamut
+
+
+def test_repaired_fraction_is_logged():
+    ga = ColorPaletteGA(['#3A5FCD', '#FFFFFF', '#F08080'], population_size=30, generations=5, seed=1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        ga.run()
+    repaired = ga.logbook.select('repaired')
+    assert len(repaired) == 5
+    assert all(0.0 <= value <= 1.0 for value in repaired) and max(repaired) > 0
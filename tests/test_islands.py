@@ -0,0 +1,60 @@
+"""
+Modelo de islas: migración en anillo, resultado combinado sin duplicados y
+reproducibilidad con semilla.
+"""
+import numpy as np
+import pytest
+
+from models.islands import IslandModel
+
+INITIAL_COLORS = ['#3A5FCD', '#FFFFFF', '#F08080']
+
+
+@pytest.fixture(scope='module')
+def model():
+    model = IslandModel(INITIAL_COLORS, islands=3, migration_interval=2, migration_size=2,
+                        generations=6, seed=4, population_size=20, cache_size=1000)
+    model.run()
+    return model
+
+
+def test_hall_of_fame_has_no_duplicates(model):
+    genes = np.array(model.hall_of_fame)
+    assert 0 < len(genes) <= 10
+    assert len(np.unique(genes, axis=0)) == len(genes)
+
+    palettes = [tuple(palette['colors']) for palette in model.get_best_palettes(3)]
+    assert len(set(palettes)) == len(palettes)
+
+
+def test_hall_of_fame_is_sorted_by_reference_fitness(model):
+    fitness = model.reference.evaluate_population(model.hall_of_fame)
+    assert np.all(np.diff(fitness) <= 0)
+
+
+def test_islands_run_without_fitness_cache(model):
+    assert all(island.fitness_cache is None for island in model.islands)
+    assert all(len(island._color_cache) == 0 for island in model.islands)
+
+
+def test_logbook_has_global_and_per_island_columns(model):
+    assert model.logbook.select('gen') == list(range(6))
+    for gen in range(6):
+        per_island = [model.logbook.select(f'max_{i}')[gen] for i in range(3)]
+        assert model.logbook.select('max')[gen] == max(per_island)
+
+
+def test_migration_follows_the_ring():
+    model = IslandModel(INITIAL_COLORS, islands=3, generations=1, seed=0, population_size=10, migration_size=1)
+    best = [island.emigrants(1)[0] for island in model.islands]
+    model.migrate()
+    for i, island in enumerate(model.islands):
+        # La isla i recibe el mejor individuo de la isla i - 1
+        assert any(np.array_equal(genes, best[i - 1]) for genes in island.population.genes)
+
+
+def test_same_seed_gives_same_result(model):
+    again = IslandModel(INITIAL_COLORS, islands=3, migration_interval=2, migration_size=2,
+                        generations=6, seed=4, population_size=20)
+    again.run()
+    np.testing.assert_array_equal(np.array(again.hall_of_fame), np.array(model.hall_of_fame))
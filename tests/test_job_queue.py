@@ -0,0 +1,139 @@
+"""
+Cola de trabajos: ejecución, fallos, cancelación, límite de profundidad y rutas /jobs.
+"""
+import threading
+import time
+
+import pytest
+
+import app as app_module
+from models.job_queue import Job, JobQueue, QueueFullError
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("tiempo de espera agotado")
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def queue():
+    queue = JobQueue(max_workers=1, max_queue_depth=1, max_finished=3)
+    yield queue
+    queue.shutdown()
+
+
+def blocking_job(release):
+    """Trabajo que no termina hasta que se activa `release`"""
+    def function(job):
+        release.wait(10)
+        return 'ok'
+    return function
+
+
+def test_job_runs_to_completion(queue):
+    job = queue.submit(lambda job: {'value': 42})
+    wait_for(lambda: job.finished)
+    assert job.status == Job.DONE
+    assert job.to_dict()['result'] == {'value': 42}
+    assert job.started_at is not None and job.finished_at >= job.started_at
+
+
+def test_exception_marks_job_failed(queue):
+    def function(job):
+        raise RuntimeError('falló')
+    job = queue.submit(function)
+    wait_for(lambda: job.finished)
+    assert job.status == Job.FAILED
+    assert job.to_dict()['error'] == 'falló'
+
+
+def test_running_job_stops_at_next_check_and_keeps_partial_result(queue):
+    started = threading.Event()
+
+    def function(job):
+        generations = 0
+        started.set()
+        while not job.cancelled():
+            generations += 1
+            job.progress = {'gen': generations}
+            time.sleep(0.001)
+        return {'generations': generations}
+
+    job = queue.submit(function)
+    started.wait(10)
+    assert queue.cancel(job.id) is job
+    wait_for(lambda: job.finished)
+    assert job.status == Job.CANCELLED
+    assert job.to_dict()['result']['generations'] >= 1
+
+
+def test_queued_job_is_cancelled_without_running(queue):
+    release = threading.Event()
+    running = queue.submit(blocking_job(release))
+    wait_for(lambda: running.status == Job.RUNNING)
+
+    calls = []
+    queued = queue.submit(lambda job: calls.append(job))
+    queue.cancel(queued.id)
+    assert queued.status == Job.CANCELLED
+    release.set()
+    wait_for(lambda: running.finished)
+    assert calls == []
+
+
+def test_full_queue_rejects_new_jobs(queue):
+    release = threading.Event()
+    running = queue.submit(blocking_job(release))
+    wait_for(lambda: running.status == Job.RUNNING)
+    queue.submit(blocking_job(release))
+    assert queue.stats()['queued'] == 1
+
+    with pytest.raises(QueueFullError):
+        queue.submit(blocking_job(release))
+    release.set()
+
+
+def test_old_finished_jobs_are_forgotten(queue):
+    jobs = []
+    for i in range(5):
+        jobs.append(queue.submit(lambda job, i=i: i))
+        wait_for(lambda: jobs[-1].finished)
+    queue.submit(lambda job: None)
+    assert queue.get(jobs[0].id) is None
+    assert queue.get(jobs[-1].id) is jobs[-1]
+    assert queue.cancel('desconocido') is None
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(app_module, '_job_queue', None)
+    yield app_module.app.test_client()
+    if app_module._job_queue is not None:
+        app_module._job_queue.shutdown()
+
+
+def test_jobs_routes(client):
+    response = client.post('/jobs', data={'generations': '3', 'population_size': '10', 'seed': '1'})
+    assert response.status_code == 202
+    body = response.get_json()
+    assert response.headers['Location'] == body['status_url']
+
+    wait_for(lambda: client.get(body['status_url']).get_json()['status'] == Job.DONE)
+    status = client.get(body['status_url']).get_json()
+    assert status['progress']['gen'] == 2
+    assert len(status['result']['palettes']) > 0
+
+    assert client.delete(body['status_url']).status_code == 202
+    assert client.get('/jobs/desconocido').status_code == 404
+    assert client.delete('/jobs/desconocido').status_code == 404
+
+
+def test_full_job_queue_returns_503(client, monkeypatch):
+    monkeypatch.setitem(app_module.app.config, 'JOBS_MAX_WORKERS', 1)
+    monkeypatch.setitem(app_module.app.config, 'JOBS_MAX_QUEUE_DEPTH', 0)
+    response = client.post('/jobs', data={'generations': '1'})
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == str(app_module.app.config['JOBS_RETRY_AFTER'])
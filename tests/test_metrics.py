@@ -0,0 +1,96 @@
+"""
+Métricas Prometheus: tipos básicos, formato de exposición y ruta /metrics.
+"""
+import contextlib
+import io
+
+import pytest
+
+from app import app
+from models import metrics
+from models.genetic_algorithm import ColorPaletteGA
+
+
+@pytest.fixture
+def registry():
+    return metrics.Registry()
+
+
+def test_counter(registry):
+    counter = metrics.Counter('jobs_total', 'Trabajos', ('status',), registry=registry)
+    counter.inc(status='done')
+    counter.inc(2, status='done')
+    counter.inc(status='failed')
+    assert counter.value(status='done') == 3
+    with pytest.raises(ValueError):
+        counter.inc(-1, status='done')
+    with pytest.raises(ValueError):
+        counter.inc(otra='x')
+
+    assert registry.render() == (
+        '# HELP jobs_total Trabajos\n'
+        '# TYPE jobs_total counter\n'
+        'jobs_total{status="done"} 3\n'
+        'jobs_total{status="failed"} 1\n'
+    )
+
+
+def test_gauge_values_and_functions(registry):
+    gauge = metrics.Gauge('in_flight', 'En curso', ('endpoint',), registry=registry)
+    gauge.inc(endpoint='/generate')
+    gauge.inc(endpoint='/generate')
+    gauge.dec(endpoint='/generate')
+    assert 'in_flight{endpoint="/generate"} 1' in registry.render()
+
+    computed = metrics.Gauge('ratio', 'Calculada', registry=registry)
+    computed.set_function(lambda: 0.25)
+    assert 'ratio 0.25' in registry.render()
+    computed.set_function(lambda: None)
+    assert registry.render().endswith('# TYPE ratio gauge\n')
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    histogram = metrics.Histogram('latency', 'Latencia', buckets=(0.1, 1.0), registry=registry)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+    lines = registry.render().splitlines()
+    assert 'latency_bucket{le="0.1"} 2' in lines
+    assert 'latency_bucket{le="1.0"} 3' in lines
+    assert 'latency_bucket{le="+Inf"} 4' in lines
+    assert 'latency_sum 3.65' in lines
+    assert 'latency_count 4' in lines
+
+
+def test_labels_are_escaped_and_names_unique(registry):
+    counter = metrics.Counter('errors_total', 'Errores', ('reason',), registry=registry)
+    counter.inc(reason='dice "no"\n')
+    assert 'errors_total{reason="dice \\"no\\"\\n"} 1' in registry.render()
+    with pytest.raises(ValueError):
+        metrics.Counter('errors_total', 'Duplicada', registry=registry)
+
+
+def test_ga_run_is_recorded():
+    runs = metrics.GA_RUNS.value(stop_reason='generations')
+    ga = ColorPaletteGA(['#3A5FCD', '#FFFFFF', '#F08080'], population_size=10, generations=3, seed=0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        ga.run()
+    assert metrics.GA_RUNS.value(stop_reason='generations') == runs + 1
+
+
+def test_metrics_route_counts_requests_by_status():
+    client = app.test_client()
+    ok = metrics.REQUESTS.value(endpoint='/', method='GET', status=200)
+    bad = metrics.REQUESTS.value(endpoint='/generate', method='POST', status=400)
+    client.get('/')
+    client.post('/generate', data={'generations': 'abc'})
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == metrics.CONTENT_TYPE
+    assert metrics.REQUESTS.value(endpoint='/', method='GET', status=200) == ok + 1
+    assert metrics.REQUESTS.value(endpoint='/generate', method='POST', status=400) == bad + 1
+
+    body = response.get_data(as_text=True)
+    assert '# TYPE palette_http_request_duration_seconds histogram' in body
+    assert 'palette_http_requests_in_flight{endpoint="/generate"} 0' in body
+    assert 'palette_http_requests_in_flight{endpoint="/metrics"} 1' in body
@@ -0,0 +1,79 @@
+"""
+NSGA-II: ordenación no dominada, distancia de crowding y coherencia de la
+aptitud escalar con ColorPaletteGA.
+"""
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from models.genetic_algorithm import ColorPaletteGA
+from models.nsga2 import NSGA2PaletteGA, crowding_distance, fast_non_dominated_sort
+
+INITIAL_COLORS = ['#3A5FCD', '#FFFFFF', '#F08080']
+
+
+def reference_ranks(objectives):
+    """Frentes por eliminación sucesiva de los no dominados (O(N^3))"""
+    remaining = list(range(len(objectives)))
+    ranks = np.full(len(objectives), -1)
+    rank = 0
+    while remaining:
+        front = [i for i in remaining
+                 if not any((objectives[j] >= objectives[i]).all() and (objectives[j] > objectives[i]).any()
+                            for j in remaining)]
+        ranks[front] = rank
+        remaining = [i for i in remaining if i not in front]
+        rank += 1
+    return ranks
+
+
+def test_sort_on_known_fronts():
+    objectives = np.array([[1, 5], [2, 4], [3, 3], [1, 4], [2, 2], [0, 0], [3, 3]])
+    np.testing.assert_array_equal(fast_non_dominated_sort(objectives), [0, 0, 0, 1, 1, 2, 0])
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_sort_matches_reference(seed):
+    # Valores discretos para que haya empates y dominancias débiles
+    objectives = np.random.default_rng(seed).integers(0, 6, (60, 2)).astype(float)
+    np.testing.assert_array_equal(fast_non_dominated_sort(objectives), reference_ranks(objectives))
+
+
+def test_crowding_distance():
+    objectives = np.array([[0.0, 4.0], [1.0, 3.0], [3.0, 1.0], [4.0, 0.0], [0.0, 0.0]])
+    ranks = np.array([0, 0, 0, 0, 1])
+    distance = crowding_distance(objectives, ranks)
+    assert np.isinf(distance[[0, 3, 4]]).all()
+    # Interior: hueco entre vecinos normalizado por la amplitud (4) en cada objetivo
+    np.testing.assert_allclose(distance[1:3], [3 / 4 + 3 / 4, 3 / 4 + 3 / 4])
+    assert crowding_distance(np.zeros((0, 2)), np.zeros(0, dtype=int)).shape == (0,)
+
+
+@pytest.mark.parametrize('params', [{}, {'accessibility_weight': 0.2, 'initial_weight': 0.8, 'wcag_level': 'AAA'}])
+def test_scalar_fitness_matches_weighted_ga(params):
+    nsga2 = NSGA2PaletteGA(INITIAL_COLORS, seed=0, **params)
+    weighted = ColorPaletteGA(INITIAL_COLORS, seed=0, **params)
+    genes = nsga2.initialize_population().genes
+    objectives, fitness = nsga2.evaluate_objectives(genes)
+    assert objectives.shape == (len(genes), 2)
+    np.testing.assert_allclose(fitness, weighted.evaluate_population(genes), rtol=0, atol=1e-12)
+
+
+def test_run_returns_a_non_dominated_front():
+    ga = NSGA2PaletteGA(INITIAL_COLORS, population_size=30, generations=8, seed=2)
+    with contextlib.redirect_stdout(io.StringIO()):
+        ga.run()
+
+    genes, objectives = ga.pareto_front()
+    assert len(genes) >= 1
+    assert np.all(np.diff(objectives[:, 0]) <= 0)
+    assert (fast_non_dominated_sort(ga.objectives) == 0).sum() == len(genes)
+    # Ningún individuo de la población domina a uno del frente
+    for row in objectives:
+        assert not ((ga.objectives >= row).all(axis=1) & (ga.objectives > row).any(axis=1)).any()
+
+    palettes = ga.get_pareto_palettes()
+    assert len({tuple(palette['colors']) for palette in palettes}) == len(palettes)
+    assert set(palettes[0]) >= {'colors', 'accessibility', 'aesthetic'}
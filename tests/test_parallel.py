@@ -0,0 +1,63 @@
+"""
+Evaluación en paralelo: cuándo se usa el pool y que el resultado coincide con
+la evaluación en proceso.
+"""
+import contextlib
+import io
+
+import numpy as np
+
+from models import parallel
+from models.genetic_algorithm import ColorPaletteGA
+
+INITIAL_COLORS = ['#3A5FCD', '#FFFFFF', '#F08080']
+
+
+class RecordingEvaluator:
+    """Sustituto del pool que evalúa en proceso y anota el tamaño de cada lote"""
+
+    def __init__(self, ga):
+        self.ga = ga
+        self.batches = []
+
+    def evaluate(self, genes, config):
+        self.batches.append(len(genes))
+        return self.ga._evaluate_batch(genes)
+
+
+def test_pool_receives_steady_state_offspring(monkeypatch):
+    ga = ColorPaletteGA(INITIAL_COLORS, population_size=1000, seed=0, parallel=True)
+    evaluator = RecordingEvaluator(ga)
+    monkeypatch.setattr(parallel, 'get_parallel_evaluator', lambda max_workers=None: evaluator)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        ga.start()
+        for _ in range(3):
+            ga.step()
+
+    # Generación 0 completa y después lotes de solo descendientes, menores que la población
+    assert evaluator.batches[0] == 1000
+    steady_state = evaluator.batches[1:]
+    assert steady_state and all(ga.PARALLEL_MIN_BATCH <= size < 1000 for size in steady_state)
+    assert sum(evaluator.batches) == ga.evaluations
+
+
+def test_small_batches_and_populations_stay_in_process(monkeypatch):
+    def fail(max_workers=None):
+        raise AssertionError("no se esperaba usar el pool")
+    monkeypatch.setattr(parallel, 'get_parallel_evaluator', fail)
+
+    small = ColorPaletteGA(INITIAL_COLORS, population_size=50, seed=0, parallel=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        small.run()
+
+    large = ColorPaletteGA(INITIAL_COLORS, population_size=1000, seed=0, parallel=True)
+    large.fitness(large.initialize_population().genes[0])
+
+
+def test_pool_matches_in_process_evaluation():
+    ga = ColorPaletteGA(INITIAL_COLORS, population_size=200, seed=0, parallel=True,
+                        parallel_threshold=200, max_workers=2)
+    genes = ga.initialize_population().genes
+    np.testing.assert_allclose(ga.evaluate_population(genes), ga._evaluate_batch(genes), rtol=0, atol=1e-12)
+    assert 2 in parallel._shared_evaluators
@@ -0,0 +1,87 @@
+"""
+Caché de resultados: LRU con TTL, nivel SQLite compartido y uso desde /generate.
+"""
+import pytest
+
+import app as app_module
+from models.result_cache import ResultCache, make_key, normalize_hex
+
+
+def test_make_key_normalizes_colors_and_ignores_key_order():
+    a = make_key({'initial_colors': ['#FFF', '#3A5FCD'], 'seed': 1, 'generations': 5})
+    b = make_key({'generations': 5, 'seed': 1, 'initial_colors': ['#ffffff', '#3a5fcd']})
+    assert a == b
+    assert make_key({'seed': 1}) != make_key({'seed': 2})
+    assert normalize_hex(' #AbC ') == '#aabbcc'
+
+
+def test_memory_tier_is_lru():
+    cache = ResultCache(maxsize=2, ttl=None)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == (1, 'memory')
+    cache.set('c', 3)  # Expulsa 'b', el usado hace más tiempo
+    assert cache.get('b') == (None, None)
+    assert cache.get('a') == (1, 'memory')
+    assert cache.stats()['hits'] == 2 and cache.stats()['misses'] == 1
+
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('models.result_cache.time.time', lambda: now[0])
+    cache = ResultCache(ttl=10)
+    cache.set('a', {'x': 1})
+    now[0] += 9
+    assert cache.get('a') == ({'x': 1}, 'memory')
+    now[0] += 2
+    assert cache.get('a') == (None, None)
+
+
+def test_sqlite_tier_is_shared_and_promoted(tmp_path):
+    path = str(tmp_path / 'results.sqlite')
+    writer = ResultCache(sqlite_path=path)
+    writer.set('a', {'palettes': [1, 2]})
+
+    reader = ResultCache(sqlite_path=path)
+    assert reader.get('a') == ({'palettes': [1, 2]}, 'sqlite')
+    assert reader.get('a') == ({'palettes': [1, 2]}, 'memory')
+
+    reader.clear()
+    assert ResultCache(sqlite_path=path).get('a') == (None, None)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setitem(app_module.app.config, 'RESULT_CACHE_ENABLED', True)
+    monkeypatch.setitem(app_module.app.config, 'RESULT_CACHE_SQLITE', None)
+    monkeypatch.setattr(app_module, '_result_cache', None)
+    return app_module.app.test_client()
+
+
+def test_generate_serves_repeated_requests_from_cache(client):
+    form = {'generations': '2', 'population_size': '10', 'seed': '3', 'bg_color': '#FFF'}
+    first = client.post('/generate', data=form)
+    assert first.status_code == 200 and first.headers['X-Cache'] == 'MISS'
+    assert first.get_json()['initial_colors'][1] == '#ffffff'
+
+    # '#FFF' y '#ffffff' comparten entrada
+    second = client.post('/generate', data={**form, 'bg_color': '#ffffff'})
+    assert second.headers['X-Cache'] == 'HIT' and second.headers['X-Cache-Tier'] == 'memory'
+    assert second.get_json() == first.get_json()
+
+    forced = client.post('/generate', data=form, headers={'Cache-Control': 'no-cache'})
+    assert forced.headers['X-Cache'] == 'MISS'
+
+
+def test_results_cut_by_time_budget_are_not_cached(client):
+    form = {'generations': '50', 'population_size': '10', 'seed': '3', 'time_budget': '0'}
+    first = client.post('/generate', data=form)
+    assert first.get_json()['stop_reason'] == 'time_budget'
+    assert client.post('/generate', data=form).headers['X-Cache'] == 'MISS'
+
+
+@pytest.mark.parametrize('color', ['#GGGGGG', '#12345', 'azul', ''])
+def test_invalid_colors_return_400_before_caching(client, color):
+    response = client.post('/generate', data={'primary_color': color, 'generations': '1'})
+    assert response.status_code == 400
+    assert app_module._result_cache is None or app_module._result_cache.stats()['size'] == 0
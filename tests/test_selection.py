@@ -0,0 +1,103 @@
+"""
+Operadores de selección: distribución de cada operador, validación de
+parámetros y su uso desde ColorPaletteGA.
+"""
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from models.genetic_algorithm import ColorPaletteGA
+from models.selection import OPERATORS, check_kwargs, get_operator, rank, sus, tournament, truncation
+
+INITIAL_COLORS = ['#3A5FCD', '#FFFFFF', '#F08080']
+FITNESS = np.array([1.0, 2.0, 3.0, 4.0])
+
+
+def frequencies(operator, fitness, draws=20000, **kwargs):
+    rng = np.random.default_rng(0)
+    selected = operator(fitness, draws, rng, **kwargs)
+    assert selected.shape == (draws,)
+    return np.bincount(selected, minlength=len(fitness)) / draws
+
+
+@pytest.mark.parametrize('name', sorted(OPERATORS))
+def test_operators_are_deterministic_with_a_seeded_generator(name):
+    operator = get_operator(name)
+    first = operator(FITNESS, 10, np.random.default_rng(5))
+    second = operator(FITNESS, 10, np.random.default_rng(5))
+    np.testing.assert_array_equal(first, second)
+    assert ((0 <= first) & (first < len(FITNESS))).all()
+
+
+def test_tournament():
+    # Con torneos de 2 con reemplazo, P(i) = ((i + 1)^2 - i^2) / n^2
+    np.testing.assert_allclose(frequencies(tournament, FITNESS, size=2), [1 / 16, 3 / 16, 5 / 16, 7 / 16], atol=0.01)
+    assert (frequencies(tournament, FITNESS, size=1) > 0.2).all()
+
+
+def test_rank():
+    np.testing.assert_allclose(frequencies(rank, FITNESS, pressure=1.0), [0.25] * 4, atol=0.01)
+    # Con pressure 2 el peor nunca se elige y el mejor recibe 2 / n
+    np.testing.assert_allclose(frequencies(rank, FITNESS, pressure=2.0), [0, 1 / 6, 2 / 6, 3 / 6], atol=0.01)
+    assert (rank(np.array([3.0]), 5, np.random.default_rng(0)) == 0).all()
+
+
+@pytest.mark.parametrize('pressure', [0.5, 2.5, 3])
+def test_rank_rejects_pressure_outside_range(pressure):
+    with pytest.raises(ValueError):
+        rank(FITNESS, 4, np.random.default_rng(0), pressure=pressure)
+
+
+def test_sus_is_proportional_to_raw_fitness():
+    np.testing.assert_allclose(frequencies(sus, FITNESS), FITNESS / FITNESS.sum(), atol=1e-3)
+    # Baja varianza: con num = N y aptitudes iguales, cada individuo una vez
+    np.testing.assert_array_equal(np.sort(sus(np.ones(5), 5, np.random.default_rng(0))), np.arange(5))
+
+
+def test_sus_shifts_only_negative_fitness():
+    np.testing.assert_allclose(frequencies(sus, np.array([-1.0, 0.0, 1.0])), [0, 1 / 3, 2 / 3], atol=1e-3)
+    np.testing.assert_allclose(frequencies(sus, np.zeros(4)), [0.25] * 4, atol=1e-3)
+
+
+def test_truncation():
+    np.testing.assert_array_equal(truncation(FITNESS, 3), [3, 2, 1])
+    np.testing.assert_array_equal(truncation(FITNESS, 6), [3, 2, 1, 0, 3, 2])
+    shuffled = truncation(FITNESS, 3, np.random.default_rng(0))
+    assert sorted(shuffled) == [1, 2, 3]
+
+
+def test_unknown_operator():
+    with pytest.raises(ValueError, match='tournament'):
+        get_operator('ruleta')
+
+
+@pytest.mark.parametrize('name, kwargs', [
+    ('rank', {'pressure': 3}),
+    ('rank', {'pressure': 'alta'}),
+    ('rank', {'size': 3}),
+    ('tournament', {'size': 0}),
+    ('tournament', {'pressure': 1.5}),
+    ('sus', {'size': 2}),
+    ('truncation', {'rng': None}),
+])
+def test_bad_kwargs_fail_at_construction(name, kwargs):
+    with pytest.raises(ValueError):
+        check_kwargs(get_operator(name), kwargs)
+    with pytest.raises(ValueError):
+        ColorPaletteGA(INITIAL_COLORS, selection=name, selection_kwargs=kwargs)
+
+
+@pytest.mark.parametrize('name, kwargs', [
+    ('tournament', {'size': 5}), ('rank', {'pressure': 2}), ('sus', {}), ('truncation', {}),
+])
+def test_ga_runs_with_each_operator(name, kwargs):
+    ga = ColorPaletteGA(INITIAL_COLORS, population_size=20, generations=5, seed=0,
+                        selection=name, selection_kwargs=kwargs)
+    # La comprobación de parámetros no consume el generador de la instancia
+    assert ga.rng.bit_generator.state == np.random.default_rng(0).bit_generator.state
+    with contextlib.redirect_stdout(io.StringIO()):
+        ga.run()
+    assert len(ga.logbook.select('gen')) == 5
+    assert ga.get_best_palettes(1)